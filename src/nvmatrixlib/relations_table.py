@@ -4,36 +4,48 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/novelyst_matrix
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
+from bisect import bisect_right
 import tkinter as tk
+from tkinter.font import nametofont
 from pywriter.pywriter_globals import *
+from pywriter.model.relations_matrix import RelationsMatrix
+from pywriter.diagnostics.instrumentation import INSTRUMENTATION
+from pywriter.diagnostics.instrumentation import instrumented
 from nvmatrixlib.node import Node
 
 
 class RelationsTable:
-    """Represent a table of relationships. 
-    
+    """Represent a table of relationships.
+
     Public methods:
         set_nodes -- Loop through all nodes, setting states.
         get_nodes -- Loop through all nodes, modifying the scenes according to the states.
-    
-    The visual part consists of one frame per column, each containing 
-    one node per row. 
-    The logical part consists of one dictionary per element type (protected instance variables):
-    {scene ID: {element Id: node}}
+        get_changes -- Return a snapshot of the changed relationships.
+        apply_changes(changes) -- Modify the scenes according to a snapshot of the changed relationships.
+
+    The visual part consists of the row titles, the column titles, and the nodes,
+    drawn on the master's canvases.
+    Only the visible titles and nodes are drawn. When scrolling, the canvas items
+    are re-used, so their number does not depend on the size of the table.
+    Click on a node with the Ctrl key pressed to toggle its state.
+
+    The logical part is a RelationsMatrix with one row per scene and one column per element.
     """
 
+    @instrumented('RelationsTable()', profile=True)
     def __init__(self, master, novel, **kwargs):
         """Draw the matrix with blank nodes.
-        
+
         Positional arguments:
+            master: TableFrame -- Scrollable table frame.
             novel: Novel -- Project reference.
-            
+
         """
 
         def fill_str(text):
             """Return a string that is at least 7 characters long.
-            
-            Extend text with spaces so that it does not fall 
+
+            Extend text with spaces so that it does not fall
             below the length of 7 characters.
             This is for column titles, to widen narrow columns.
             """
@@ -41,23 +53,56 @@ class RelationsTable:
                 text = f' {text} '
             return text
 
+        def add_column_group(heading, headingColor, nodeColor, elemType, titles):
+            """Add the titles of a group of node columns with a common heading.
+
+            Positional arguments:
+                heading: str -- Title of the column group.
+                headingColor: str -- Background color of the group heading.
+                nodeColor: str -- Marker color of the group's nodes.
+                elemType: str -- Element type of the relationship matrix.
+                titles: iterable of element titles, one per matrix column.
+            """
+            with INSTRUMENTATION.timer(f'RelationsTable: {elemType} columns'):
+                left = self._columnsWidth
+                headingWidth = font.measure(heading) + self._padding
+                firstColumn = len(self._columns)
+                for matrixColumn, title in enumerate(titles):
+                    title = fill_str(title)
+                    self._columns.append((elemType, matrixColumn, title, nodeColor))
+                    self._columnWidths.append(font.measure(title) + self._padding)
+                widths = self._columnWidths[firstColumn:]
+
+                # Widen the columns, if the heading is wider.
+                extraWidth = headingWidth - sum(widths)
+                if widths and extraWidth > 0:
+                    for i in range(len(widths)):
+                        self._columnWidths[firstColumn + i] += (extraWidth + i) // len(widths)
+                for width in self._columnWidths[firstColumn:]:
+                    self._columnX.append(self._columnsWidth)
+                    self._columnsWidth += width
+                self._columnsWidth = max(self._columnsWidth, left + headingWidth)
+                self._columnGroups.append((heading, headingColor, left, self._columnsWidth))
+
         colorsBackground = ((kwargs['color_bg_00'], kwargs['color_bg_01']),
                             (kwargs['color_bg_10'], kwargs['color_bg_11']))
+        self._colorsBackground = colorsBackground
+        self._master = master
         self._novel = novel
-        columns = []
-        col = 0
-        bgc = col % 2
 
         #--- Scene title column.
-        tk.Label(master.topLeft, text=_('Scenes')).pack(fill=tk.X)
+        scenesLabel = tk.Label(master.topLeft, text=_('Scenes'))
+        scenesLabel.pack(fill=tk.X)
         tk.Label(master.topLeft, bg=colorsBackground[1][1], text=' ').pack(fill=tk.X)
+        font = nametofont(scenesLabel.cget('font'))
+        self._padding = scenesLabel.winfo_reqwidth() - font.measure(_('Scenes'))
+        # Horizontal space of a label's borders and margins.
+        self._rowHeight = scenesLabel.winfo_reqheight()
+        # All rows have the height of a single-line title label.
 
-        #--- Display titles of "normal" scenes.
-        row = 0
-        self._arcNodes = {}
-        self._characterNodes = {}
-        self._locationNodes = {}
-        self._itemNodes = {}
+        #--- Find "normal" scenes.
+        self._rows = []
+        # scene IDs, one per row
         self._arcs = []
         for chId in self._novel.srtChapters:
             #--- Find arcs.
@@ -68,40 +113,21 @@ class RelationsTable:
                         self._arcs.append(arc)
             elif self._novel.chapters[chId].chType == 0:
                 for scId in self._novel.chapters[chId].srtScenes:
-                    bgr = row % 2
-                    if self._novel.scenes[scId].scType != 0:
-                        continue
-
-                    #--- Initialize matrix scene row dictionaries.
-                    self._characterNodes[scId] = {}
-                    self._locationNodes[scId] = {}
-                    self._itemNodes[scId] = {}
-                    self._arcNodes[scId] = {}
-
-                    tk.Label(master.rowTitles,
-                             text=self._novel.scenes[scId].title,
-                             bg=colorsBackground[bgr][1],
-                             justify=tk.LEFT,
-                             anchor=tk.W
-                             ).pack(fill=tk.X)
-                    row += 1
-        bgr = row % 2
-        tk.Label(master.rowTitles,
-                         text=' ',
-                         bg=colorsBackground[bgr][1],
-                         ).pack(fill=tk.X)
-        tk.Label(master.rowTitles,
-                         text=_('Scenes'),
-                         ).pack(fill=tk.X)
+                    if self._novel.scenes[scId].scType == 0:
+                        self._rows.append(scId)
+        #--- Row titles: the titles of "normal" scenes, a spacer, and a column heading.
+        self._rowTitles = [self._novel.scenes[scId].title or '' for scId in self._rows]
+        self._rowTitles.append('')
+        self._rowTitles.append(_('Scenes'))
+        with INSTRUMENTATION.timer('RelationsTable: row titles'):
+            self._rowTitlesWidth = max(font.measure(title) for title in self._rowTitles) + self._padding
 
         #--- Arc columns.
         hasSubplot = False
-        self._scnArcs = {}
-        for scId in self._arcNodes:
-            self._scnArcs[scId] = string_to_list(self._novel.scenes[scId].scnArcs)
+        for scId in self._rows:
 
             # Find arcs for novelyst v4.3-.
-            for arc in self._scnArcs[scId]:
+            for arc in self._novel.scenes[scId].arcs:
                 if not arc in self._arcs:
                     self._arcs.append(arc)
 
@@ -113,269 +139,250 @@ class RelationsTable:
         if hasSubplot and not self._arcs:
             self._showSubplot = True
             self._arcs.append('Subplot')
-            for scId in self._arcNodes:
-                if self._novel.scenes[scId].isSubPlot:
-                    self._scnArcs[scId] = ['Subplot']
 
+        #--- The relationship matrix.
+        self._matrix = RelationsMatrix(self._rows,
+                                       arcs=self._arcs,
+                                       characters=self._novel.srtCharacters,
+                                       locations=self._novel.srtLocations,
+                                       items=self._novel.srtItems,
+                                       subplot=self._showSubplot)
+
+        #--- Column titles.
+        self._columns = []
+        # (element type, matrix column, title, marker color), one per table column
+        self._columnX = []
+        # left edge position, one per table column
+        self._columnWidths = []
+        # width, one per table column
+        self._columnsWidth = 0
+        # width of all columns
+        self._columnGroups = []
+        # (heading, heading color, left edge position, right edge position), one per element type
         if self._arcs:
-            arcTitleWindow = tk.Frame(master.columnTitles)
-            arcTitleWindow.pack(side=tk.LEFT, fill=tk.BOTH)
-            tk.Label(arcTitleWindow, text=_('Arcs'), bg=kwargs['color_arc_heading']).pack(fill=tk.X)
-            arcTypeColumn = tk.Frame(master.display)
-            arcTypeColumn.pack(side=tk.LEFT, fill=tk.BOTH)
-            arcColumn = tk.Frame(arcTypeColumn)
-            arcColumn.pack(fill=tk.BOTH)
-            for arc in self._arcs:
-                # Display arc titles.
-                row = 1
-                bgr = row % 2
-                bgc = col % 2
-                arcTitle = fill_str(arc)
-                tk.Label(arcTitleWindow,
-                         text=arcTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(side=tk.LEFT, fill=tk.X, expand=True)
-                row += 1
-
-                # Display arc nodes.
-                columns.append(tk.Frame(arcColumn))
-                columns[col].pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                for scId in self._scnArcs:
-                    bgr = row % 2
-                    node = Node(columns[col],
-                         colorFalse=colorsBackground[bgr][bgc],
-                         colorTrue=kwargs['color_arc_node']
-                         )
-                    node.pack(fill=tk.X, expand=True)
-                    self._arcNodes[scId][arc] = node
-                    row += 1
-                bgr = row % 2
-                tk.Label(columns[col],
-                         text=arcTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(fill=tk.X, expand=True)
-                col += 1
-            tk.Label(arcTypeColumn, text=_('Arcs'), bg=kwargs['color_arc_heading']).pack(fill=tk.X)
-
-        #--- Character columns.
+            add_column_group(_('Arcs'),
+                             kwargs['color_arc_heading'],
+                             kwargs['color_arc_node'],
+                             RelationsMatrix.ARCS,
+                             self._arcs)
         if self._novel.characters:
-            characterTypeColumn = tk.Frame(master.display)
-            characterTypeColumn.pack(side=tk.LEFT, fill=tk.BOTH)
-            characterColumn = tk.Frame(characterTypeColumn)
-            characterColumn.pack(fill=tk.BOTH)
-            characterTitleWindow = tk.Frame(master.columnTitles)
-            characterTitleWindow.pack(side=tk.LEFT, fill=tk.BOTH)
-            tk.Label(characterTitleWindow, text=_('Characters'), bg=kwargs['color_character_heading']).pack(fill=tk.X)
-            for crId in self._novel.srtCharacters:
-                # Display character titles.
-                row = 1
-                bgr = row % 2
-                bgc = col % 2
-                characterTitle = fill_str(self._novel.characters[crId].title)
-                tk.Label(characterTitleWindow,
-                         text=characterTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(side=tk.LEFT, fill=tk.X, expand=True)
-                row += 1
-
-                # Display character nodes.
-                columns.append(tk.Frame(characterColumn))
-                columns[col].pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                for scId in self._characterNodes:
-                    bgr = row % 2
-                    node = Node(columns[col],
-                         colorFalse=colorsBackground[bgr][bgc],
-                         colorTrue=kwargs['color_character_node']
-                         )
-                    node.pack(fill=tk.X, expand=True)
-                    self._characterNodes[scId][crId] = node
-                    row += 1
-                bgr = row % 2
-                tk.Label(columns[col],
-                         text=characterTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(fill=tk.X, expand=True)
-                col += 1
-            tk.Label(characterTypeColumn, text=_('Characters'), bg=kwargs['color_character_heading']).pack(fill=tk.X)
-
-        #--- Location columns.
+            add_column_group(_('Characters'),
+                             kwargs['color_character_heading'],
+                             kwargs['color_character_node'],
+                             RelationsMatrix.CHARACTERS,
+                             [self._novel.characters[crId].title for crId in self._novel.srtCharacters])
         if self._novel.locations:
-            locationTypeColumn = tk.Frame(master.display)
-            locationTypeColumn.pack(side=tk.LEFT, fill=tk.BOTH)
-            locationColumn = tk.Frame(locationTypeColumn)
-            locationColumn.pack(fill=tk.BOTH)
-            locationTitleWindow = tk.Frame(master.columnTitles)
-            locationTitleWindow.pack(side=tk.LEFT, fill=tk.BOTH)
-            tk.Label(locationTitleWindow, text=_('Locations'), bg=kwargs['color_location_heading']).pack(fill=tk.X)
-            for lcId in self._novel.srtLocations:
-                # Display location titles.
-                row = 1
-                bgr = row % 2
-                bgc = col % 2
-                locationTitle = fill_str(self._novel.locations[lcId].title)
-                tk.Label(locationTitleWindow,
-                         text=locationTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(side=tk.LEFT, fill=tk.X, expand=True)
-                row += 1
-
-                # Display location nodes.
-                columns.append(tk.Frame(locationColumn))
-                columns[col].pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                for scId in self._locationNodes:
-                    bgr = row % 2
-                    node = Node(columns[col],
-                         colorFalse=colorsBackground[bgr][bgc],
-                         colorTrue=kwargs['color_location_node']
-                         )
-                    node.pack(fill=tk.X, expand=True)
-                    self._locationNodes[scId][lcId] = node
-                    row += 1
-                bgr = row % 2
-                tk.Label(columns[col],
-                         text=locationTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(fill=tk.X, expand=True)
-                col += 1
-            tk.Label(locationTypeColumn, text=_('Locations'), bg=kwargs['color_location_heading']).pack(fill=tk.X)
-
-        #--- Item columns.
+            add_column_group(_('Locations'),
+                             kwargs['color_location_heading'],
+                             kwargs['color_location_node'],
+                             RelationsMatrix.LOCATIONS,
+                             [self._novel.locations[lcId].title for lcId in self._novel.srtLocations])
         if self._novel.items:
-            itemTypeColumn = tk.Frame(master.display)
-            itemTypeColumn.pack(side=tk.LEFT, fill=tk.BOTH)
-            itemColumn = tk.Frame(itemTypeColumn)
-            itemColumn.pack(fill=tk.BOTH)
-            itemTitleWindow = tk.Frame(master.columnTitles)
-            itemTitleWindow.pack(side=tk.LEFT, fill=tk.BOTH)
-            tk.Label(itemTitleWindow, text=_('Items'), bg=kwargs['color_item_heading']).pack(fill=tk.X)
-            for itId in self._novel.srtItems:
-                # Display item titles.
-                row = 1
-                bgr = row % 2
-                bgc = col % 2
-                itemTitle = fill_str(self._novel.items[itId].title)
-                tk.Label(itemTitleWindow,
-                         text=itemTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(side=tk.LEFT, fill=tk.X, expand=True)
-                row += 1
-
-                # Display item nodes.
-                columns.append(tk.Frame(itemColumn))
-                columns[col].pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                for scId in self._itemNodes:
-                    bgr = row % 2
-                    node = Node(columns[col],
-                         colorFalse=colorsBackground[bgr][bgc],
-                         colorTrue=kwargs['color_item_node']
-                         )
-                    node.pack(fill=tk.X, expand=True)
-                    self._itemNodes[scId][itId] = node
-                    row += 1
-                bgr = row % 2
-                tk.Label(columns[col],
-                         text=itemTitle,
-                         bg=colorsBackground[bgr][bgc],
-                         justify=tk.LEFT,
-                         anchor=tk.W
-                         ).pack(fill=tk.X, expand=True)
-                col += 1
-            tk.Label(itemTypeColumn, text=_('Items'), bg=kwargs['color_item_heading']).pack(fill=tk.X)
+            add_column_group(_('Items'),
+                             kwargs['color_item_heading'],
+                             kwargs['color_item_node'],
+                             RelationsMatrix.ITEMS,
+                             [self._novel.items[itId].title for itId in self._novel.srtItems])
+
+        #--- Node display and titles.
+        self._cells = []
+        # (rectangle, text) canvas item pairs, re-used for the visible cells
+        self._shownCells = 0
+        self._visibleRange = None
+        # (first row, end row, first column, end column) of the drawn cells
+        self._rowTitleCells = []
+        # (rectangle, text) canvas item pairs, re-used for the visible row titles
+        self._shownRowTitles = 0
+        self._visibleRows = None
+        # (first row, end row) of the drawn row titles
+        self._columnTitleCells = []
+        # (rectangle, text) canvas item pairs, re-used for the visible column titles
+        self._shownColumnTitles = 0
+        self._visibleColumns = None
+        # (first column, end column) of the drawn column titles
+        height = (len(self._rows) + 2) * self._rowHeight
+        self._rowTitlesCanvas = master.set_virtual_row_titles(self._rowTitlesWidth, height, self._draw_row_titles)
+        self._columnTitlesCanvas = master.set_virtual_column_titles(self._columnsWidth, 2 * self._rowHeight,
+                                                                    self._draw_column_titles)
+        self._canvas = master.set_virtual_display(self._columnsWidth, height, self._draw)
+        self._canvas.bind('<Control-Button-1>', self._toggle_node)
+
+        #--- Draw the column group headings above the column titles and below the last row.
+        for canvas, y in ((self._columnTitlesCanvas, 0), (self._canvas, (len(self._rows) + 1) * self._rowHeight)):
+            for heading, headingColor, left, right in self._columnGroups:
+                canvas.create_rectangle(left, y, right, y + self._rowHeight, fill=headingColor, width=0)
+                canvas.create_text((left + right) / 2, y + self._rowHeight / 2, text=heading)
+        self._draw_row_titles()
+        self._draw_column_titles()
+        self._draw()
 
+    @instrumented('RelationsTable.set_nodes')
     def set_nodes(self):
         """Loop through all nodes, setting states."""
-        for scId in self._arcNodes:
-            for arc in self._arcs:
-                try:
-                    self._arcNodes[scId][arc].state = (arc in self._scnArcs[scId])
-                except TypeError:
-                    pass
-
-        for scId in self._characterNodes:
-            for crId in self._novel.characters:
-                try:
-                    self._characterNodes[scId][crId].state = (crId in self._novel.scenes[scId].characters)
-                except TypeError:
-                    pass
-
-        for scId in self._locationNodes:
-            for lcId in self._novel.locations:
-                try:
-                    self._locationNodes[scId][lcId].state = (lcId in self._novel.scenes[scId].locations)
-                except TypeError:
-                    pass
-
-        for scId in self._itemNodes:
-            for itId in self._novel.items:
-                try:
-                    self._itemNodes[scId][itId].state = (itId in self._novel.scenes[scId].items)
-                except TypeError:
-                    pass
+        self._matrix.read_scenes(self._novel)
+        self._visibleRange = None
+        self._draw()
 
+    @instrumented('RelationsTable.get_nodes')
     def get_nodes(self):
-        """Loop through all nodes, modifying the scenes according to the states."""
-        for scId in self._arcNodes:
-            arcs = []
-            for arc in self._arcs:
-                try:
-                    node = self._arcNodes[scId][arc]
-                except TypeError:
-                    pass
-                else:
-                    if node.state:
-                        arcs.append(arc)
-            if self._showSubplot:
-                if arcs:
-                    self._novel.scenes[scId].isSubPlot = True
-                else:
-                    self._novel.scenes[scId].isSubPlot = False
+        """Loop through all nodes, modifying the scenes according to the states.
+
+        Assign only changed relations, so unchanged scenes are not marked as modified.
+        """
+        self._matrix.write_scenes(self._novel)
+
+    def get_changes(self):
+        """Return a snapshot of the changed relationships.
+
+        The snapshot is immutable, so it can be applied in a worker thread.
+        """
+        return self._matrix.get_changes(self._novel)
+
+    @instrumented('RelationsTable.apply_changes')
+    def apply_changes(self, changes):
+        """Modify the scenes according to a snapshot of the changed relationships.
+
+        Positional arguments:
+            changes: tuple -- Snapshot returned by get_changes().
+        """
+        self._matrix.apply_changes(self._novel, changes)
+
+    def _draw_row_titles(self):
+        """Draw the visible row titles, re-using the canvas items of the previous call."""
+        canvas = self._rowTitlesCanvas
+        top = canvas.canvasy(0)
+        bottom = canvas.canvasy(canvas.winfo_height())
+        firstRow = max(0, int(top // self._rowHeight))
+        endRow = min(len(self._rowTitles), int(bottom // self._rowHeight) + 1)
+        if (firstRow, endRow) == self._visibleRows:
+            return
+
+        self._visibleRows = (firstRow, endRow)
+        cell = 0
+        for row in range(firstRow, endRow):
+            if row <= len(self._rows):
+                bg = self._colorsBackground[row % 2][1]
+            else:
+                bg = canvas.cget('background')
+            self._draw_title(canvas, self._rowTitleCells, cell,
+                             0, row * self._rowHeight, self._rowTitlesWidth, self._rowTitles[row], bg)
+            cell += 1
+        self._hide_cells(canvas, self._rowTitleCells, cell, self._shownRowTitles)
+        self._shownRowTitles = cell
+
+    def _draw_column_titles(self):
+        """Draw the visible column titles, re-using the canvas items of the previous call."""
+        canvas = self._columnTitlesCanvas
+        left = canvas.canvasx(0)
+        right = canvas.canvasx(canvas.winfo_width())
+        firstColumn = max(0, bisect_right(self._columnX, left) - 1)
+        endColumn = bisect_right(self._columnX, right)
+        if (firstColumn, endColumn) == self._visibleColumns:
+            return
+
+        self._visibleColumns = (firstColumn, endColumn)
+        cell = 0
+        for col in range(firstColumn, endColumn):
+            self._draw_title(canvas, self._columnTitleCells, cell,
+                             self._columnX[col], self._rowHeight, self._columnWidths[col],
+                             self._columns[col][2], self._colorsBackground[1][col % 2])
+            cell += 1
+        self._hide_cells(canvas, self._columnTitleCells, cell, self._shownColumnTitles)
+        self._shownColumnTitles = cell
+
+    def _draw_title(self, canvas, cells, cell, x, y, width, title, bg):
+        """Draw a left-aligned title, using the canvas items of the cell.
+
+        Positional arguments:
+            canvas: tk.Canvas -- Canvas to draw on.
+            cells: list of (rectangle, text) canvas item pairs; new items are appended if needed.
+            cell: int -- Index of the canvas items.
+            x, y: int -- Position of the title's upper left corner.
+            width: int -- Width of the title.
+            title: str -- Text to display.
+            bg: str -- Background color.
+        """
+        if cell == len(cells):
+            cells.append((canvas.create_rectangle(0, 0, 0, 0, width=0), canvas.create_text(0, 0, anchor=tk.W)))
+        rectangle, text = cells[cell]
+        canvas.coords(rectangle, x, y, x + width, y + self._rowHeight)
+        canvas.itemconfigure(rectangle, fill=bg, state=tk.NORMAL)
+        canvas.coords(text, x + self._padding / 2, y + self._rowHeight / 2)
+        canvas.itemconfigure(text, text=title, state=tk.NORMAL)
+
+    def _hide_cells(self, canvas, cells, start, end):
+        """Hide the canvas items of the cells no longer needed."""
+        for rectangle, text in cells[start:end]:
+            canvas.itemconfigure(rectangle, state=tk.HIDDEN)
+            canvas.itemconfigure(text, state=tk.HIDDEN)
+
+    def _draw(self):
+        """Draw the visible cells, re-using the canvas items of the previous call."""
+        canvas = self._canvas
+        top = canvas.canvasy(0)
+        bottom = canvas.canvasy(canvas.winfo_height())
+        left = canvas.canvasx(0)
+        right = canvas.canvasx(canvas.winfo_width())
+        firstRow = max(0, int(top // self._rowHeight))
+        endRow = min(len(self._rows) + 1, int(bottom // self._rowHeight) + 1)
+        # The row below the last scene row holds the column titles.
+        firstColumn = max(0, bisect_right(self._columnX, left) - 1)
+        endColumn = bisect_right(self._columnX, right)
+        visibleRange = (firstRow, endRow, firstColumn, endColumn)
+        if visibleRange == self._visibleRange:
+            return
+
+        self._visibleRange = visibleRange
+        cell = 0
+        for row in range(firstRow, endRow):
+            for col in range(firstColumn, endColumn):
+                self._draw_cell(cell, row, col)
+                cell += 1
+        self._hide_cells(canvas, self._cells, cell, self._shownCells)
+        self._shownCells = cell
+
+    def _draw_cell(self, cell, row, col):
+        """Draw a node or a column title, using the canvas items of the cell.
+
+        Positional arguments:
+            cell: int -- Index of the canvas items; new items are created if needed.
+            row: int -- Table row.
+            col: int -- Table column.
+        """
+        canvas = self._canvas
+        if cell == len(self._cells):
+            self._cells.append((canvas.create_rectangle(0, 0, 0, 0, width=0), canvas.create_text(0, 0)))
+        rectangle, text = self._cells[cell]
+        elemType, matrixColumn, title, nodeColor = self._columns[col]
+        x = self._columnX[col]
+        y = row * self._rowHeight
+        canvas.coords(rectangle, x, y, x + self._columnWidths[col], y + self._rowHeight)
+        canvas.itemconfigure(rectangle, fill=self._colorsBackground[row % 2][col % 2], state=tk.NORMAL)
+        if row < len(self._rows):
+            if self._matrix.is_set(elemType, row, matrixColumn):
+                marker = Node.marker
             else:
-                self._novel.scenes[scId].scnArcs = list_to_string(arcs)
-
-        for scId in self._characterNodes:
-            self._novel.scenes[scId].characters = []
-            for crId in self._novel.characters:
-                try:
-                    node = self._characterNodes[scId][crId]
-                except TypeError:
-                    pass
-                else:
-                    if node.state:
-                        self._novel.scenes[scId].characters.append(crId)
-
-        for scId in self._locationNodes:
-            self._novel.scenes[scId].locations = []
-            for lcId in self._novel.locations:
-                try:
-                    node = self._locationNodes[scId][lcId]
-                except TypeError:
-                    pass
-                else:
-                    if node.state:
-                        self._novel.scenes[scId].locations.append(lcId)
-
-        for scId in self._itemNodes:
-            self._novel.scenes[scId].items = []
-            for itId in self._novel.items:
-                try:
-                    node = self._itemNodes[scId][itId]
-                except TypeError:
-                    pass
-                else:
-                    if node.state:
-                        self._novel.scenes[scId].items.append(itId)
+                marker = ''
+            canvas.coords(text, x + self._columnWidths[col] / 2, y + self._rowHeight / 2)
+            canvas.itemconfigure(text, text=marker, fill=nodeColor, anchor=tk.CENTER, state=tk.NORMAL)
+        else:
+            canvas.coords(text, x + 2, y + self._rowHeight / 2)
+            canvas.itemconfigure(text, text=title, fill='black', anchor=tk.W, state=tk.NORMAL)
+
+    def _toggle_node(self, event):
+        """Toggle the state of the node clicked on, and redraw it."""
+        x = self._canvas.canvasx(event.x)
+        row = int(self._canvas.canvasy(event.y) // self._rowHeight)
+        col = bisect_right(self._columnX, x) - 1
+        if not 0 <= row < len(self._rows):
+            return
+
+        if col < 0 or x >= self._columnX[col] + self._columnWidths[col]:
+            return
 
+        elemType, matrixColumn = self._columns[col][:2]
+        self._matrix.toggle(elemType, row, matrixColumn)
+        Node.isModified = True
+        firstRow, endRow, firstColumn, endColumn = self._visibleRange
+        if firstRow <= row < endRow and firstColumn <= col < endColumn:
+            self._draw_cell((row - firstRow) * (endColumn - firstColumn) + col - firstColumn, row, col)
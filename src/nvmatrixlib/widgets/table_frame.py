@@ -17,6 +17,12 @@ Mouse wheel
 - Use the mouse wheel for vertical scrolling.
 - Use the mouse wheel with the `Shift` key pressed for horizontal scrolling.    
 
+Virtual sections
+
+- Instead of placing widgets in the rowTitles, columnTitles, and display frames,
+  the visible part of a section can be drawn directly on the section's canvas. 
+  Then the drawing costs depend on the window size, not on the table size.
+
 
 Based on the VerticalScrolledFrame example class shown and discussed here:
 https://stackoverflow.com/questions/16188420/tkinter-scrollbar-for-frame
@@ -43,6 +49,11 @@ class TableFrame(ttk.Frame):
         columnTitles -- ttk.Frame for a horizontally scrolled row of column titles. 
         display -- ttk.Frame for columns and rows to be displayed and scrolled in both directions.
         
+    Public methods:
+        set_virtual_display -- Draw the display on the display canvas instead of placing widgets in the display frame.
+        set_virtual_row_titles -- Draw the row titles on their canvas instead of placing widgets in the rowTitles frame.
+        set_virtual_column_titles -- Draw the column titles on their canvas instead of placing widgets in the columnTitles frame.
+        
     """
 
     def __init__(self, parent, *args, **kw):
@@ -67,7 +78,15 @@ class TableFrame(ttk.Frame):
         rowTitlesFrame = ttk.Frame(leftColFrame)
         rowTitlesFrame.pack(fill=tk.BOTH, expand=True)
         self._rowTitlesCanvas = tk.Canvas(rowTitlesFrame, bd=0, highlightthickness=0)
-        self._rowTitlesCanvas.configure(yscrollcommand=scrollY.set)
+        self._drawRowTitles = None
+        # Callback for drawing the visible part of virtual row titles
+
+        def _set_rowTitles_yview(first, last):
+            scrollY.set(first, last)
+            if self._drawRowTitles is not None:
+                self._drawRowTitles()
+
+        self._rowTitlesCanvas.configure(yscrollcommand=_set_rowTitles_yview)
         self._rowTitlesCanvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self._rowTitlesCanvas.xview_moveto(0)
         self._rowTitlesCanvas.yview_moveto(0)
@@ -95,7 +114,15 @@ class TableFrame(ttk.Frame):
         columnTitlesFrame = ttk.Frame(rightColFrame)
         columnTitlesFrame.pack(fill=tk.X, anchor=tk.NW, expand=False)
         self._columnTitlesCanvas = tk.Canvas(columnTitlesFrame, bd=0, highlightthickness=0)
-        self._columnTitlesCanvas.configure(xscrollcommand=scrollX.set)
+        self._drawColumnTitles = None
+        # Callback for drawing the visible part of virtual column titles
+
+        def _set_columnTitles_xview(first, last):
+            scrollX.set(first, last)
+            if self._drawColumnTitles is not None:
+                self._drawColumnTitles()
+
+        self._columnTitlesCanvas.configure(xscrollcommand=_set_columnTitles_xview)
         self._columnTitlesCanvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self._columnTitlesCanvas.xview_moveto(0)
         self._columnTitlesCanvas.yview_moveto(0)
@@ -121,8 +148,21 @@ class TableFrame(ttk.Frame):
         displayFrame = ttk.Frame(rightColFrame)
         displayFrame.pack(fill=tk.BOTH, expand=True)
         self._displayCanvas = tk.Canvas(displayFrame, bd=0, highlightthickness=0)
-        self._displayCanvas.configure(xscrollcommand=scrollX.set)
-        self._displayCanvas.configure(yscrollcommand=scrollY.set)
+        self._drawDisplay = None
+        # Callback for drawing the visible part of a virtual display
+
+        def _set_display_xview(first, last):
+            scrollX.set(first, last)
+            if self._drawDisplay is not None:
+                self._drawDisplay()
+
+        def _set_display_yview(first, last):
+            scrollY.set(first, last)
+            if self._drawDisplay is not None:
+                self._drawDisplay()
+
+        self._displayCanvas.configure(xscrollcommand=_set_display_xview)
+        self._displayCanvas.configure(yscrollcommand=_set_display_yview)
         self._displayCanvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self._displayCanvas.xview_moveto(0)
         self._displayCanvas.yview_moveto(0)
@@ -161,6 +201,67 @@ class TableFrame(ttk.Frame):
             self._rowTitlesCanvas.bind_all("<Shift-MouseWheel>", self.on_shift_mouse_wheel)
             self._displayCanvas.bind_all("<Shift-MouseWheel>", self.on_shift_mouse_wheel)
 
+    def set_virtual_display(self, width, height, command):
+        """Draw the display on the display canvas instead of placing widgets in the display frame.
+        
+        Positional arguments:
+            width: int -- Width of the whole display in pixels.
+            height: int -- Height of the whole display in pixels.
+            command -- Callback for drawing the visible part of the display.
+        
+        The command is called without arguments whenever the visible part 
+        of the display canvas may have changed, i.e. after scrolling and resizing.
+        The scroll synchronization with the row and column titles is kept.
+        May be called again if the display size changes.
+        Return the display canvas.
+        """
+        self.display.unbind('<Configure>')
+        self._displayCanvas.itemconfigure('self.display', state=tk.HIDDEN)
+        self._displayCanvas.config(scrollregion=f'0 0 {width} {height}', width=width)
+        self._displayCanvas.bind('<Configure>', lambda event: command())
+        self._drawDisplay = command
+        return self._displayCanvas
+
+    def set_virtual_row_titles(self, width, height, command):
+        """Draw the row titles on their canvas instead of placing widgets in the rowTitles frame.
+        
+        Positional arguments:
+            width: int -- Width of the row titles in pixels.
+            height: int -- Height of all row titles in pixels; should be the display's height.
+            command -- Callback for drawing the visible row titles.
+        
+        The command is called without arguments whenever the visible part 
+        of the row titles canvas may have changed, i.e. after scrolling and resizing.
+        May be called again if the size changes.
+        Return the row titles canvas.
+        """
+        self.rowTitles.unbind('<Configure>')
+        self._rowTitlesCanvas.itemconfigure('self.rowTitles', state=tk.HIDDEN)
+        self._rowTitlesCanvas.config(scrollregion=f'0 0 {width} {height}', width=width)
+        self._rowTitlesCanvas.bind('<Configure>', lambda event: command())
+        self._drawRowTitles = command
+        return self._rowTitlesCanvas
+
+    def set_virtual_column_titles(self, width, height, command):
+        """Draw the column titles on their canvas instead of placing widgets in the columnTitles frame.
+        
+        Positional arguments:
+            width: int -- Width of all column titles in pixels; should be the display's width.
+            height: int -- Height of the column titles in pixels.
+            command -- Callback for drawing the visible column titles.
+        
+        The command is called without arguments whenever the visible part 
+        of the column titles canvas may have changed, i.e. after scrolling and resizing.
+        May be called again if the size changes.
+        Return the column titles canvas.
+        """
+        self.columnTitles.unbind('<Configure>')
+        self._columnTitlesCanvas.itemconfigure('self.columnTitles', state=tk.HIDDEN)
+        self._columnTitlesCanvas.config(scrollregion=f'0 0 {width} {height}', width=width, height=height)
+        self._columnTitlesCanvas.bind('<Configure>', lambda event: command())
+        self._drawColumnTitles = command
+        return self._columnTitlesCanvas
+
     def yview(self, *args):
         self._rowTitlesCanvas.yview(*args)
         self._displayCanvas.yview(*args)
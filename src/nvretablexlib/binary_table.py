@@ -0,0 +1,72 @@
+"""Provide a class for a binary columnar relationship table.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import struct
+from pywriter.pywriter_globals import *
+from nvretablexlib.matrix_export import MatrixExport
+
+
+class BinaryTable(MatrixExport):
+    """Binary columnar relationship table representation.
+
+    Public methods:
+        write() -- Write instance variables to the file.
+
+    File layout (all numbers little-endian):
+    - 8 bytes: MAGIC.
+    - 4 bytes: format VERSION (unsigned int).
+    - 4 bytes: length of the header in bytes (unsigned int).
+    - Header: UTF-8 encoded JSON object, padded with spaces to a multiple of 8 bytes.
+      "rows": number of scene rows.
+      "scenes": list of [scene ID, scene title], one per row.
+      "columns": list of [element type, element ID, element title], one per column.
+      "stride": length of a column bitmap in bytes.
+    - Column bitmaps in column order, each "stride" bytes long.
+      One bit per row, lowest bit first, as Apache Arrow stores booleans.
+      A bit is set if the row's scene is related to the column's element.
+
+    The column bitmaps begin at a multiple of 8 bytes,
+    so they can be memory-mapped and read without parsing.
+    """
+    DESCRIPTION = N_('Binary table')
+    EXTENSION = '.bin'
+    SUFFIX = '_matrix'
+    MAGIC = b'YWMATRIX'
+    VERSION = 1
+    _ALIGNMENT = 8
+
+    def write(self):
+        """Write the relationship matrix to the file.
+
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        from json import dumps
+        # Imported on first use, to speed up the program start.
+        matrix = self._get_matrix()
+        stride = -(-len(matrix.rows) // (8 * self._ALIGNMENT)) * self._ALIGNMENT
+        columns = []
+        for elemType in matrix.ELEMENT_TYPES:
+            for elemId in matrix.columns[elemType]:
+                columns.append([self.ELEMENT_TYPES[elemType], elemId, self._get_title(elemType, elemId)])
+        header = dumps({
+            'rows': len(matrix.rows),
+            'scenes': [[scId, self.novel.scenes[scId].title] for scId in matrix.rows],
+            'columns': columns,
+            'stride': stride,
+            }, ensure_ascii=False).encode('utf-8')
+        header += b' ' * (-len(header) % self._ALIGNMENT)
+        try:
+            with open(self.filePath, 'wb') as f:
+                f.write(self.MAGIC)
+                f.write(struct.pack('<II', self.VERSION, len(header)))
+                f.write(header)
+                for elemType in matrix.ELEMENT_TYPES:
+                    f.writelines(matrix.get_column_bitmaps(elemType, self._ALIGNMENT))
+        except:
+            raise Error(f'{_("Cannot write File")}: "{norm_path(self.filePath)}".')
+
+        return (f'{_("File written")}: "{norm_path(self.filePath)}".')
@@ -19,7 +19,7 @@ class CsvTable:
 
     Uses the conventions for Excel-generated CSV files.
     """
-    DESCRIPTION = _('csv Table')
+    DESCRIPTION = N_('csv Table')
     EXTENSION = '.csv'
     SUFFIX = '_relationships'
 
@@ -74,95 +74,154 @@ class CsvTable:
     def write(self):
         """Write the relations to the file.
         
+        The rows are generated one at a time while writing.
         Raise the "Error" exception in case of error. 
-        This is a stub to be overridden by subclass methods.
         """
         try:
             with open(self.filePath, 'w', newline='', encoding=self._csvEncoding) as f:
                 writer = csv.writer(f, dialect=self._csvDialect)
-
-                # Get arcs.
-                hasSubplot = False
-                arcs = []
-                scnArcs = {}
-                for chId in self.novel.srtChapters:
-                    for scId in self.novel.chapters[chId].srtScenes:
-                        if self.novel.scenes[scId].scType == 0:
-                            scnArcs[scId] = string_to_list(self.novel.scenes[scId].scnArcs)
-                            for arc in scnArcs[scId]:
-                                if not arc in arcs:
-                                    arcs.append(arc)
-                            if self.novel.scenes[scId].isSubPlot:
-                                hasSubplot = True
-
-                if hasSubplot and not arcs:
-                    arcs.append('Subplot')
-                    for scId in scnArcs:
-                        if self.novel.scenes[scId].isSubPlot:
-                            scnArcs[scId] = ['Subplot']
-
-                # Title row.
-                row = []
-                if self._csvRowNumbers:
-                    row.append('')
-                row.append('')
-                for arc in arcs:
-                    row.append(arc)
-                for crId in self.novel.characters:
-                    row.append(self.novel.characters[crId].title)
-                for lcId in self.novel.locations:
-                    row.append(self.novel.locations[lcId].title)
-                for itId in self.novel.items:
-                    row.append(self.novel.items[itId].title)
-                writer.writerow(row)
-
-                # Scene rows.
-                for i, scId in enumerate(scnArcs):
-                    row = []
-                    if self._csvRowNumbers:
-                        row.append(i + 1)
-                    row.append(self.novel.scenes[scId].title)
-                    for arc in arcs:
-                        if arc in scnArcs[scId]:
-                            entry = self._csvArcTrue
-                            if self._csv_arcPoints:
-                                # Use arc point titles instead of binary marker.
-                                pointIds = string_to_list(self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None))
-                                points = []
-                                for ptId in pointIds:
-                                    if arc in self.novel.scenes[ptId].scnArcs:
-                                        points.append(self.novel.scenes[ptId].title)
-                                if points:
-                                    entry = list_to_string(points)
-                            row.append(entry)
-                        else:
-                            row.append(self._csvArcFalse)
-                    for crId in self.novel.srtCharacters:
-                        try:
-                            if crId in self.novel.scenes[scId].characters:
-                                row.append(self._csvChrTrue)
-                            else:
-                                row.append(self._csvChrFalse)
-                        except:
-                            row.append(self._csvChrFalse)
-                    for lcId in self.novel.srtLocations:
-                        try:
-                            if lcId in self.novel.scenes[scId].locations:
-                                row.append(self._csvLocTrue)
-                            else:
-                                row.append(self._csvLocFalse)
-                        except:
-                            row.append(self._csvLocFalse)
-                    for itId in self.novel.srtItems:
-                        try:
-                            if itId in self.novel.scenes[scId].items:
-                                row.append(self._csvItmTrue)
-                            else:
-                                row.append(self._csvItmFalse)
-                        except:
-                            row.append(self._csvItmFalse)
-                    writer.writerow(row)
+                writer.writerows(self._get_rows())
         except:
             raise Error(f'{_("Cannot write File")}: "{norm_path(self.filePath)}".')
 
         return (f'{_("File written")}: "{norm_path(self.filePath)}".')
+
+    def _get_rows(self):
+        """Generate the title row and the scene rows.
+        
+        Each scene row is a copy of a row with all relationships unset.
+        The scene's relationships are set via the column positions 
+        of the related elements, so the time needed per row does not 
+        depend on the number of elements.
+        """
+
+        # Get arcs.
+        hasSubplot = False
+        arcs = {}
+        # key: arc title; value: column position, set after all arcs are found
+        scnArcs = {}
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                if self.novel.scenes[scId].scType == 0:
+                    scnArcs[scId] = self.novel.scenes[scId].arcs
+                    for arc in scnArcs[scId]:
+                        if not arc in arcs:
+                            arcs[arc] = None
+                    if self.novel.scenes[scId].isSubPlot:
+                        hasSubplot = True
+
+        if hasSubplot and not arcs:
+            arcs['Subplot'] = None
+            for scId in scnArcs:
+                if self.novel.scenes[scId].isSubPlot:
+                    scnArcs[scId] = ('Subplot',)
+
+        # Column positions.
+        if self._csvRowNumbers:
+            titleColumn = 1
+        else:
+            titleColumn = 0
+        column = titleColumn + 1
+        for arc in arcs:
+            arcs[arc] = column
+            column += 1
+        characterColumns = {}
+        for crId in self.novel.srtCharacters:
+            characterColumns[crId] = column
+            column += 1
+        locationColumns = {}
+        for lcId in self.novel.srtLocations:
+            locationColumns[lcId] = column
+            column += 1
+        itemColumns = {}
+        for itId in self.novel.srtItems:
+            itemColumns[itId] = column
+            column += 1
+
+        # Title row.
+        row = [''] * (titleColumn + 1)
+        row.extend(arcs)
+        row.extend(self.novel.characters[crId].title for crId in characterColumns)
+        row.extend(self.novel.locations[lcId].title for lcId in locationColumns)
+        row.extend(self.novel.items[itId].title for itId in itemColumns)
+        yield row
+
+        if self._csv_arcPoints:
+            arcPoints = self._get_arc_points(scnArcs)
+        else:
+            arcPoints = {}
+
+        # Scene rows.
+        emptyRow = [''] * (titleColumn + 1)
+        emptyRow.extend([self._csvArcFalse] * len(arcs))
+        emptyRow.extend([self._csvChrFalse] * len(characterColumns))
+        emptyRow.extend([self._csvLocFalse] * len(locationColumns))
+        emptyRow.extend([self._csvItmFalse] * len(itemColumns))
+        for i, scId in enumerate(scnArcs):
+            row = emptyRow[:]
+            if self._csvRowNumbers:
+                row[0] = i + 1
+            row[titleColumn] = self.novel.scenes[scId].title
+            for arc in scnArcs[scId]:
+                row[arcs[arc]] = self._csvArcTrue
+            if scId in arcPoints:
+                # Use arc point titles instead of binary marker.
+                for arc, points in arcPoints[scId].items():
+                    if arc in scnArcs[scId]:
+                        row[arcs[arc]] = list_to_string(points)
+            for crId in self.novel.scenes[scId].characters or ():
+                if crId in characterColumns:
+                    row[characterColumns[crId]] = self._csvChrTrue
+            for lcId in self.novel.scenes[scId].locations or ():
+                if lcId in locationColumns:
+                    row[locationColumns[lcId]] = self._csvLocTrue
+            for itId in self.novel.scenes[scId].items or ():
+                if itId in itemColumns:
+                    row[itemColumns[itId]] = self._csvItmTrue
+            yield row
+
+    def _get_arc_points(self, scnArcs):
+        """Return a dictionary with the titles of the arc points associated with the scenes.
+        
+        Positional arguments:
+            scnArcs: dict -- key: scene ID; value: tuple of the scene's arcs.
+        
+        Return a dictionary: key: scene ID; value: {arc: list of point titles}.
+        Scenes without associated arc points are omitted.
+        The arcs of the point scenes are parsed only once.
+        """
+        pointArcs = {}
+        arcPoints = {}
+        for scId in scnArcs:
+            points = self._get_scene_arc_points(scId, pointArcs)
+            if points:
+                arcPoints[scId] = points
+        return arcPoints
+
+    def _get_scene_arc_points(self, scId, pointArcs):
+        """Return a dictionary with the titles of the arc points associated with a scene.
+        
+        Positional arguments:
+            scId: str -- scene ID.
+            pointArcs: dict -- key: point scene ID; value: tuple of the point's arcs.
+        
+        Return a dictionary: key: arc; value: list of point titles.
+        The arcs of new point scenes are added to pointArcs, 
+        so they are looked up only once per export. 
+        """
+        points = {}
+        sceneAssoc = self.novel.scenes[scId].kwVar.get('Field_SceneAssoc', None)
+        if not sceneAssoc:
+            return points
+
+        for ptId in string_to_list(sceneAssoc):
+            if not ptId in self.novel.scenes:
+                continue
+
+            if not ptId in pointArcs:
+                pointArcs[ptId] = self.novel.scenes[ptId].arcs
+            for arc in pointArcs[ptId]:
+                if not arc in points:
+                    points[arc] = []
+                points[arc].append(self.novel.scenes[ptId].title)
+        return points
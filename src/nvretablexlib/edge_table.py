@@ -0,0 +1,74 @@
+"""Provide a class for a csv relationship edge list.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pywriter.pywriter_globals import *
+from nvretablexlib.csv_table import CsvTable
+
+
+class EdgeTable(CsvTable):
+    """csv relationship edge list representation.
+
+    Public methods:
+        write() -- Write instance variables to the file.
+
+    Public instance variables:
+        filePath: str -- path to the file (property with getter and setter).
+
+    Unlike the csv table, there is one row per relationship:
+    scene ID, scene title, element type, element ID, element title, arc points.
+    The element type is "arc", "character", "location", or "item".
+    Arcs are identified by their titles. The "arc points" column holds
+    the titles of the scene's associated points that belong to the arc.
+    If there are no arcs, like in the csv table, yWriter "subplot" scenes 
+    are related to the "Subplot" arc.
+    """
+    DESCRIPTION = N_('csv edge list')
+    SUFFIX = '_edges'
+
+    def _get_rows(self):
+        """Generate the title row and one row per relationship.
+
+        The scenes are processed in a single pass, so the output
+        is proportional to the number of relationships.
+        Only the search for arcs, which determines the "Subplot" arc, 
+        stops at the first scene with arcs.
+        Overrides the superclass method.
+        """
+        yield ['Scene ID', 'Scene title', 'Type', 'ID', 'Title', 'Arc points']
+        pointArcs = {}
+        # key: point scene ID; value: tuple of the point's arcs
+
+        def has_arcs():
+            for chId in self.novel.srtChapters:
+                for scId in self.novel.chapters[chId].srtScenes:
+                    if self.novel.scenes[scId].scType == 0 and self.novel.scenes[scId].arcs:
+                        return True
+            return False
+
+        subplot = not has_arcs()
+        # If True, "subplot" scenes are related to the "Subplot" arc.
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                scene = self.novel.scenes[scId]
+                if scene.scType != 0:
+                    continue
+
+                scnArcs = scene.arcs
+                if subplot and scene.isSubPlot:
+                    scnArcs = ('Subplot',)
+                if scnArcs:
+                    points = self._get_scene_arc_points(scId, pointArcs)
+                    for arc in scnArcs:
+                        yield [scId, scene.title, 'arc', arc, arc, list_to_string(points.get(arc, []))]
+                for crId in scene.characters or ():
+                    if crId in self.novel.characters:
+                        yield [scId, scene.title, 'character', crId, self.novel.characters[crId].title, '']
+                for lcId in scene.locations or ():
+                    if lcId in self.novel.locations:
+                        yield [scId, scene.title, 'location', lcId, self.novel.locations[lcId].title, '']
+                for itId in scene.items or ():
+                    if itId in self.novel.items:
+                        yield [scId, scene.title, 'item', itId, self.novel.items[itId].title, '']
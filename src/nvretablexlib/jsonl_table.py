@@ -0,0 +1,67 @@
+"""Provide a class for a JSON Lines relationship list.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pywriter.pywriter_globals import *
+from pywriter.model.relations_matrix import RelationsMatrix
+from nvretablexlib.matrix_export import MatrixExport
+
+
+class JsonlTable(MatrixExport):
+    """JSON Lines relationship list representation.
+
+    Public methods:
+        write() -- Write instance variables to the file.
+
+    Each line holds a JSON object with a "type" key.
+    - One line per arc, character, location, and item:
+      {"type": element type, "id": element ID, "title": element title}
+    - One line per "normal" scene, with the IDs of the related elements:
+      {"type": "scene", "id": scene ID, "title": scene title,
+      "arcs": [...], "characters": [...], "locations": [...], "items": [...]}
+    The element type is "arc", "character", "location", or "item", as in the csv edge list.
+    Arcs are identified by their titles.
+    """
+    DESCRIPTION = N_('JSON Lines')
+    EXTENSION = '.jsonl'
+    SUFFIX = '_relations'
+    SCENE_KEYS = {
+        RelationsMatrix.ARCS: 'arcs',
+        RelationsMatrix.CHARACTERS: 'characters',
+        RelationsMatrix.LOCATIONS: 'locations',
+        RelationsMatrix.ITEMS: 'items',
+        }
+    # Keys of the scene lines' lists of related element IDs.
+
+    def write(self):
+        """Write the relationships to the file.
+
+        The lines are generated one at a time while writing.
+        Raise the "Error" exception in case of error.
+        Overrides the superclass method.
+        """
+        try:
+            with open(self.filePath, 'w', encoding='utf-8') as f:
+                f.writelines(self._get_lines())
+        except:
+            raise Error(f'{_("Cannot write File")}: "{norm_path(self.filePath)}".')
+
+        return (f'{_("File written")}: "{norm_path(self.filePath)}".')
+
+    def _get_lines(self):
+        """Generate the element lines and the scene lines."""
+        from json import dumps
+        # Imported on first use, to speed up the program start.
+        matrix = self._get_matrix()
+        for elemType in matrix.ELEMENT_TYPES:
+            typeName = self.ELEMENT_TYPES[elemType]
+            for elemId in matrix.columns[elemType]:
+                line = {'type': typeName, 'id': elemId, 'title': self._get_title(elemType, elemId)}
+                yield f'{dumps(line, ensure_ascii=False)}\n'
+        for row, scId in enumerate(matrix.rows):
+            line = {'type': 'scene', 'id': scId, 'title': self.novel.scenes[scId].title}
+            for elemType in matrix.ELEMENT_TYPES:
+                line[self.SCENE_KEYS[elemType]] = matrix.get_ids(elemType, row)
+            yield f'{dumps(line, ensure_ascii=False)}\n'
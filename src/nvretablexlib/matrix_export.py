@@ -0,0 +1,68 @@
+"""Provide an abstract class for relationship matrix exports.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+from pywriter.pywriter_globals import *
+from pywriter.file.file import File
+from pywriter.model.relations_matrix import RelationsMatrix
+
+
+class MatrixExport(File):
+    """Abstract relationship matrix export.
+
+    Public methods:
+        write() -- Write instance variables to the file.
+
+    The matrix has one row per "normal" scene, and one column per
+    arc, character, location, and item, like the csv table.
+    """
+    ELEMENT_TYPES = {
+        RelationsMatrix.ARCS: 'arc',
+        RelationsMatrix.CHARACTERS: 'character',
+        RelationsMatrix.LOCATIONS: 'location',
+        RelationsMatrix.ITEMS: 'item',
+        }
+    # Element type names used in the exported files, as in the csv edge list.
+
+    def _get_matrix(self):
+        """Return a RelationsMatrix instance with the novel's relationships."""
+        hasSubplot = False
+        arcs = {}
+        # key: arc title; value: None (a dictionary keeps the order, and has a fast look-up)
+        scIds = []
+        for chId in self.novel.srtChapters:
+            for scId in self.novel.chapters[chId].srtScenes:
+                if self.novel.scenes[scId].scType == 0:
+                    scIds.append(scId)
+                    for arc in self.novel.scenes[scId].arcs:
+                        if not arc in arcs:
+                            arcs[arc] = None
+                    if self.novel.scenes[scId].isSubPlot:
+                        hasSubplot = True
+        subplot = hasSubplot and not arcs
+        if subplot:
+            arcs['Subplot'] = None
+        matrix = RelationsMatrix(scIds,
+                                 arcs=arcs,
+                                 characters=self.novel.srtCharacters,
+                                 locations=self.novel.srtLocations,
+                                 items=self.novel.srtItems,
+                                 subplot=subplot)
+        matrix.read_scenes(self.novel)
+        return matrix
+
+    def _get_title(self, elemType, elemId):
+        """Return the title of an arc, character, location, or item."""
+        if elemType == RelationsMatrix.ARCS:
+            return elemId
+
+        elif elemType == RelationsMatrix.CHARACTERS:
+            return self.novel.characters[elemId].title
+
+        elif elemType == RelationsMatrix.LOCATIONS:
+            return self.novel.locations[elemId].title
+
+        else:
+            return self.novel.items[elemId].title
@@ -0,0 +1,198 @@
+"""Provide a class for recording the durations of time-critical operations.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from pywriter.pywriter_globals import *
+
+
+class Instrumentation:
+    """Opt-in recorder of the durations and counts of time-critical operations.
+
+    Public methods:
+        enable(logDir, profile) -- Start recording, and write the log to logDir.
+        timer(name, profile) -- Return a context manager that records the duration of its block.
+        record(name, startTime, seconds) -- Record the duration of an operation measured by the caller.
+        get_summary() -- Return a list of (name, count, total seconds, maximum seconds) tuples.
+
+    Public instance variables:
+        enabled: bool -- if True, the operations are recorded.
+        logPath: str -- path to the log file.
+        profile: bool -- if True, the operations marked for profiling run under cProfile.
+
+    The log is a JSON Lines file with one line per recorded operation:
+    {"time": ISO start time, "name": operation, "seconds": duration, "thread": thread name}.
+    The cProfile statistics are written to "<name>.prof" files in the log directory,
+    overwriting the ones of the previous run of the same operation.
+    When disabled, the timers do nothing.
+    """
+    LOG_FILE = 'instrumentation.jsonl'
+
+    def __init__(self):
+        self.enabled = False
+        self.logPath = None
+        self.profile = False
+        self._logDir = None
+        self._records = {}
+        # key: operation name; value: [count, total seconds, maximum seconds]
+        self._lock = threading.Lock()
+        # The operations may be recorded in the main thread and in worker threads.
+
+    def enable(self, logDir, profile=False):
+        """Start recording, and write the log to logDir.
+
+        Positional arguments:
+            logDir: str -- directory for the log file and the cProfile statistics.
+
+        Optional arguments:
+            profile: bool -- if True, the operations marked for profiling run under cProfile.
+        """
+        try:
+            os.makedirs(logDir, exist_ok=True)
+        except:
+            pass
+        self._logDir = logDir
+        self.logPath = os.path.join(logDir, self.LOG_FILE)
+        self.profile = profile
+        self.enabled = True
+
+    def timer(self, name, profile=False):
+        """Return a context manager that records the duration of its block.
+
+        Positional arguments:
+            name: str -- operation name.
+
+        Optional arguments:
+            profile: bool -- if True, the block runs under cProfile, if profiling is enabled.
+        """
+        if not self.enabled:
+            return _NO_TIMER
+
+        return _Timer(self, name, profile and self.profile)
+
+    def record(self, name, startTime, seconds):
+        """Record the duration of an operation measured by the caller.
+
+        Positional arguments:
+            name: str -- operation name.
+            startTime: float -- start time in seconds since the epoch.
+            seconds: float -- duration.
+
+        This is for operations consisting of many short steps, whose durations are added up.
+        When disabled, nothing is recorded.
+        """
+        if self.enabled:
+            self._record(name, startTime, seconds)
+
+    def get_summary(self):
+        """Return a list of (name, count, total seconds, maximum seconds) tuples, sorted by name."""
+        with self._lock:
+            return [(name, *self._records[name]) for name in sorted(self._records)]
+
+    def _record(self, name, startTime, seconds):
+        """Add an operation's duration to the summary, and write it to the log.
+
+        Logging errors are ignored, so the instrumentation cannot affect the application.
+        """
+        from json import dumps
+        line = dumps({
+            'time': datetime.fromtimestamp(startTime).isoformat(),
+            'name': name,
+            'seconds': round(seconds, 6),
+            'thread': threading.current_thread().name,
+            })
+        with self._lock:
+            record = self._records.setdefault(name, [0, 0.0, 0.0])
+            record[0] += 1
+            record[1] += seconds
+            record[2] = max(record[2], seconds)
+            try:
+                with open(self.logPath, 'a', encoding='utf-8') as f:
+                    f.write(f'{line}\n')
+            except:
+                pass
+
+    def _write_profile(self, name, profiler):
+        """Write the cProfile statistics of an operation to the log directory."""
+        try:
+            profiler.dump_stats(os.path.join(self._logDir, f'{name}.prof'))
+        except:
+            pass
+
+
+class _Timer:
+    """Context manager recording the duration of its block."""
+
+    def __init__(self, instrumentation, name, profile):
+        self._instrumentation = instrumentation
+        self._name = name
+        self._profiler = None
+        if profile:
+            from cProfile import Profile
+            self._profiler = Profile()
+
+    def __enter__(self):
+        self._startTime = time.time()
+        self._start = time.perf_counter()
+        if self._profiler is not None:
+            try:
+                self._profiler.enable()
+            except:
+                # Another profiler is active, e.g. in a nested block.
+                self._profiler = None
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        if self._profiler is not None:
+            self._profiler.disable()
+        self._instrumentation._record(self._name, self._startTime, time.perf_counter() - self._start)
+        if self._profiler is not None:
+            self._instrumentation._write_profile(self._name, self._profiler)
+        return False
+
+
+class _NoTimer:
+    """Context manager doing nothing, for disabled instrumentation."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+INSTRUMENTATION = Instrumentation()
+# The application-wide instance; disabled unless the application enables it.
+
+
+def instrumented(name, profile=False):
+    """Return a decorator that records the durations of a method's calls.
+
+    Positional arguments:
+        name: str -- operation name.
+
+    Optional arguments:
+        profile: bool -- if True, the method runs under cProfile, if profiling is enabled.
+    """
+
+    def decorator(method):
+
+        def wrapper(*args, **kwargs):
+            if not INSTRUMENTATION.enabled:
+                return method(*args, **kwargs)
+
+            with INSTRUMENTATION.timer(name, profile):
+                return method(*args, **kwargs)
+
+        wrapper.__name__ = method.__name__
+        wrapper.__doc__ = method.__doc__
+        return wrapper
+
+    return decorator
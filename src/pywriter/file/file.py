@@ -7,7 +7,6 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 from abc import ABC
-from urllib.parse import quote
 import os
 from pywriter.pywriter_globals import *
 
@@ -38,7 +37,7 @@ class File(ABC):
         ITM_KWVAR -- List of the names of the item keyword variables.
         PNT_KWVAR -- List of the names of the project note keyword variables.
     """
-    DESCRIPTION = _('File')
+    DESCRIPTION = N_('File')
     EXTENSION = None
     SUFFIX = None
     # To be extended by subclass methods.
@@ -101,6 +100,8 @@ class File(ABC):
                 # realpath() completes relative paths, but may not work on virtual file systems.
             except:
                 head, tail = os.path.split(filePath)
+            from urllib.parse import quote
+            # Imported on first use, to speed up the program start.
             self.projectPath = quote(head.replace('\\', '/'), '/:')
             self.projectName = quote(tail.replace(f'{suffix}{self.EXTENSION}', ''))
 
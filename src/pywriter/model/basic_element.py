@@ -4,19 +4,70 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from operator import attrgetter
+
+_slotNames = {}
+# key: class; value: tuple (slot names of the class and its base classes, getter returning their values)
+
+
+def _track_slots(elementClass):
+    """Replace the class's own slots by properties marking the element as modified when assigned.
+    
+    Positional arguments:
+        elementClass -- BasicElement or a subclass.
+    
+    The properties store the values in the original slots. Reading a value 
+    takes about as long as before, because the getter is the slot's own.
+    Slots listed in the class's _UNTRACKED are left unchanged.
+    """
+    set_modified = BasicElement.__dict__['_isModified'].__set__
+    for name in elementClass.__dict__.get('__slots__', ()):
+        if name in elementClass._UNTRACKED:
+            continue
+
+        slot = elementClass.__dict__[name]
+        set_slot = slot.__set__
+
+        def set_value(element, value, set_slot=set_slot):
+            set_slot(element, value)
+            set_modified(element, True)
+
+        setattr(elementClass, name, property(slot.__get__, set_value))
 
 
 class BasicElement:
     """Basic element representation (may be a project note).
     
+    Public methods:
+        get_vars() -- Return a dictionary with the instance variables.
+        set_vars(instanceVars) -- Set instance variables from a dictionary.
+
     Public instance variables:
         title: str -- title (name).
         desc: str -- description.
         kwVar: dict -- custom keyword variables.
+        isModified: bool -- True, if the element has changed since it was marked as unmodified (property with getter and setter).
+
+    The instance variables are stored in slots instead of a per-instance dictionary,
+    which saves memory with large projects. Subclasses declare the slots of their 
+    own instance variables. A subclass without __slots__ (e.g. Novel) keeps its own 
+    instance variables in a dictionary.
+    kwVar holds only the custom fields that are actually set.
+    Assigning an instance variable marks the element as modified,
+    so checking for modifications takes constant time, and no copy is kept.
+    Lists and dictionaries modified in place are not detected, 
+    so assign a new value, or set isModified.
     """
+    __slots__ = ('_isModified', 'title', 'desc', 'kwVar')
+
+    _UNTRACKED = frozenset(('_isModified', 'isModified'))
+    # Names of instance variables whose assignment doesn't mark the element as modified.
 
     def __init__(self):
         """Initialize instance variables."""
+        self._isModified = True
+        # True, if an instance variable has been assigned since the element was marked as unmodified.
+
         self.title = None
         # xml: <Title>
 
@@ -25,3 +76,53 @@ class BasicElement:
 
         self.kwVar = {}
         # Optional key/value instance variables for customization.
+
+    def __init_subclass__(cls, **kwargs):
+        """Track the assignments of the subclass's own slots.
+        
+        Extends the superclass method.
+        """
+        super().__init_subclass__(**kwargs)
+        _track_slots(cls)
+
+    @property
+    def isModified(self):
+        return self._isModified
+
+    @isModified.setter
+    def isModified(self, modified):
+        self._isModified = modified
+
+    def get_vars(self):
+        """Return a dictionary with the instance variables.
+        
+        Unlike vars(), include the instance variables stored in slots.
+        """
+        try:
+            names, getter = _slotNames[self.__class__]
+        except KeyError:
+            names = []
+            for elementClass in reversed(self.__class__.__mro__):
+                names.extend(elementClass.__dict__.get('__slots__', ()))
+            names = tuple(names)
+            getter = attrgetter(*names)
+            _slotNames[self.__class__] = names, getter
+        instanceVars = dict(zip(names, getter(self)))
+        try:
+            instanceVars.update(self.__dict__)
+        except AttributeError:
+            # The class has slots only.
+            pass
+        return instanceVars
+
+    def set_vars(self, instanceVars):
+        """Set instance variables from a dictionary.
+        
+        Positional arguments:
+            instanceVars: dict -- key: instance variable name, as returned by get_vars(); value: value.
+        """
+        for name, value in instanceVars.items():
+            setattr(self, name, value)
+
+
+_track_slots(BasicElement)
@@ -4,6 +4,8 @@ Copyright (c) 2023 Peter Triesberger
 For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
+from heapq import heappop
+from heapq import heappush
 
 
 def create_id(elements):
@@ -11,9 +13,87 @@ def create_id(elements):
     
     Positional arguments:
         elements -- list or dictionary containing all existing IDs
+        
+    The IDs are searched from 1 upwards. For creating many elements, use an IdAllocator.
     """
     i = 1
     while str(i) in elements:
         i += 1
     return str(i)
 
+
+class IdAllocator:
+    """Allocator of unused IDs for the elements of a collection.
+    
+    Public methods:
+        create_id() -- Return an unused ID for a new element.
+        create_ids(count) -- Return a list of unused IDs for new elements.
+        release_id(elemId) -- Make the ID of a removed element available again.
+
+    Public instance variables:
+        elements -- list, dictionary, or set containing all existing IDs.
+
+    The allocator keeps a cursor at the lowest number not checked yet, 
+    and a heap of the released IDs below. Like create_id(), it returns 
+    the lowest unused ID first, but it never checks the same number twice: 
+    the cursor only moves upwards, so each ID takes amortized constant time, 
+    and a released ID takes logarithmic time. The memory used depends 
+    on the number of released IDs, not on the values of the IDs in use.
+    Each ID is returned only once, even if the new element is added later.
+    IDs added to the collection by other means are skipped.
+    """
+
+    def __init__(self, elements):
+        """Set the cursor to the lowest ID.
+        
+        Positional arguments:
+            elements -- list, dictionary, or set containing all existing IDs.
+            
+        The allocator keeps a reference to the collection for skipping the IDs 
+        in use. For large collections, use a dictionary or a set,
+        because the membership test of a list is slow.
+        """
+        self.elements = elements
+        self._nextNumber = 1
+        # Lowest number not checked yet.
+        self._released = []
+        # Heap of the released numbers below self._nextNumber.
+
+    def create_id(self):
+        """Return an unused ID for a new element."""
+        while True:
+            if self._released:
+                number = heappop(self._released)
+            else:
+                number = self._nextNumber
+                self._nextNumber += 1
+            elemId = str(number)
+            if not elemId in self.elements:
+                return elemId
+
+    def create_ids(self, count):
+        """Return a list of unused IDs for new elements.
+        
+        Positional arguments:
+            count: int -- number of IDs.
+        """
+        return [self.create_id() for __ in range(count)]
+
+    def release_id(self, elemId):
+        """Make the ID of a removed element available again.
+        
+        Positional arguments:
+            elemId: str -- ID of an element removed from the collection.
+        
+        IDs still in the collection are ignored. Release each ID only once.
+        """
+        if elemId in self.elements:
+            return
+
+        try:
+            number = int(elemId)
+        except (TypeError, ValueError):
+            return
+
+        if 0 < number < self._nextNumber and str(number) == elemId:
+            heappush(self._released, number)
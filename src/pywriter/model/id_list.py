@@ -0,0 +1,70 @@
+"""Provide a list class for sorted element IDs with a hashed index.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+
+
+class IdList(list):
+    """List of sorted element IDs with constant-time membership test.
+
+    The list keeps a set of its elements in sync with all modifications,
+    so the "in" operator does not need to scan the list.
+    Otherwise, IdList behaves like a list.
+    """
+
+    def __init__(self, iterable=()):
+        super().__init__(iterable)
+        self._ids = set(self)
+
+    def __contains__(self, elemId):
+        return elemId in self._ids
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._ids = set(self)
+
+    def __iadd__(self, iterable):
+        result = super().__iadd__(iterable)
+        self._ids = set(self)
+        return result
+
+    def __imul__(self, n):
+        result = super().__imul__(n)
+        self._ids = set(self)
+        return result
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._ids = set(self)
+
+    def append(self, elemId):
+        super().append(elemId)
+        self._ids.add(elemId)
+
+    def clear(self):
+        super().clear()
+        self._ids.clear()
+
+    def extend(self, iterable):
+        super().extend(iterable)
+        self._ids = set(self)
+
+    def insert(self, index, elemId):
+        super().insert(index, elemId)
+        self._ids.add(elemId)
+
+    def pop(self, index=-1):
+        elemId = super().pop(index)
+        self._discard(elemId)
+        return elemId
+
+    def remove(self, elemId):
+        super().remove(elemId)
+        self._discard(elemId)
+
+    def _discard(self, elemId):
+        """Remove elemId from the index, if the list does not contain it any longer."""
+        if not list.__contains__(self, elemId):
+            self._ids.discard(elemId)
@@ -5,11 +5,10 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import locale
-import re
 from pywriter.pywriter_globals import *
 from pywriter.model.basic_element import BasicElement
-
-LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+from pywriter.model.id_list import IdList
+from pywriter.model.id_generator import IdAllocator
 
 
 class Novel(BasicElement):
@@ -22,6 +21,7 @@ class Novel(BasicElement):
     Public methods:
         get_languages() -- Determine the languages used in the document.
         check_locale() -- Check the document's locale (language code and country code).
+        get_id_allocator(collection) -- Return the ID allocator for one of the element collections.
 
     Public instance variables:
         authorName -- author's name.
@@ -34,11 +34,11 @@ class Novel(BasicElement):
         scenes: dict -- (key: ID, value: scene instance).
         srtChapters: list -- the novel's sorted chapter IDs.
         locations: dict -- (key: ID, value: WorldElement instance).
-        srtLocations: list -- the novel's sorted location IDs.
+        srtLocations: IdList -- the novel's sorted location IDs (property with getter and setter).
         items: dict -- (key: ID, value: WorldElement instance).
-        srtItems: list -- the novel's sorted item IDs.
+        srtItems: IdList -- the novel's sorted item IDs (property with getter and setter).
         characters: dict -- (key: ID, value: character instance).
-        srtCharacters: list -- the novel's sorted character IDs.
+        srtCharacters: IdList -- the novel's sorted character IDs (property with getter and setter).
         projectNotes: dict --  (key: ID, value: projectNote instance).
         srtPrjNotes: list -- the novel's sorted project notes.
     """
@@ -101,25 +101,28 @@ class Novel(BasicElement):
         # key = location ID, value = WorldElement instance.
         # The order of the elements does not matter.
 
-        self.srtLocations = []
+        self._srtLocations = IdList()
         # The novel's location IDs. The order of its elements
         # corresponds to the XML project file.
+        # The IdList provides a hashed index for the membership test.
 
         self.items = {}
         # xml: <ITEMS>
         # key = item ID, value = WorldElement instance.
         # The order of the elements does not matter.
 
-        self.srtItems = []
+        self._srtItems = IdList()
         # The novel's item IDs. The order of its elements corresponds to the XML project file.
+        # The IdList provides a hashed index for the membership test.
 
         self.characters = {}
         # xml: <CHARACTERS>
         # key = character ID, value = Character instance.
         # The order of the elements does not matter.
 
-        self.srtCharacters = []
+        self._srtCharacters = IdList()
         # The novel's character IDs. The order of its elements corresponds to the XML project file.
+        # The IdList provides a hashed index for the membership test.
 
         self.projectNotes = {}
         # xml: <PROJECTNOTES>
@@ -135,6 +138,45 @@ class Novel(BasicElement):
         self.countryCode = None
         # Country code acc. to ISO 3166-2.
 
+        self._idAllocators = {}
+        # key = name of an element collection, value = IdAllocator instance.
+
+    @property
+    def srtCharacters(self):
+        return self._srtCharacters
+
+    @srtCharacters.setter
+    def srtCharacters(self, crIds):
+        """Setter for the srtCharacters instance variable.
+        
+        Wrap the character IDs in an IdList, so the membership test uses a hashed index.
+        """
+        self._srtCharacters = IdList(crIds)
+
+    @property
+    def srtLocations(self):
+        return self._srtLocations
+
+    @srtLocations.setter
+    def srtLocations(self, lcIds):
+        """Setter for the srtLocations instance variable.
+        
+        Wrap the location IDs in an IdList, so the membership test uses a hashed index.
+        """
+        self._srtLocations = IdList(lcIds)
+
+    @property
+    def srtItems(self):
+        return self._srtItems
+
+    @srtItems.setter
+    def srtItems(self, itIds):
+        """Setter for the srtItems instance variable.
+        
+        Wrap the item IDs in an IdList, so the membership test uses a hashed index.
+        """
+        self._srtItems = IdList(itIds)
+
     def get_languages(self):
         """Determine the languages used in the document.
         
@@ -142,29 +184,15 @@ class Novel(BasicElement):
         Example:
         - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
         - language code: 'en-AU'
+        Each scene keeps its language codes until its content changes, 
+        so only the changed scenes are scanned again.
         """
-
-        def languages(text):
-            """Return the language codes appearing in text.
-            
-            Example:
-            - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
-            - language code: 'en-AU'
-            """
-            if text:
-                m = LANGUAGE_TAG.search(text)
-                while m:
-                    text = text[m.span()[1]:]
-                    yield m.group(1)
-                    m = LANGUAGE_TAG.search(text)
-
-        self.languages = []
+        languages = {}
+        # key: language code; value: None (a dictionary keeps the order, and has a fast look-up)
         for scId in self.scenes:
-            text = self.scenes[scId].sceneContent
-            if text:
-                for language in languages(text):
-                    if not language in self.languages:
-                        self.languages.append(language)
+            for language in self.scenes[scId].languages:
+                languages[language] = None
+        self.languages = list(languages)
 
     def check_locale(self):
         """Check the document's locale (language code and country code).
@@ -196,3 +224,18 @@ class Novel(BasicElement):
         self.languageCode = 'zxx'
         self.countryCode = 'none'
 
+    def get_id_allocator(self, collection):
+        """Return the ID allocator for one of the element collections.
+        
+        Positional arguments:
+            collection: str -- 'chapters', 'scenes', 'characters', 'locations', 'items', or 'projectNotes'.
+        
+        The allocator is created on first use, and re-created if the collection has been replaced.
+        Example: scId = novel.get_id_allocator('scenes').create_id()
+        """
+        elements = getattr(self, collection)
+        allocator = self._idAllocators.get(collection, None)
+        if allocator is None or allocator.elements is not elements:
+            allocator = IdAllocator(elements)
+            self._idAllocators[collection] = allocator
+        return allocator
@@ -0,0 +1,239 @@
+"""Provide a class for a compact scene relationship matrix.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+from pywriter.pywriter_globals import *
+
+_BYTE_BITS = tuple(tuple(bool(byte & (1 << bit)) for bit in range(8)) for byte in range(256))
+# The states of the eight bits of each byte value, lowest bit first.
+
+_BYTE_COLUMNS = tuple(tuple(bit for bit in range(8) if byte & (1 << bit)) for byte in range(256))
+# The positions of the set bits of each byte value.
+
+
+class RelationsMatrix:
+    """Matrix of the relationships between scenes and arcs, characters, locations, and items.
+
+    Public methods:
+        is_set(elemType, row, col) -- Return True if the row's scene is related to the column's element.
+        set_state(elemType, row, col, state) -- Relate or unrelate the row's scene and the column's element.
+        toggle(elemType, row, col) -- Invert a relationship and return its new state.
+        get_row(elemType, row) -- Return a list with the relationship states of a scene, one per column.
+        get_ids(elemType, row) -- Return a list with the IDs of the elements related to a scene.
+        set_ids(elemType, row, elemIds) -- Relate a scene to the given elements only.
+        get_column_bitmaps(elemType, alignment) -- Return a list with one bitmap of related rows per column.
+        read_scenes(novel) -- Set the matrix according to the scenes' relationships.
+        write_scenes(novel) -- Assign the changed relationships to the scenes.
+        get_changes(novel) -- Return a tuple with the relationships that differ from the scenes'.
+        apply_changes(novel, changes) -- Assign relationships returned by get_changes() to the scenes.
+
+    Public instance variables:
+        rows: list -- scene IDs, one per row.
+        columns: dict -- (key: element type; value: list of element IDs, one per column).
+        subplot: bool -- if True, the only arc column represents the scenes' subplot flag.
+
+    The element types are ARCS, CHARACTERS, LOCATIONS, and ITEMS.
+    The arc "IDs" are the arc titles.
+    There is one bytearray per element type, holding one bit per row and column.
+    Each row begins at a byte boundary.
+    """
+    ARCS = 'scnArcs'
+    CHARACTERS = 'characters'
+    LOCATIONS = 'locations'
+    ITEMS = 'items'
+    ELEMENT_TYPES = (ARCS, CHARACTERS, LOCATIONS, ITEMS)
+    # The element types are named after the scene's instance variables.
+
+    def __init__(self, rows, arcs=None, characters=None, locations=None, items=None, subplot=False):
+        """Create a matrix with all relationships unset.
+
+        Positional arguments:
+            rows: iterable of scene IDs.
+
+        Optional arguments:
+            arcs: iterable of arc titles.
+            characters: iterable of character IDs.
+            locations: iterable of location IDs.
+            items: iterable of item IDs.
+            subplot: bool -- if True, arcs must consist of one subplot arc title.
+        """
+        self.rows = list(rows)
+        self.columns = {
+            self.ARCS: list(arcs or ()),
+            self.CHARACTERS: list(characters or ()),
+            self.LOCATIONS: list(locations or ()),
+            self.ITEMS: list(items or ()),
+            }
+        self.subplot = subplot
+        self._rowIndex = {scId: row for row, scId in enumerate(self.rows)}
+        self._columnIndex = {}
+        self._strides = {}
+        self._bits = {}
+        for elemType in self.ELEMENT_TYPES:
+            self._columnIndex[elemType] = {elemId: col for col, elemId in enumerate(self.columns[elemType])}
+            self._strides[elemType] = (len(self.columns[elemType]) + 7) // 8
+            self._bits[elemType] = bytearray(len(self.rows) * self._strides[elemType])
+
+    def is_set(self, elemType, row, col):
+        """Return True if the row's scene is related to the column's element."""
+        return bool(self._bits[elemType][row * self._strides[elemType] + (col >> 3)] & (1 << (col & 7)))
+
+    def set_state(self, elemType, row, col, state):
+        """Relate or unrelate the row's scene and the column's element.
+
+        Positional arguments:
+            elemType: str -- ARCS, CHARACTERS, LOCATIONS, or ITEMS.
+            row: int -- Matrix row.
+            col: int -- Column of the element type.
+            state: bool -- True, if the scene and the element are related.
+        """
+        i = row * self._strides[elemType] + (col >> 3)
+        if state:
+            self._bits[elemType][i] |= 1 << (col & 7)
+        else:
+            self._bits[elemType][i] &= ~(1 << (col & 7)) & 0xff
+
+    def toggle(self, elemType, row, col):
+        """Invert a relationship and return its new state."""
+        i = row * self._strides[elemType] + (col >> 3)
+        self._bits[elemType][i] ^= 1 << (col & 7)
+        return bool(self._bits[elemType][i] & (1 << (col & 7)))
+
+    def get_row(self, elemType, row):
+        """Return a list with the relationship states of a scene, one per column."""
+        stride = self._strides[elemType]
+        states = []
+        for byte in self._bits[elemType][row * stride:(row + 1) * stride]:
+            states.extend(_BYTE_BITS[byte])
+        del states[len(self.columns[elemType]):]
+        return states
+
+    def get_ids(self, elemType, row):
+        """Return a list with the IDs of the elements related to a scene, in column order."""
+        stride = self._strides[elemType]
+        columns = self.columns[elemType]
+        elemIds = []
+        offset = 0
+        for byte in self._bits[elemType][row * stride:(row + 1) * stride]:
+            if byte:
+                for bit in _BYTE_COLUMNS[byte]:
+                    elemIds.append(columns[offset + bit])
+            offset += 8
+        return elemIds
+
+    def set_ids(self, elemType, row, elemIds):
+        """Relate a scene to the given elements only.
+
+        Positional arguments:
+            elemType: str -- ARCS, CHARACTERS, LOCATIONS, or ITEMS.
+            row: int -- Matrix row.
+            elemIds: iterable of element IDs; IDs without a column are ignored.
+        """
+        stride = self._strides[elemType]
+        bits = self._bits[elemType]
+        columnIndex = self._columnIndex[elemType]
+        start = row * stride
+        bits[start:start + stride] = bytes(stride)
+        for elemId in elemIds:
+            col = columnIndex.get(elemId, None)
+            if col is not None:
+                bits[start + (col >> 3)] |= 1 << (col & 7)
+
+    def get_column_bitmaps(self, elemType, alignment=1):
+        """Return a list with one bitmap of related rows per column.
+
+        Positional arguments:
+            elemType: str -- ARCS, CHARACTERS, LOCATIONS, or ITEMS.
+
+        Optional arguments:
+            alignment: int -- the bitmaps' length in bytes is a multiple of alignment.
+
+        Each bitmap is a bytearray with one bit per row, lowest bit first.
+        The matrix is transposed in one pass over the set bits.
+        """
+        length = -(-len(self.rows) // (8 * alignment)) * alignment
+        columns = self.columns[elemType]
+        bitmaps = [bytearray(length) for __ in columns]
+        stride = self._strides[elemType]
+        bits = self._bits[elemType]
+        for row in range(len(self.rows)):
+            rowByte = row >> 3
+            rowBit = 1 << (row & 7)
+            offset = 0
+            for byte in bits[row * stride:(row + 1) * stride]:
+                if byte:
+                    for bit in _BYTE_COLUMNS[byte]:
+                        bitmaps[offset + bit][rowByte] |= rowBit
+                offset += 8
+        return bitmaps
+
+    def read_scenes(self, novel):
+        """Set the matrix according to the scenes' relationships.
+
+        Positional arguments:
+            novel: Novel -- the project containing the scenes.
+        """
+        for row, scId in enumerate(self.rows):
+            scene = novel.scenes[scId]
+            if self.subplot:
+                if scene.isSubPlot:
+                    self.set_ids(self.ARCS, row, self.columns[self.ARCS])
+                else:
+                    self.set_ids(self.ARCS, row, ())
+            else:
+                self.set_ids(self.ARCS, row, scene.arcs)
+            self.set_ids(self.CHARACTERS, row, scene.characters or ())
+            self.set_ids(self.LOCATIONS, row, scene.locations or ())
+            self.set_ids(self.ITEMS, row, scene.items or ())
+
+    def write_scenes(self, novel):
+        """Assign the changed relationships to the scenes.
+
+        Positional arguments:
+            novel: Novel -- the project containing the scenes.
+
+        Relationships are assigned only if they differ from the scene's,
+        so unchanged scenes are not marked as modified.
+        Element IDs without a column are removed from the changed scenes.
+        """
+        self.apply_changes(novel, self.get_changes(novel))
+
+    def get_changes(self, novel):
+        """Return a tuple with the relationships that differ from the scenes'.
+
+        Positional arguments:
+            novel: Novel -- the project containing the scenes.
+
+        Each change is a tuple: (scene ID, scene instance variable name, new value).
+        The values are immutable, so the changes can be passed to a worker
+        thread, while the matrix is further modified.
+        """
+        changes = []
+        for row, scId in enumerate(self.rows):
+            scene = novel.scenes[scId]
+            arcs = self.get_ids(self.ARCS, row)
+            if self.subplot:
+                isSubPlot = bool(arcs)
+                if scene.isSubPlot != isSubPlot:
+                    changes.append((scId, 'isSubPlot', isSubPlot))
+            elif set(arcs) != set(scene.arcs):
+                changes.append((scId, 'scnArcs', list_to_string(arcs)))
+            for elemType in (self.CHARACTERS, self.LOCATIONS, self.ITEMS):
+                elemIds = self.get_ids(elemType, row)
+                if set(elemIds) != set(getattr(scene, elemType) or ()):
+                    changes.append((scId, elemType, tuple(elemIds)))
+        return tuple(changes)
+
+    def apply_changes(self, novel, changes):
+        """Assign relationships returned by get_changes() to the scenes.
+
+        Positional arguments:
+            novel: Novel -- the project containing the scenes.
+            changes: tuple of (scene ID, scene instance variable name, new value).
+        """
+        for scId, attribute, value in changes:
+            if isinstance(value, tuple):
+                value = list(value)
+            setattr(novel.scenes[scId], attribute, value)
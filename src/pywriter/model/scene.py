@@ -22,14 +22,50 @@ NON_LETTERS = re.compile(r'\[.+?\]|\/\*.+?\*\/|\n|\r')
 # this is to be replaced by empty strings, thus excluding markup, comments, and linefeeds
 # from letter counting
 
+LANGUAGE_TAG = re.compile(r'\[lang=(.*?)\]')
+
+
+def count_words(text):
+    """Return the number of words in text, counted like in LibreOffice."""
+    if not text:
+        return 0
+
+    text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
+    text = NO_WORD_LIMITS.sub('', text)
+    return len(text.split())
+
+
+def count_letters(text):
+    """Return the number of letters in text, counted like in LibreOffice."""
+    if not text:
+        return 0
+
+    return len(NON_LETTERS.sub('', text))
+
+
+def find_languages(text):
+    """Return a tuple with the language codes appearing in text, in order of first appearance.
+    
+    Example:
+    - language markup: 'Standard text [lang=en-AU]Australian text[/lang=en-AU].'
+    - language code: 'en-AU'
+    """
+    if not text:
+        return ()
+
+    languages = {}
+    for m in LANGUAGE_TAG.finditer(text):
+        languages[m.group(1)] = None
+    return tuple(languages)
+
 
 class Scene(BasicElement):
     """yWriter scene representation.
     
     Public instance variables:
         sceneContent: str -- scene content (property with getter and setter).
-        wordCount: int -- word count (derived; updated by the sceneContent setter).
-        letterCount: int -- letter count (derived; updated by the sceneContent setter).
+        wordCount: int -- word count (derived; counted on demand and cached until the content changes).
+        letterCount: int -- letter count (derived; counted on demand and cached until the content changes).
         scType: int -- Scene type (Normal/Notes/Todo/Unused).
         doNotExport: bool -- True if the scene is not to be exported to RTF.
         status: int -- scene status (Outline/Draft/1st Edit/2nd Edit/Done).
@@ -57,7 +93,9 @@ class Scene(BasicElement):
         lastsHours: str -- scene duration: hours.
         lastsDays: str -- scene duration: days. 
         image: str --  path to an image related to the scene. 
-        scnArcs: str -- Semicolon-separated arc titles.
+        scnArcs: str -- Semicolon-separated arc titles (property with getter and setter).
+        arcs: tuple -- arc titles, parsed from scnArcs (read-only property).
+        languages: tuple -- language codes of the scene content's language markup (derived; searched on demand and cached until the content changes).
         scnMode: str -- Mode of discourse (Narration/Dramatic action/Dialogue/Description/Exposition).
     """
     STATUS = [None,
@@ -76,6 +114,17 @@ class Scene(BasicElement):
     NULL_DATE = '0001-01-01'
     NULL_TIME = '00:00:00'
 
+    __slots__ = ('_sceneContent', '_wordCount', '_letterCount', '_languages', 'scType',
+                 'doNotExport', 'status', 'notes', 'tags', 'field1', 'field2', 'field3', 'field4',
+                 'appendToPrev', 'isReactionScene', 'isSubPlot', 'goal', 'conflict', 'outcome',
+                 'characters', 'locations', 'items', 'date', 'time', 'day',
+                 'lastsMinutes', 'lastsHours', 'lastsDays', 'image', '_scnArcs', '_arcs', 'scnMode')
+
+    _UNTRACKED = BasicElement._UNTRACKED | {'_wordCount', '_letterCount', '_languages', '_arcs',
+                                            'wordCount', 'letterCount', 'languages'}
+    # The word count, the letter count, and the languages are derived from the scene content.
+    # The arcs are derived from scnArcs.
+
     def __init__(self):
         """Initialize instance variables.
         
@@ -87,13 +136,17 @@ class Scene(BasicElement):
         # xml: <SceneContent>
         # Scene text with yW7 raw markup.
 
-        self.wordCount = 0
+        self._wordCount = 0
         # xml: <WordCount>
-        # To be updated by the sceneContent setter
+        # None, if the scene content has changed since the last count
 
-        self.letterCount = 0
+        self._letterCount = 0
         # xml: <LetterCount>
-        # To be updated by the sceneContent setter
+        # None, if the scene content has changed since the last count
+
+        self._languages = ()
+        # Language codes found in the scene content.
+        # None, if the scene content has changed since the last search.
 
         self.scType = None
         # Scene type (Normal/Notes/Todo/Unused).
@@ -203,13 +256,17 @@ class Scene(BasicElement):
         self.image = None
         # xml: <ImageFile>
 
-        self.scnArcs = None
+        self._scnArcs = None
         # xml: <Field_SceneArcs>
         # Semicolon-separated arc titles.
         # Example: 'A' for 'A-Storyline'.
         # If the scene is "Todo" type, an assigned single arc
         # should be defined by it.
 
+        self._arcs = ()
+        # Arc titles parsed from scnArcs.
+        # None, if scnArcs has changed since the last parsing.
+
         self.scnMode = None
         # xml: <Field_SceneMode>
         # Mode of discourse.
@@ -220,11 +277,57 @@ class Scene(BasicElement):
 
     @sceneContent.setter
     def sceneContent(self, text: str):
-        """Set sceneContent updating word count and letter count."""
+        """Set sceneContent, invalidating word count, letter count, and languages."""
         self._sceneContent = text
-        text = ADDITIONAL_WORD_LIMITS.sub(' ', text)
-        text = NO_WORD_LIMITS.sub('', text)
-        wordList = text.split()
-        self.wordCount = len(wordList)
-        text = NON_LETTERS.sub('', self._sceneContent)
-        self.letterCount = len(text)
+        self._wordCount = None
+        self._letterCount = None
+        self._languages = None
+
+    @property
+    def wordCount(self):
+        if self._wordCount is None:
+            self._wordCount = count_words(self._sceneContent)
+        return self._wordCount
+
+    @wordCount.setter
+    def wordCount(self, count: int):
+        self._wordCount = count
+
+    @property
+    def letterCount(self):
+        if self._letterCount is None:
+            self._letterCount = count_letters(self._sceneContent)
+        return self._letterCount
+
+    @letterCount.setter
+    def letterCount(self, count: int):
+        self._letterCount = count
+
+    @property
+    def languages(self):
+        if self._languages is None:
+            self._languages = find_languages(self._sceneContent)
+        return self._languages
+
+    @languages.setter
+    def languages(self, codes: tuple):
+        self._languages = codes
+
+    @property
+    def scnArcs(self):
+        return self._scnArcs
+
+    @scnArcs.setter
+    def scnArcs(self, text: str):
+        """Set scnArcs, invalidating the parsed arcs."""
+        self._scnArcs = text
+        self._arcs = None
+
+    @property
+    def arcs(self):
+        if self._arcs is None:
+            if self._scnArcs:
+                self._arcs = tuple(string_to_list(self._scnArcs))
+            else:
+                self._arcs = ()
+        return self._arcs
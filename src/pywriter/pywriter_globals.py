@@ -6,11 +6,11 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import sys
-import gettext
 import locale
 
 __all__ = ['Error',
            '_',
+           'N_',
            'LOCALE_PATH',
            'CURRENT_LANGUAGE',
            'norm_path',
@@ -31,13 +31,34 @@ try:
 except:
     # Fallback for old Windows versions.
     CURRENT_LANGUAGE = locale.getdefaultlocale()[0][:2]
-try:
-    t = gettext.translation('pywriter', LOCALE_PATH, languages=[CURRENT_LANGUAGE])
-    _ = t.gettext
-except:
+_translate = None
+# Translation function of the current language, set on first use.
 
-    def _(message):
-        return message
+
+def _(message):
+    """Return the translation of message.
+    
+    The gettext module and the message catalog are loaded on first use, 
+    so importing this module stays fast.
+    """
+    global _translate
+    if _translate is None:
+        try:
+            from gettext import translation
+            _translate = translation('pywriter', LOCALE_PATH, languages=[CURRENT_LANGUAGE]).gettext
+        except:
+            _translate = str
+            # No translation available; the message is returned unchanged.
+    return _translate(message)
+
+
+def N_(message):
+    """Return message unchanged, marking it for translation.
+    
+    Use this for values set at import time, e.g. class constants, 
+    and translate them with _() where they are displayed.
+    """
+    return message
 
 
 def norm_path(path):
@@ -60,14 +81,15 @@ def string_to_list(text, divider=';'):
     Return a list of strings.
     If an error occurs, return an empty list.
     """
-    elements = []
+    elements = {}
+    # key: element; value: None (a dictionary keeps the order, and has a fast look-up)
     try:
         tempList = text.split(divider)
         for element in tempList:
             element = element.strip()
-            if element and not element in elements:
-                elements.append(element)
-        return elements
+            if element:
+                elements[element] = None
+        return list(elements)
 
     except:
         return []
@@ -5,8 +5,9 @@ For further information see https://github.com/peter88213/PyWriter
 Published under the MIT License (https://opensource.org/licenses/mit-license.php)
 """
 import os
+import queue
+import threading
 import tkinter as tk
-from tkinter import filedialog
 from tkinter import messagebox
 from pywriter.pywriter_globals import *
 from pywriter.ui.ui import Ui
@@ -23,7 +24,10 @@ class MainTk(Ui):
         disable_menu() -- disable menu entries when no project is open.
         enable_menu() -- enable menu entries when a project is open.
         on_quit() -- save keyword arguments before exiting the program.
-        open_project(fileName) -- create a yWriter project instance and read the file.
+        on_project_read() -- display the project after reading.
+        open_project(fileName) -- create a yWriter project instance and start reading the file.
+        wait_for_worker() -- block until the project file is read or written.
+        write_project(update) -- start writing the project file.
         restore_status() -- overwrite error message with the status before.
         select_project(self, fileName) -- return a project file path.
         set_info_how(message) -- show how the converter is doing.
@@ -39,6 +43,7 @@ class MainTk(Ui):
         title: str -- Application title.
         kwargs -- keyword arguments buffer.
         prjFile -- yWriter project to work with.
+        projectCache -- optional ProjectCache instance for faster reopening of unchanged projects.
         root -- tk top level window.
         mainMenu -- top level menubar.
         mainWindow -- tk frame in the top level window.
@@ -50,6 +55,8 @@ class MainTk(Ui):
     _KEY_OPEN_PROJECT = ('<Control-o>', 'Ctrl-O')
     _KEY_QUIT_PROGRAM = ('<Control-q>', 'Ctrl-Q')
     _YW_CLASS = Yw7File
+    _POLL_INTERVAL = 100
+    # Milliseconds between checks of the worker thread.
 
     def __init__(self, title, **kwargs):
         """Initialize the GUI window and instance variables.
@@ -77,6 +84,22 @@ class MainTk(Ui):
         self.kwargs = kwargs
         self.prjFile = None
         self.novel = None
+        self.projectCache = None
+        # Optional ProjectCache instance used when reading project files.
+
+        self._worker = None
+        # Thread reading or writing the project file.
+
+        self._workerMessages = queue.Queue()
+        # Progress messages and the final result of the worker thread.
+
+        self._onWorkerDone = None
+        # Method to be called in the main thread with the worker's result.
+
+        self._isClosing = False
+        # True while the project is being closed, or the program is being quit.
+        # A project read completed in the meantime is then not displayed.
+
         self.root = tk.Tk()
         self.root.protocol("WM_DELETE_WINDOW", self.on_quit)
         self.root.title(title)
@@ -121,6 +144,9 @@ class MainTk(Ui):
         
         To be extended by subclasses.
         """
+        self._isClosing = True
+        self.wait_for_worker()
+        self._isClosing = False
         self.prjFile = None
         self.root.title(self.title)
         self.show_status('')
@@ -143,19 +169,37 @@ class MainTk(Ui):
 
     def on_quit(self, event=None):
         """Save keyword arguments before exiting the program."""
+        self._isClosing = True
+        self.wait_for_worker()
         self.kwargs['root_geometry'] = self.root.winfo_geometry()
         self.root.quit()
 
+    def on_project_read(self):
+        """Display the project after reading.
+        
+        Display project title and file path.
+        To be extended by subclasses.
+        """
+        self.show_path(f'{norm_path(self.prjFile.filePath)}')
+        self.set_title()
+        self.enable_menu()
+
     def open_project(self, fileName):
-        """Create a yWriter project instance and read the file.
+        """Create a yWriter project instance and start reading the file.
 
         Positional arguments:
             fileName: str -- project file path.
             
-        Display project title and file path.
-        Return True on success, otherwise return False.
-        To be extended by subclasses.
+        The file is read in a worker thread, so the window stays responsive.
+        The progress is shown on the status bar. When reading is complete,
+        on_project_read() is called.
+        Return True if reading has started, otherwise return False.
+        If the project file is still being read or written, tell the user on the status bar.
         """
+        if self._worker is not None:
+            self.set_info_how(f'!{_("Please wait until the project file is processed")}.')
+            return False
+
         self.restore_status()
         fileName = self.select_project(fileName)
         if not fileName:
@@ -164,19 +208,50 @@ class MainTk(Ui):
         if self.prjFile is not None:
             self.close_project()
         self.kwargs['yw_last_open'] = fileName
-        self.prjFile = self._YW_CLASS(fileName)
+        self.prjFile = self._YW_CLASS(fileName, **self.kwargs)
         self.novel = Novel()
         self.prjFile.novel = self.novel
-        try:
-            self.prjFile.read()
-        except Error as ex:
-            self.close_project()
-            self.set_info_how(f'!{str(ex)}')
+        self.prjFile.cache = self.projectCache
+        self.prjFile.showProgress = self._workerMessages.put
+        # The queue passes the messages from the worker thread to the main thread.
+        self.show_status(f'{_("Reading")}...')
+        self._start_worker(self.prjFile.read, self._finish_reading)
+        return True
+
+    def wait_for_worker(self):
+        """Block until the project file is read or written.
+        
+        Process the worker's result, if any.
+        """
+        if self._worker is not None:
+            self._worker.join()
+            self._poll_worker()
+
+    def write_project(self, update=None):
+        """Start writing the project file.
+
+        Optional arguments:
+            update -- function without arguments that modifies the novel before writing.
+
+        The novel is updated and written in a worker thread, so the window stays responsive.
+        A running worker is waited for before, so the project is accessed by one thread at a time.
+        The result is shown on the status bar.
+        Return True if writing has started, otherwise return False.
+        """
+        self.wait_for_worker()
+        if self.prjFile is None:
             return False
 
-        self.show_path(f'{norm_path(self.prjFile.filePath)}')
-        self.set_title()
-        self.enable_menu()
+        prjFile = self.prjFile
+
+        def write_file():
+            if update is not None:
+                update()
+            prjFile.write()
+            return f'{_("File written")}: "{norm_path(prjFile.filePath)}".'
+
+        self.show_status(f'{_("Writing")}...')
+        self._start_worker(write_file, self._finish_writing)
         return True
 
     def restore_status(self, event=None):
@@ -202,7 +277,9 @@ class MainTk(Ui):
         if not initDir:
             initDir = './'
         if not fileName or not os.path.isfile(fileName):
-            fileName = filedialog.askopenfilename(filetypes=self._fileTypes, defaultextension='.yw7', initialdir=initDir)
+            from tkinter.filedialog import askopenfilename
+            # Imported on first use, to speed up the program start.
+            fileName = askopenfilename(filetypes=self._fileTypes, defaultextension='.yw7', initialdir=initDir)
         if not fileName:
             return ''
 
@@ -303,6 +380,96 @@ class MainTk(Ui):
         self.fileMenu.entryconfig(_('Close'), state='disabled')
         self.fileMenu.add_command(label=_('Exit'), accelerator=self._KEY_QUIT_PROGRAM[1], command=self.on_quit)
 
+    def _finish_reading(self, isDone, message):
+        """Display the project after reading, or close it on error.
+        
+        Positional arguments:
+            isDone: bool -- True, if the project file has been read.
+            message: str -- error message.
+        """
+        if self._isClosing or self.prjFile is None:
+            # The project is being closed while reading.
+            return
+
+        self.prjFile.showProgress = None
+        if not isDone:
+            self.close_project()
+            self.set_info_how(f'!{message}')
+            return
+
+        self.show_status('')
+        self.on_project_read()
+
+    def _finish_writing(self, isDone, message):
+        """Show the result of writing the project file.
+        
+        Positional arguments:
+            isDone: bool -- True, if the project file has been written.
+            message: str -- success or error message.
+        """
+        if isDone:
+            self.set_info_how(message)
+        else:
+            self.set_info_how(f'!{message}')
+
+    def _poll_worker(self):
+        """Show the progress messages of the worker thread, and process its result.
+        
+        Runs in the main thread, rescheduling itself until the worker has finished.
+        """
+        if self._worker is None:
+            # The result has already been processed.
+            return
+
+        message = None
+        result = None
+        while True:
+            try:
+                message = self._workerMessages.get_nowait()
+            except queue.Empty:
+                break
+
+            if isinstance(message, tuple):
+                result = message
+        if result is None:
+            if message is not None:
+                self.show_status(message)
+            self.root.after(self._POLL_INTERVAL, self._poll_worker)
+            return
+
+        self._worker = None
+        self._onWorkerDone(*result)
+
+    def _run_worker(self, task):
+        """Run a task, and put the result to the message queue.
+        
+        Positional arguments:
+            task -- function without arguments that returns a message or None.
+            
+        Runs in the worker thread. The result is a tuple: (True, message) 
+        on success, or (False, error message) on error.
+        """
+        try:
+            message = task()
+        except Error as ex:
+            self._workerMessages.put((False, str(ex)))
+        except Exception as ex:
+            self._workerMessages.put((False, f'{_("Can not process file")} - {str(ex)}'))
+        else:
+            self._workerMessages.put((True, message or ''))
+
+    def _start_worker(self, task, onDone):
+        """Run a task in a worker thread, and process its result in the main thread.
+        
+        Positional arguments:
+            task -- function without arguments that returns a message or None.
+            onDone -- method to be called with the result: isDone: bool, message: str.
+        """
+        self._onWorkerDone = onDone
+        self._worker = threading.Thread(target=self._run_worker, args=(task,), daemon=True)
+        self._worker.start()
+        self.root.after(self._POLL_INTERVAL, self._poll_worker)
+
     def _open_project(self, event=None):
         """Create a yWriter project instance and read the file.
         
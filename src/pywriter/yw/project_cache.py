@@ -0,0 +1,167 @@
+"""Provide a class for an on-disk cache of parsed yWriter projects.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/PyWriter
+Published under the MIT License (https://opensource.org/licenses/mit-license.php)
+"""
+import os
+from pywriter.pywriter_globals import *
+
+
+class ProjectCache:
+    """On-disk cache of parsed yWriter projects.
+
+    Public methods:
+        get_key(filePath, variant) -- Return a key identifying the current state of a project file.
+        load(key) -- Return the cached project snapshot, or None.
+        store(key, snapshot) -- Store a project snapshot, and remove the least recently used entries.
+
+    Public instance variables:
+        cacheDir: str -- directory holding one cache file per project.
+        maxSize: int -- maximum total size of the cache files in bytes.
+        useHash: bool -- if True, the project file's content hash is part of the key.
+
+    A project snapshot is plain data, i.e. dictionaries, lists, strings, numbers, 
+    booleans, and None. It is stored as JSON, so loading a cache file 
+    cannot execute code.
+    The hashlib and json modules are imported on first use, to speed up the program start.
+    A cache entry is valid as long as the project file's path, modification time,
+    and size (and optionally its SHA-256 hash) are unchanged.
+    The modification time of a cache file is its last use,
+    so the least recently used entries are removed first.
+    """
+    _VERSION = 5
+    # To be incremented when the cached data changes.
+    _EXTENSION = '.cache'
+    _CHUNK_SIZE = 1048576
+    # Number of bytes read at once when hashing a project file.
+
+    def __init__(self, cacheDir, maxSize, useHash=False):
+        """Set the cache directory and the size limit.
+
+        Positional arguments:
+            cacheDir: str -- directory holding one cache file per project.
+            maxSize: int -- maximum total size of the cache files in bytes.
+
+        Optional arguments:
+            useHash: bool -- if True, the project file's content hash is part of the key.
+        """
+        self.cacheDir = cacheDir
+        self.maxSize = maxSize
+        self.useHash = useHash
+
+    def get_key(self, filePath, variant):
+        """Return a key identifying the current state of a project file.
+
+        Positional arguments:
+            filePath: str -- path to the project file.
+            variant -- hashable value that distinguishes different ways of reading the file.
+
+        Return None if the file is not accessible.
+        """
+        try:
+            filePath = os.path.abspath(filePath)
+            fileStat = os.stat(filePath)
+            if self.useHash:
+                from hashlib import sha256
+                contentHash = sha256()
+                with open(filePath, 'rb') as f:
+                    for chunk in iter(lambda: f.read(self._CHUNK_SIZE), b''):
+                        contentHash.update(chunk)
+                contentHash = contentHash.hexdigest()
+            else:
+                contentHash = None
+        except:
+            return None
+
+        return (filePath, variant, fileStat.st_mtime_ns, fileStat.st_size, contentHash)
+
+    def load(self, key):
+        """Return the cached project snapshot, or None.
+
+        Positional arguments:
+            key -- value returned by get_key().
+
+        Return None if there is no valid entry for the key.
+        """
+        if key is None:
+            return None
+
+        cachePath = self._get_cache_path(key)
+        try:
+            from json import load
+            with open(cachePath, 'r', encoding='utf-8') as f:
+                version, cachedKey, snapshot = load(f)
+        except:
+            return None
+
+        if version != self._VERSION or cachedKey != list(key):
+            # The key is stored as a list.
+            return None
+
+        try:
+            os.utime(cachePath)
+            # Mark the entry as recently used.
+        except:
+            pass
+        return snapshot
+
+    def store(self, key, snapshot):
+        """Store a project snapshot, and remove the least recently used entries.
+
+        Positional arguments:
+            key -- value returned by get_key().
+            snapshot: dict -- plain data of the project read from the file.
+
+        The cache is an optimization, so errors are ignored.
+        """
+        if key is None:
+            return
+
+        cachePath = self._get_cache_path(key)
+        tempPath = f'{cachePath}.tmp'
+        try:
+            from json import dump
+            os.makedirs(self.cacheDir, exist_ok=True)
+            with open(tempPath, 'w', encoding='utf-8') as f:
+                dump((self._VERSION, key, snapshot), f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tempPath, cachePath)
+        except:
+            try:
+                os.remove(tempPath)
+            except:
+                pass
+            return
+
+        self._remove_least_recently_used()
+
+    def _get_cache_path(self, key):
+        """Return the path of the cache file for a project file and variant."""
+        from hashlib import sha1
+        fileName = sha1(repr(key[:2]).encode('utf-8')).hexdigest()
+        return os.path.join(self.cacheDir, f'{fileName}{self._EXTENSION}')
+
+    def _remove_least_recently_used(self):
+        """Remove the least recently used entries until the total size does not exceed maxSize."""
+        entries = []
+        totalSize = 0
+        try:
+            for entry in os.scandir(self.cacheDir):
+                if entry.name.endswith(self._EXTENSION):
+                    entryStat = entry.stat()
+                    entries.append((entryStat.st_mtime_ns, entryStat.st_size, entry.path))
+                    totalSize += entryStat.st_size
+        except:
+            return
+
+        entries.sort()
+        for __, size, cachePath in entries:
+            if totalSize <= self.maxSize:
+                break
+
+            try:
+                os.remove(cachePath)
+            except:
+                pass
+            else:
+                totalSize -= size
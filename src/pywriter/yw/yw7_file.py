@@ -8,18 +8,24 @@ Published under the MIT License (https://opensource.org/licenses/mit-license.php
 """
 import os
 import re
-from html import unescape
+import time
 from datetime import datetime
 import xml.etree.ElementTree as ET
 from pywriter.pywriter_globals import *
 from pywriter.model.chapter import Chapter
 from pywriter.model.scene import Scene
+from pywriter.model.scene import find_languages
 from pywriter.model.character import Character
 from pywriter.model.world_element import WorldElement
 from pywriter.model.basic_element import BasicElement
 from pywriter.file.file import File
-from pywriter.model.id_generator import create_id
+from pywriter.model.id_generator import IdAllocator
 from pywriter.yw.xml_indent import indent
+from pywriter.diagnostics.instrumentation import INSTRUMENTATION
+from pywriter.diagnostics.instrumentation import instrumented
+
+ILLEGAL_CHARACTERS = re.compile('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]')
+# this is to be removed from the xml text before parsing
 
 
 class Yw7File(File):
@@ -33,12 +39,16 @@ class Yw7File(File):
 
     Public instance variables:
         tree -- xml element tree of the yWriter project
+        streaming: bool -- if True, read the file incrementally without keeping the xml element tree.
+        metadataOnly: bool -- if True, read only the scene attributes needed for the relationships, and the scene contents' language codes.
+        showProgress -- optional callback for reading progress messages, e.g. from a worker thread.
+        cache -- optional ProjectCache instance for skipping the xml parsing in streaming metadata-only mode.
         
     Public class constants:
         PRJ_KWVAR -- List of the names of the project keyword variables.
         SCN_KWVAR -- List of the names of the scene keyword variables.
     """
-    DESCRIPTION = _('yWriter 7 project')
+    DESCRIPTION = N_('yWriter 7 project')
     EXTENSION = '.yw7'
     _CDATA_TAGS = [
         'Title',
@@ -75,7 +85,29 @@ class Yw7File(File):
         'Field_CustomAR',
         ]
     # Names of xml elements containing CDATA.
-    # ElementTree.write omits CDATA tags, so they have to be inserted afterwards.
+    # ElementTree.write omits CDATA tags, so the xml file is serialized by _write_element_tree().
+
+    _XML_HEADER = '<?xml version="1.0" encoding="utf-8"?>'
+
+    _STREAM_CHUNK_SIZE = 0x100000
+    # Number of characters fed to the parser at once when reading in streaming mode.
+
+    _STREAM_SECTIONS = ('LOCATIONS', 'ITEMS', 'CHARACTERS', 'PROJECTNOTES', 'PROJECTVARS', 'SCENES', 'CHAPTERS')
+    # Sections whose completely read elements are discarded when reading in streaming mode.
+
+    _SNAPSHOT_COLLECTIONS = (
+        ('locations', WorldElement),
+        ('items', WorldElement),
+        ('characters', Character),
+        ('projectNotes', BasicElement),
+        ('scenes', Scene),
+        ('chapters', Chapter),
+        )
+    # Element collections of the novel, and their element classes.
+
+    _UNCACHED_VARS = ('_isModified', '_idAllocators', '_wordCount', '_letterCount', '_arcs')
+    # Instance variables not stored in the cache, because they are reset or derived.
+
 
     PRJ_KWVAR = [
         'Field_LanguageCode',
@@ -104,19 +136,37 @@ class Yw7File(File):
             filePath: str -- path to the yw7 file.
             
         Optional arguments:
-            kwargs -- keyword arguments (not used here).            
+            kwargs -- keyword arguments.            
+        
+        Processed keyword arguments:
+            yw_stream_read: bool -- if True, read the file in streaming mode.
+            yw_metadata_only: bool -- if True, skip the scene contents and the scene details on reading.
         
         Extends the superclass constructor.
         """
         super().__init__(filePath)
         self.tree = None
+        self.streaming = kwargs.get('yw_stream_read', False)
+        self.metadataOnly = kwargs.get('yw_metadata_only', False)
+        self.showProgress = None
+        # If not None, read() calls showProgress(message) for reporting the reading progress.
+
+        self.cache = None
+        # If not None, read() gets the novel from the cache in streaming mode, if the file is unchanged.
+
+        self._structure = None
+        # IDs and sort order of the elements represented by the xml element tree.
+        # If the novel's structure is unchanged, write() patches only the modified elements.
+
 
+    @instrumented('Yw7File.adjust_scene_types')
     def adjust_scene_types(self):
         """Make sure that scenes in non-"Normal" chapters inherit the chapter's type."""
         for chId in self.novel.srtChapters:
             if self.novel.chapters[chId].chType != 0:
                 for scId in self.novel.chapters[chId].srtScenes:
-                    self.novel.scenes[scId].scType = self.novel.chapters[chId].chType
+                    if self.novel.scenes[scId].scType != self.novel.chapters[chId].chType:
+                        self.novel.scenes[scId].scType = self.novel.chapters[chId].chType
 
     def is_locked(self):
         """Check whether the yw7 file is locked by yWriter.
@@ -126,9 +176,17 @@ class Yw7File(File):
         """
         return os.path.isfile(f'{self.filePath}.lock')
 
+    @instrumented('Yw7File.read', profile=True)
     def read(self):
         """Parse the yWriter xml file and get the instance variables.
         
+        In streaming mode, the xml element tree is not built on reading. 
+        In metadata-only mode, the scene contents are not read. On writing, 
+        the scene attributes not read are left unchanged in the xml file. 
+        In streaming metadata-only mode, the parsed novel is taken from the cache, 
+        if any, as long as the file is unchanged. 
+        After reading, all elements are marked as unmodified, except the 
+        ones corrected for consistency.
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
@@ -138,34 +196,32 @@ class Yw7File(File):
 
         if self.is_locked():
             raise Error(f'{_("yWriter seems to be open. Please close first")}.')
-        try:
-            try:
-                with open(self.filePath, 'r', encoding='utf-8') as f:
-                    xmlText = f.read()
-            except:
-                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
-                with open(self.filePath, 'r', encoding='utf-16') as f:
-                    xmlText = f.read()
-        except:
-            try:
-                self.tree = ET.parse(self.filePath)
-            except Exception as ex:
-                raise Error(f'{_("Can not process file")} - {str(ex)}')
 
-        xmlText = re.sub('[\x00-\x08|\x0b-\x0c|\x0e-\x1f]', '', xmlText)
-        root = ET.fromstring(xmlText)
-        xmlText = None
-        # saving memory
-        self.tree = ET.ElementTree(root)
-        self._read_project(root)
-        self._read_locations(root)
-        self._read_items(root)
-        self._read_characters(root)
-        self._read_projectvars(root)
-        self._read_projectnotes(root)
-        self._read_scenes(root)
-        self._read_chapters(root)
-        self.adjust_scene_types()
+        if self.streaming:
+            self.tree = None
+            if self.cache is None or not self.metadataOnly:
+                self._stream_xml_file()
+            else:
+                cacheKey = self.cache.get_key(self.filePath, self.metadataOnly)
+                snapshot = self.cache.load(cacheKey)
+                if snapshot is None:
+                    self._stream_xml_file()
+                    self.cache.store(cacheKey, self._get_snapshot())
+                else:
+                    self._set_snapshot(snapshot)
+        else:
+            self._show_progress(f'{_("Parsing")}...')
+            root = self._parse_xml_file()
+            self.tree = ET.ElementTree(root)
+            self._show_progress(f'{_("Reading")}...')
+            self._read_project(root.find('PROJECT'))
+            self._read_locations(root)
+            self._read_items(root)
+            self._read_characters(root)
+            self._read_projectvars(root)
+            self._read_projectnotes(root)
+            self._read_scenes(root)
+            self._read_chapters(root)
 
         #--- Set custom instance variables.
         for scId in self.novel.scenes:
@@ -176,11 +232,18 @@ class Yw7File(File):
             except:
                 self.novel.scenes[scId].scnMode = None
 
+        self._reset_modified_flags()
+        self._remove_unknown_ids()
+        self.adjust_scene_types()
+        self._structure = self._get_structure()
+
+    @instrumented('Yw7File.write', profile=True)
     def write(self):
         """Write instance variables to the yWriter xml file.
         
         Open the yWriter xml file located at filePath and replace the instance variables 
         not being None. Create new XML elements if necessary.
+        In streaming mode, the xml element tree is parsed for writing, and released afterwards.
         Raise the "Error" exception in case of error. 
         Overrides the superclass method.
         """
@@ -196,16 +259,31 @@ class Yw7File(File):
                 self.novel.scenes[scId].kwVar['Field_SceneArcs'] = self.novel.scenes[scId].scnArcs
             if self.novel.scenes[scId].scnMode is not None:
                 if self.novel.scenes[scId].scnMode == 0:
-                    self.novel.scenes[scId].kwVar['Field_SceneMode'] = None
+                    self.novel.scenes[scId].kwVar.pop('Field_SceneMode', None)
                 else:
                     self.novel.scenes[scId].kwVar['Field_SceneMode'] = str(self.novel.scenes[scId].scnMode)
-            self.novel.scenes[scId].kwVar['Field_SceneStyle'] = None
-        self._build_element_tree()
-        self._write_element_tree(self)
-        self._postprocess_xml_file(self.filePath)
-
+            self.novel.scenes[scId].kwVar.pop('Field_SceneStyle', None)
+            # Custom fields are stored only if set.
+        if self.tree is None and os.path.isfile(self.filePath):
+            # The file was read in streaming mode, so get the original xml data for patching.
+            self.tree = ET.ElementTree(self._parse_xml_file())
+        try:
+            self._build_element_tree()
+            self._write_element_tree(self)
+        finally:
+            if self.streaming:
+                self.tree = None
+                # Don't keep the xml element tree between the savings.
+
+    @instrumented('Yw7File._build_element_tree')
     def _build_element_tree(self):
-        """Modify the yWriter project attributes of an existing xml element tree."""
+        """Modify the yWriter project attributes of an existing xml element tree.
+        
+        If the IDs and the sort order of all elements are unchanged since the
+        last synchronization, rebuild only the subtrees of the modified elements. 
+        Otherwise, rebuild the subtrees of all elements. 
+        Afterwards, mark the rebuilt elements as unmodified.
+        """
 
         def set_element(parent, tag, text, index):
             subelement = parent.find(tag)
@@ -697,10 +775,8 @@ class Yw7File(File):
 
         def add_projectvariable(title, desc, tags):
             # Note:
-            # prjVars, xmlProjectvars are caller's variables
-            pvId = create_id(prjVars)
-            prjVars.append(pvId)
-            # side effect
+            # prjVarIds, xmlProjectvars are caller's variables
+            pvId = prjVarIds.create_id()
             xmlProjectvar = ET.SubElement(xmlProjectvars, 'PROJECTVAR')
             ET.SubElement(xmlProjectvar, 'ID').text = pvId
             ET.SubElement(xmlProjectvar, 'Title').text = title
@@ -895,7 +971,77 @@ class Yw7File(File):
             except:
                 pass
 
+        def update_scene_content(xmlScene):
+            scId = xmlScene.find('ID').text
+            if self.novel.scenes[scId].sceneContent is not None:
+                xmlScene.find('SceneContent').text = self.novel.scenes[scId].sceneContent
+            try:
+                xmlScene.remove(xmlScene.find('WordCount'))
+            except:
+                pass
+            try:
+                xmlScene.remove(xmlScene.find('LetterCount'))
+            except:
+                pass
+            try:
+                xmlScene.remove(xmlScene.find('RTFFile'))
+            except:
+                pass
+            try:
+                xmlScene.remove(xmlScene.find('BelongsToChID'))
+            except:
+                pass
+
+        def reindent(xmlElement, level=2):
+            # Indent a patched element, keeping the indentation that follows it.
+            tail = xmlElement.tail
+            indent(xmlElement, level)
+            xmlElement.tail = tail
+
+        def patch_modified_elements():
+            # Note:
+            # xmlLocations, xmlItems, xmlCharacters, xmlProjectnotes, xmlScenes, xmlChapters
+            # are caller's variables
+
+            # Replace the subtrees of modified story world elements and project notes.
+            for xmlSection, elements, build_subtree in (
+                    (xmlLocations, self.novel.locations, build_location_subtree),
+                    (xmlItems, self.novel.items, build_item_subtree),
+                    (xmlCharacters, self.novel.characters, build_character_subtree),
+                    (xmlProjectnotes, self.novel.projectNotes, build_prjNote_subtree),
+                    ):
+                if xmlSection is None:
+                    continue
+
+                for i, xmlElement in enumerate(xmlSection):
+                    elemId = xmlElement.findtext('ID')
+                    if elemId in elements and elements[elemId].isModified:
+                        xmlNewElement = ET.Element(xmlElement.tag)
+                        ET.SubElement(xmlNewElement, 'ID').text = elemId
+                        build_subtree(xmlNewElement, elements[elemId])
+                        xmlNewElement.tail = xmlElement.tail
+                        xmlSection[i] = xmlNewElement
+                        reindent(xmlNewElement)
+                        elements[elemId].isModified = False
+
+            # Modify the subtrees of modified scenes and chapters.
+            for xmlScene in xmlScenes:
+                scId = xmlScene.findtext('ID')
+                if scId in self.novel.scenes and self.novel.scenes[scId].isModified:
+                    build_scene_subtree(xmlScene, self.novel.scenes[scId])
+                    update_scene_content(xmlScene)
+                    reindent(xmlScene)
+                    self.novel.scenes[scId].isModified = False
+            for xmlChapter in xmlChapters:
+                chId = xmlChapter.findtext('ID')
+                if chId in self.novel.chapters and self.novel.chapters[chId].isModified:
+                    build_chapter_subtree(xmlChapter, self.novel.chapters[chId])
+                    reindent(xmlChapter)
+                    self.novel.chapters[chId].isModified = False
+
         TAG = 'YWRITER7'
+        incremental = (self.tree is not None and self._structure == self._get_structure())
+        # If the novel's structure is unchanged, only the subtrees of the modified elements are patched.
         xmlNewScenes = {}
         xmlNewChapters = {}
         try:
@@ -923,62 +1069,64 @@ class Yw7File(File):
 
         build_project_subtree(xmlProject)
 
-        #--- Process Locations.
-
-        # Remove LOCATION entries in order to rewrite
-        # the LOCATIONS section in a modified sort order.
-        for xmlLoc in xmlLocations.findall('LOCATION'):
-            xmlLocations.remove(xmlLoc)
-
-        # Add the new XML location subtrees to the project tree.
-        for lcId in self.novel.srtLocations:
-            xmlLoc = ET.SubElement(xmlLocations, 'LOCATION')
-            ET.SubElement(xmlLoc, 'ID').text = lcId
-            build_location_subtree(xmlLoc, self.novel.locations[lcId])
-
-        #--- Process Items.
-
-        # Remove ITEM entries in order to rewrite
-        # the ITEMS section in a modified sort order.
-        for xmlItm in xmlItems.findall('ITEM'):
-            xmlItems.remove(xmlItm)
-
-        # Add the new XML item subtrees to the project tree.
-        for itId in self.novel.srtItems:
-            xmlItm = ET.SubElement(xmlItems, 'ITEM')
-            ET.SubElement(xmlItm, 'ID').text = itId
-            build_item_subtree(xmlItm, self.novel.items[itId])
-
-        #--- Process Characters.
-
-        # Remove CHARACTER entries in order to rewrite
-        # the CHARACTERS section in a modified sort order.
-        for xmlCrt in xmlCharacters.findall('CHARACTER'):
-            xmlCharacters.remove(xmlCrt)
-
-        # Add the new XML character subtrees to the project tree.
-        for crId in self.novel.srtCharacters:
-            xmlCrt = ET.SubElement(xmlCharacters, 'CHARACTER')
-            ET.SubElement(xmlCrt, 'ID').text = crId
-            build_character_subtree(xmlCrt, self.novel.characters[crId])
-
-        #--- Process project notes.
-
-        # Remove PROJECTNOTE entries in order to rewrite
-        # the PROJECTNOTES section in a modified sort order.
-        if xmlProjectnotes is not None:
-            for xmlProjectnote in xmlProjectnotes.findall('PROJECTNOTE'):
-                xmlProjectnotes.remove(xmlProjectnote)
-            if not self.novel.srtPrjNotes:
-                root.remove(xmlProjectnotes)
-        elif self.novel.srtPrjNotes:
-            xmlProjectnotes = ET.SubElement(root, 'PROJECTNOTES')
-        if self.novel.srtPrjNotes:
-            # Add the new XML prjNote subtrees to the project tree.
-            for pnId in self.novel.srtPrjNotes:
-                xmlProjectnote = ET.SubElement(xmlProjectnotes, 'PROJECTNOTE')
-                ET.SubElement(xmlProjectnote, 'ID').text = pnId
-                build_prjNote_subtree(xmlProjectnote, self.novel.projectNotes[pnId])
+        if not incremental:
+
+            #--- Process Locations.
+
+            # Remove LOCATION entries in order to rewrite
+            # the LOCATIONS section in a modified sort order.
+            for xmlLoc in xmlLocations.findall('LOCATION'):
+                xmlLocations.remove(xmlLoc)
+
+            # Add the new XML location subtrees to the project tree.
+            for lcId in self.novel.srtLocations:
+                xmlLoc = ET.SubElement(xmlLocations, 'LOCATION')
+                ET.SubElement(xmlLoc, 'ID').text = lcId
+                build_location_subtree(xmlLoc, self.novel.locations[lcId])
+
+            #--- Process Items.
+
+            # Remove ITEM entries in order to rewrite
+            # the ITEMS section in a modified sort order.
+            for xmlItm in xmlItems.findall('ITEM'):
+                xmlItems.remove(xmlItm)
+
+            # Add the new XML item subtrees to the project tree.
+            for itId in self.novel.srtItems:
+                xmlItm = ET.SubElement(xmlItems, 'ITEM')
+                ET.SubElement(xmlItm, 'ID').text = itId
+                build_item_subtree(xmlItm, self.novel.items[itId])
+
+            #--- Process Characters.
+
+            # Remove CHARACTER entries in order to rewrite
+            # the CHARACTERS section in a modified sort order.
+            for xmlCrt in xmlCharacters.findall('CHARACTER'):
+                xmlCharacters.remove(xmlCrt)
+
+            # Add the new XML character subtrees to the project tree.
+            for crId in self.novel.srtCharacters:
+                xmlCrt = ET.SubElement(xmlCharacters, 'CHARACTER')
+                ET.SubElement(xmlCrt, 'ID').text = crId
+                build_character_subtree(xmlCrt, self.novel.characters[crId])
+
+            #--- Process project notes.
+
+            # Remove PROJECTNOTE entries in order to rewrite
+            # the PROJECTNOTES section in a modified sort order.
+            if xmlProjectnotes is not None:
+                for xmlProjectnote in xmlProjectnotes.findall('PROJECTNOTE'):
+                    xmlProjectnotes.remove(xmlProjectnote)
+                if not self.novel.srtPrjNotes:
+                    root.remove(xmlProjectnotes)
+            elif self.novel.srtPrjNotes:
+                xmlProjectnotes = ET.SubElement(root, 'PROJECTNOTES')
+            if self.novel.srtPrjNotes:
+                # Add the new XML prjNote subtrees to the project tree.
+                for pnId in self.novel.srtPrjNotes:
+                    xmlProjectnote = ET.SubElement(xmlProjectnotes, 'PROJECTNOTE')
+                    ET.SubElement(xmlProjectnote, 'ID').text = pnId
+                    build_prjNote_subtree(xmlProjectnote, self.novel.projectNotes[pnId])
 
         #--- Process project variables.
         xmlProjectvars = root.find('PROJECTVARS')
@@ -986,13 +1134,13 @@ class Yw7File(File):
             self.novel.check_locale()
             if xmlProjectvars is None:
                 xmlProjectvars = ET.SubElement(root, 'PROJECTVARS')
-            prjVars = []
-            # list of all project variable IDs
+            prjVars = set()
+            # IDs of all project variables; a set, because the ID allocator tests the membership
             languages = self.novel.languages.copy()
             hasLanguageCode = False
             hasCountryCode = False
             for xmlProjectvar in xmlProjectvars.findall('PROJECTVAR'):
-                prjVars.append(xmlProjectvar.find('ID').text)
+                prjVars.add(xmlProjectvar.find('ID').text)
                 title = xmlProjectvar.find('Title').text
 
                 # Collect language codes.
@@ -1011,6 +1159,7 @@ class Yw7File(File):
                 elif title == 'Country':
                     xmlProjectvar.find('Desc').text = self.novel.countryCode
                     hasCountryCode = True
+            prjVarIds = IdAllocator(prjVars)
 
             # Define project variables for the missing locale.
             if not hasLanguageCode:
@@ -1031,66 +1180,54 @@ class Yw7File(File):
                 add_projectvariable(f'/lang={langCode}',
                                     f'<HTM </SPAN> /HTM>',
                                     '0')
-                # adding new IDs to the prjVars list
-
-        #--- Process scenes.
-
-        # Save the original XML scene subtrees
-        # and remove them from the project tree.
-        for xmlScene in xmlScenes.findall('SCENE'):
-            scId = xmlScene.find('ID').text
-            xmlNewScenes[scId] = xmlScene
-            xmlScenes.remove(xmlScene)
-
-        # Add the new XML scene subtrees to the project tree.
-        for scId in self.novel.scenes:
-            if not scId in xmlNewScenes:
-                xmlNewScenes[scId] = ET.Element('SCENE')
-                ET.SubElement(xmlNewScenes[scId], 'ID').text = scId
-            build_scene_subtree(xmlNewScenes[scId], self.novel.scenes[scId])
-            xmlScenes.append(xmlNewScenes[scId])
-
-        #--- Process chapters.
-
-        # Save the original XML chapter subtree
-        # and remove it from the project tree.
-        for xmlChapter in xmlChapters.findall('CHAPTER'):
-            chId = xmlChapter.find('ID').text
-            xmlNewChapters[chId] = xmlChapter
-            xmlChapters.remove(xmlChapter)
-
-        # Add the new XML chapter subtrees to the project tree.
-        for chId in self.novel.srtChapters:
-            if not chId in xmlNewChapters:
-                xmlNewChapters[chId] = ET.Element('CHAPTER')
-                ET.SubElement(xmlNewChapters[chId], 'ID').text = chId
-            build_chapter_subtree(xmlNewChapters[chId], self.novel.chapters[chId])
-            xmlChapters.append(xmlNewChapters[chId])
-
-        # Modify the scene contents of an existing xml element tree.
-        for xmlScene in root.find('SCENES'):
-            scId = xmlScene.find('ID').text
-            if self.novel.scenes[scId].sceneContent is not None:
-                xmlScene.find('SceneContent').text = self.novel.scenes[scId].sceneContent
-            try:
-                xmlScene.remove(xmlScene.find('WordCount'))
-            except:
-                pass
-            try:
-                xmlScene.remove(xmlScene.find('LetterCount'))
-            except:
-                pass
-            try:
-                xmlScene.remove(xmlScene.find('RTFFile'))
-            except:
-                pass
-            try:
-                xmlScene.remove(xmlScene.find('BelongsToChID'))
-            except:
-                pass
 
-        indent(root)
+        if incremental:
+            patch_modified_elements()
+            reindent(xmlProject, 1)
+            if xmlProjectvars is not None:
+                reindent(xmlProjectvars, 1)
+        else:
+            #--- Process scenes.
+
+            # Save the original XML scene subtrees
+            # and remove them from the project tree.
+            for xmlScene in xmlScenes.findall('SCENE'):
+                scId = xmlScene.find('ID').text
+                xmlNewScenes[scId] = xmlScene
+                xmlScenes.remove(xmlScene)
+
+            # Add the new XML scene subtrees to the project tree.
+            for scId in self.novel.scenes:
+                if not scId in xmlNewScenes:
+                    xmlNewScenes[scId] = ET.Element('SCENE')
+                    ET.SubElement(xmlNewScenes[scId], 'ID').text = scId
+                build_scene_subtree(xmlNewScenes[scId], self.novel.scenes[scId])
+                xmlScenes.append(xmlNewScenes[scId])
+
+            #--- Process chapters.
+
+            # Save the original XML chapter subtree
+            # and remove it from the project tree.
+            for xmlChapter in xmlChapters.findall('CHAPTER'):
+                chId = xmlChapter.find('ID').text
+                xmlNewChapters[chId] = xmlChapter
+                xmlChapters.remove(xmlChapter)
+
+            # Add the new XML chapter subtrees to the project tree.
+            for chId in self.novel.srtChapters:
+                if not chId in xmlNewChapters:
+                    xmlNewChapters[chId] = ET.Element('CHAPTER')
+                    ET.SubElement(xmlNewChapters[chId], 'ID').text = chId
+                build_chapter_subtree(xmlNewChapters[chId], self.novel.chapters[chId])
+                xmlChapters.append(xmlNewChapters[chId])
+
+            # Modify the scene contents of an existing xml element tree.
+            for xmlScene in root.find('SCENES'):
+                update_scene_content(xmlScene)
+            indent(root)
+            self._reset_modified_flags()
         self.tree = ET.ElementTree(root)
+        self._structure = self._get_structure()
 
     def _convert_from_yw(self, text, quick=False):
         """Return text without markup, converted to target format.
@@ -1102,94 +1239,124 @@ class Yw7File(File):
             quick: bool -- if True, apply a conversion mode for one-liners without formatting.
         
         Overrides the superclass method.
+        The xml predefined entities are applied when serializing the xml element tree.
         """
-        if text:
-            # Apply XML predefined entities.
-            XML_REPLACEMENTS = [
-                ('&', '&amp;'),
-                ('>', '&gt;'),
-                ('<', '&lt;'),
-                ("'", '&apos;'),
-                ('"', '&quot;'),
-                ]
-            for yw, xm in XML_REPLACEMENTS:
-                text = text.replace(yw, xm)
-        else:
+        if not text:
             text = ''
         return text
 
-    def _postprocess_xml_file(self, filePath):
-        """Postprocess an xml file created by ElementTree.
-        
-        Positional argument:
-            filePath: str -- path to xml file.
+    def _get_snapshot(self):
+        """Return the novel's instance variables as plain data for the cache.
         
-        Read the xml file, put a header on top, insert the missing CDATA tags,
-        and replace xml entities by plain text (unescape). Overwrite the .yw7 xml file.
-        Raise the "Error" exception in case of error. 
+        The elements are represented by dictionaries of their instance variables.
+        Private names are stored without the leading underscore, so the values 
+        are set with the public properties when restored.
+        None values are omitted, because the element constructors set them.
+        """
+
+        def get_plain_vars(element):
+            plainVars = {}
+            for name, value in element.get_vars().items():
+                if value is not None and not name in self._UNCACHED_VARS:
+                    plainVars[name.lstrip('_')] = value
+            return plainVars
+
+        snapshot = get_plain_vars(self.novel)
+        for collection, __ in self._SNAPSHOT_COLLECTIONS:
+            elements = snapshot[collection]
+            snapshot[collection] = {elemId: get_plain_vars(elements[elemId]) for elemId in elements}
+        return snapshot
+
+    def _get_structure(self):
+        """Return a tuple of the element IDs in the novel's sort order.
         
-        Note: The path is given as an argument rather than using self.filePath. 
-        So this routine can be used for yWriter-generated xml files other than .yw7 as well. 
+        If the structure is the same as when the xml element tree was 
+        synchronized with the novel, the tree can be patched.
+        """
+        return (
+            tuple(self.novel.srtLocations),
+            tuple(self.novel.srtItems),
+            tuple(self.novel.srtCharacters),
+            tuple(self.novel.srtPrjNotes),
+            tuple(self.novel.scenes),
+            tuple(self.novel.srtChapters),
+            tuple(tuple(self.novel.chapters[chId].srtScenes) for chId in self.novel.srtChapters),
+            )
+
+    def _get_subelements(self, xmlElement):
+        """Return a dictionary of the element's children by tag.
+
+        Index the children in a single pass, so the readers look up
+        each subelement in constant time instead of scanning all
+        children with find(). If a tag occurs more than once,
+        the first occurrence is taken, just like find() does.
+        """
+        return {child.tag: child for child in reversed(xmlElement)}
+
+    @instrumented('Yw7File._parse_xml_file')
+    def _parse_xml_file(self):
+        """Return the root element of the yWriter xml file.
+
+        Strip illegal characters before parsing.
+        Raise the "Error" exception in case of error.
         """
-        with open(filePath, 'r', encoding='utf-8') as f:
-            text = f.read()
-        lines = text.split('\n')
-        newlines = ['<?xml version="1.0" encoding="utf-8"?>']
-        for line in lines:
-            for tag in self._CDATA_TAGS:
-                line = re.sub(fr'\<{tag}\>', f'<{tag}><![CDATA[', line)
-                line = re.sub(fr'\<\/{tag}\>', f']]></{tag}>', line)
-            newlines.append(line)
-        text = '\n'.join(newlines)
-        text = text.replace('[CDATA[ \n', '[CDATA[')
-        text = text.replace('\n]]', ']]')
-        if not self.novel.chapters:
-            text = text.replace('<CHAPTERS />', '<CHAPTERS></CHAPTERS>')
-            # otherwise, yWriter fails to parse the file if there are no chapters.
-        text = unescape(text)
         try:
-            with open(filePath, 'w', encoding='utf-8') as f:
-                f.write(text)
+            try:
+                with open(self.filePath, 'r', encoding='utf-8') as f:
+                    xmlText = f.read()
+            except:
+                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                with open(self.filePath, 'r', encoding='utf-16') as f:
+                    xmlText = f.read()
         except:
-            raise Error(f'{_("Cannot write file")}: "{norm_path(filePath)}".')
+            try:
+                return ET.parse(self.filePath).getroot()
+            except Exception as ex:
+                raise Error(f'{_("Can not process file")} - {str(ex)}')
 
-    def _read_project(self, root):
-        """Read attributes at project level from the xml element tree."""
-        xmlProject = root.find('PROJECT')
+        xmlText = ILLEGAL_CHARACTERS.sub('', xmlText)
+        try:
+            return ET.fromstring(xmlText)
+        except Exception as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
 
-        if xmlProject.find('Title') is not None:
-            self.novel.title = xmlProject.find('Title').text
+    @instrumented('Yw7File._read_project')
+    def _read_project(self, xmlProject):
+        """Read attributes at project level from the xml element tree."""
+        subelements = self._get_subelements(xmlProject)
+        if 'Title' in subelements:
+            self.novel.title = subelements['Title'].text
 
-        if xmlProject.find('AuthorName') is not None:
-            self.novel.authorName = xmlProject.find('AuthorName').text
+        if 'AuthorName' in subelements:
+            self.novel.authorName = subelements['AuthorName'].text
 
-        if xmlProject.find('Bio') is not None:
-            self.novel.authorBio = xmlProject.find('Bio').text
+        if 'Bio' in subelements:
+            self.novel.authorBio = subelements['Bio'].text
 
-        if xmlProject.find('Desc') is not None:
-            self.novel.desc = xmlProject.find('Desc').text
+        if 'Desc' in subelements:
+            self.novel.desc = subelements['Desc'].text
 
-        if xmlProject.find('FieldTitle1') is not None:
-            self.novel.fieldTitle1 = xmlProject.find('FieldTitle1').text
+        if 'FieldTitle1' in subelements:
+            self.novel.fieldTitle1 = subelements['FieldTitle1'].text
 
-        if xmlProject.find('FieldTitle2') is not None:
-            self.novel.fieldTitle2 = xmlProject.find('FieldTitle2').text
+        if 'FieldTitle2' in subelements:
+            self.novel.fieldTitle2 = subelements['FieldTitle2'].text
 
-        if xmlProject.find('FieldTitle3') is not None:
-            self.novel.fieldTitle3 = xmlProject.find('FieldTitle3').text
+        if 'FieldTitle3' in subelements:
+            self.novel.fieldTitle3 = subelements['FieldTitle3'].text
 
-        if xmlProject.find('FieldTitle4') is not None:
-            self.novel.fieldTitle4 = xmlProject.find('FieldTitle4').text
+        if 'FieldTitle4' in subelements:
+            self.novel.fieldTitle4 = subelements['FieldTitle4'].text
 
         #--- Read word target data.
-        if xmlProject.find('WordCountStart') is not None:
+        if 'WordCountStart' in subelements:
             try:
-                self.novel.wordCountStart = int(xmlProject.find('WordCountStart').text)
+                self.novel.wordCountStart = int(subelements['WordCountStart'].text)
             except:
                 self.novel.wordCountStart = 0
-        if xmlProject.find('WordTarget') is not None:
+        if 'WordTarget' in subelements:
             try:
-                self.novel.wordTarget = int(xmlProject.find('WordTarget').text)
+                self.novel.wordTarget = int(subelements['WordTarget'].text)
             except:
                 self.novel.wordTarget = 0
 
@@ -1199,8 +1366,9 @@ class Yw7File(File):
 
         #--- Read project custom fields.
         for xmlProjectFields in xmlProject.findall('Fields'):
+            fields = self._get_subelements(xmlProjectFields)
             for fieldName in self.PRJ_KWVAR:
-                field = xmlProjectFields.find(fieldName)
+                field = fields.get(fieldName)
                 if field is not None:
                     self.novel.kwVar[fieldName] = field.text
 
@@ -1210,134 +1378,144 @@ class Yw7File(File):
         if self.novel.kwVar['Field_CountryCode']:
             self.novel.countryCode = self.novel.kwVar['Field_CountryCode']
 
+    @instrumented('Yw7File._read_locations')
     def _read_locations(self, root):
         """Read locations from the xml element tree."""
         self.novel.srtLocations = []
         # This is necessary for re-reading.
         for xmlLocation in root.find('LOCATIONS'):
-            lcId = xmlLocation.find('ID').text
-            self.novel.srtLocations.append(lcId)
-            self.novel.locations[lcId] = WorldElement()
+            self._read_location(xmlLocation)
 
-            if xmlLocation.find('Title') is not None:
-                self.novel.locations[lcId].title = xmlLocation.find('Title').text
+    def _read_location(self, xmlLocation):
+        """Read a location from its xml subtree."""
+        subelements = self._get_subelements(xmlLocation)
+        lcId = subelements['ID'].text
+        self.novel.srtLocations.append(lcId)
+        self.novel.locations[lcId] = WorldElement()
 
-            if xmlLocation.find('ImageFile') is not None:
-                self.novel.locations[lcId].image = xmlLocation.find('ImageFile').text
+        if 'Title' in subelements:
+            self.novel.locations[lcId].title = subelements['Title'].text
 
-            if xmlLocation.find('Desc') is not None:
-                self.novel.locations[lcId].desc = xmlLocation.find('Desc').text
+        if 'ImageFile' in subelements:
+            self.novel.locations[lcId].image = subelements['ImageFile'].text
 
-            if xmlLocation.find('AKA') is not None:
-                self.novel.locations[lcId].aka = xmlLocation.find('AKA').text
+        if 'Desc' in subelements:
+            self.novel.locations[lcId].desc = subelements['Desc'].text
 
-            if xmlLocation.find('Tags') is not None:
-                if xmlLocation.find('Tags').text is not None:
-                    tags = string_to_list(xmlLocation.find('Tags').text)
-                    self.novel.locations[lcId].tags = self._strip_spaces(tags)
+        if 'AKA' in subelements:
+            self.novel.locations[lcId].aka = subelements['AKA'].text
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.LOC_KWVAR:
-                self.novel.locations[lcId].kwVar[fieldName] = None
+        if 'Tags' in subelements:
+            if subelements['Tags'].text is not None:
+                tags = string_to_list(subelements['Tags'].text)
+                self.novel.locations[lcId].tags = self._strip_spaces(tags)
 
-            #--- Read location custom fields.
-            for xmlLocationFields in xmlLocation.findall('Fields'):
-                for fieldName in self.LOC_KWVAR:
-                    field = xmlLocationFields.find(fieldName)
-                    if field is not None:
-                        self.novel.locations[lcId].kwVar[fieldName] = field.text
+        #--- Read location custom fields.
+        for xmlLocationFields in xmlLocation.findall('Fields'):
+            fields = self._get_subelements(xmlLocationFields)
+            for fieldName in self.LOC_KWVAR:
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.locations[lcId].kwVar[fieldName] = field.text
 
+    @instrumented('Yw7File._read_items')
     def _read_items(self, root):
         """Read items from the xml element tree."""
         self.novel.srtItems = []
         # This is necessary for re-reading.
         for xmlItem in root.find('ITEMS'):
-            itId = xmlItem.find('ID').text
-            self.novel.srtItems.append(itId)
-            self.novel.items[itId] = WorldElement()
+            self._read_item(xmlItem)
 
-            if xmlItem.find('Title') is not None:
-                self.novel.items[itId].title = xmlItem.find('Title').text
+    def _read_item(self, xmlItem):
+        """Read an item from its xml subtree."""
+        subelements = self._get_subelements(xmlItem)
+        itId = subelements['ID'].text
+        self.novel.srtItems.append(itId)
+        self.novel.items[itId] = WorldElement()
 
-            if xmlItem.find('ImageFile') is not None:
-                self.novel.items[itId].image = xmlItem.find('ImageFile').text
+        if 'Title' in subelements:
+            self.novel.items[itId].title = subelements['Title'].text
 
-            if xmlItem.find('Desc') is not None:
-                self.novel.items[itId].desc = xmlItem.find('Desc').text
+        if 'ImageFile' in subelements:
+            self.novel.items[itId].image = subelements['ImageFile'].text
 
-            if xmlItem.find('AKA') is not None:
-                self.novel.items[itId].aka = xmlItem.find('AKA').text
+        if 'Desc' in subelements:
+            self.novel.items[itId].desc = subelements['Desc'].text
 
-            if xmlItem.find('Tags') is not None:
-                if xmlItem.find('Tags').text is not None:
-                    tags = string_to_list(xmlItem.find('Tags').text)
-                    self.novel.items[itId].tags = self._strip_spaces(tags)
+        if 'AKA' in subelements:
+            self.novel.items[itId].aka = subelements['AKA'].text
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.ITM_KWVAR:
-                self.novel.items[itId].kwVar[fieldName] = None
+        if 'Tags' in subelements:
+            if subelements['Tags'].text is not None:
+                tags = string_to_list(subelements['Tags'].text)
+                self.novel.items[itId].tags = self._strip_spaces(tags)
 
-            #--- Read item custom fields.
-            for xmlItemFields in xmlItem.findall('Fields'):
-                for fieldName in self.ITM_KWVAR:
-                    field = xmlItemFields.find(fieldName)
-                    if field is not None:
-                        self.novel.items[itId].kwVar[fieldName] = field.text
+        #--- Read item custom fields.
+        for xmlItemFields in xmlItem.findall('Fields'):
+            fields = self._get_subelements(xmlItemFields)
+            for fieldName in self.ITM_KWVAR:
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.items[itId].kwVar[fieldName] = field.text
 
+    @instrumented('Yw7File._read_characters')
     def _read_characters(self, root):
         """Read characters from the xml element tree."""
         self.novel.srtCharacters = []
         # This is necessary for re-reading.
         for xmlCharacter in root.find('CHARACTERS'):
-            crId = xmlCharacter.find('ID').text
-            self.novel.srtCharacters.append(crId)
-            self.novel.characters[crId] = Character()
+            self._read_character(xmlCharacter)
 
-            if xmlCharacter.find('Title') is not None:
-                self.novel.characters[crId].title = xmlCharacter.find('Title').text
+    def _read_character(self, xmlCharacter):
+        """Read a character from its xml subtree."""
+        subelements = self._get_subelements(xmlCharacter)
+        crId = subelements['ID'].text
+        self.novel.srtCharacters.append(crId)
+        self.novel.characters[crId] = Character()
 
-            if xmlCharacter.find('ImageFile') is not None:
-                self.novel.characters[crId].image = xmlCharacter.find('ImageFile').text
+        if 'Title' in subelements:
+            self.novel.characters[crId].title = subelements['Title'].text
 
-            if xmlCharacter.find('Desc') is not None:
-                self.novel.characters[crId].desc = xmlCharacter.find('Desc').text
+        if 'ImageFile' in subelements:
+            self.novel.characters[crId].image = subelements['ImageFile'].text
 
-            if xmlCharacter.find('AKA') is not None:
-                self.novel.characters[crId].aka = xmlCharacter.find('AKA').text
+        if 'Desc' in subelements:
+            self.novel.characters[crId].desc = subelements['Desc'].text
 
-            if xmlCharacter.find('Tags') is not None:
-                if xmlCharacter.find('Tags').text is not None:
-                    tags = string_to_list(xmlCharacter.find('Tags').text)
-                    self.novel.characters[crId].tags = self._strip_spaces(tags)
+        if 'AKA' in subelements:
+            self.novel.characters[crId].aka = subelements['AKA'].text
 
-            if xmlCharacter.find('Notes') is not None:
-                self.novel.characters[crId].notes = xmlCharacter.find('Notes').text
+        if 'Tags' in subelements:
+            if subelements['Tags'].text is not None:
+                tags = string_to_list(subelements['Tags'].text)
+                self.novel.characters[crId].tags = self._strip_spaces(tags)
 
-            if xmlCharacter.find('Bio') is not None:
-                self.novel.characters[crId].bio = xmlCharacter.find('Bio').text
+        if 'Notes' in subelements:
+            self.novel.characters[crId].notes = subelements['Notes'].text
 
-            if xmlCharacter.find('Goals') is not None:
-                self.novel.characters[crId].goals = xmlCharacter.find('Goals').text
+        if 'Bio' in subelements:
+            self.novel.characters[crId].bio = subelements['Bio'].text
 
-            if xmlCharacter.find('FullName') is not None:
-                self.novel.characters[crId].fullName = xmlCharacter.find('FullName').text
+        if 'Goals' in subelements:
+            self.novel.characters[crId].goals = subelements['Goals'].text
 
-            if xmlCharacter.find('Major') is not None:
-                self.novel.characters[crId].isMajor = True
-            else:
-                self.novel.characters[crId].isMajor = False
+        if 'FullName' in subelements:
+            self.novel.characters[crId].fullName = subelements['FullName'].text
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.CRT_KWVAR:
-                self.novel.characters[crId].kwVar[fieldName] = None
+        if 'Major' in subelements:
+            self.novel.characters[crId].isMajor = True
+        else:
+            self.novel.characters[crId].isMajor = False
 
-            #--- Read character custom fields.
-            for xmlCharacterFields in xmlCharacter.findall('Fields'):
-                for fieldName in self.CRT_KWVAR:
-                    field = xmlCharacterFields.find(fieldName)
-                    if field is not None:
-                        self.novel.characters[crId].kwVar[fieldName] = field.text
+        #--- Read character custom fields.
+        for xmlCharacterFields in xmlCharacter.findall('Fields'):
+            fields = self._get_subelements(xmlCharacterFields)
+            for fieldName in self.CRT_KWVAR:
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.characters[crId].kwVar[fieldName] = field.text
 
+    @instrumented('Yw7File._read_projectnotes')
     def _read_projectnotes(self, root):
         """Read project notes from the xml element tree."""
         self.novel.srtPrjNotes = []
@@ -1345,328 +1523,505 @@ class Yw7File(File):
 
         try:
             for xmlProjectnote in root.find('PROJECTNOTES'):
-                if xmlProjectnote.find('ID') is not None:
-                    pnId = xmlProjectnote.find('ID').text
-                    self.novel.srtPrjNotes.append(pnId)
-                    self.novel.projectNotes[pnId] = BasicElement()
-                    if xmlProjectnote.find('Title') is not None:
-                        self.novel.projectNotes[pnId].title = xmlProjectnote.find('Title').text
-                    if xmlProjectnote.find('Desc') is not None:
-                        self.novel.projectNotes[pnId].desc = xmlProjectnote.find('Desc').text
-
-                #--- Initialize project note custom fields.
-                for fieldName in self.PNT_KWVAR:
-                    self.novel.projectNotes[pnId].kwVar[fieldName] = None
-
-                #--- Read project note custom fields.
-                for pnFields in xmlProjectnote.findall('Fields'):
-                    field = pnFields.find(fieldName)
-                    if field is not None:
-                        self.novel.projectNotes[pnId].kwVar[fieldName] = field.text
+                self._read_projectnote(xmlProjectnote)
         except:
             pass
 
+    def _read_projectnote(self, xmlProjectnote):
+        """Read a project note from its xml subtree."""
+        subelements = self._get_subelements(xmlProjectnote)
+        if not 'ID' in subelements:
+            return
+
+        pnId = subelements['ID'].text
+        self.novel.srtPrjNotes.append(pnId)
+        self.novel.projectNotes[pnId] = BasicElement()
+        if 'Title' in subelements:
+            self.novel.projectNotes[pnId].title = subelements['Title'].text
+        if 'Desc' in subelements:
+            self.novel.projectNotes[pnId].desc = subelements['Desc'].text
+
+        #--- Read project note custom fields.
+        for pnFields in xmlProjectnote.findall('Fields'):
+            fields = self._get_subelements(pnFields)
+            for fieldName in self.PNT_KWVAR:
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.projectNotes[pnId].kwVar[fieldName] = field.text
+
+    @instrumented('Yw7File._read_projectvars')
     def _read_projectvars(self, root):
         """Read relevant project variables from the xml element tree."""
         try:
             for xmlProjectvar in root.find('PROJECTVARS'):
-                if xmlProjectvar.find('Title') is not None:
-                    title = xmlProjectvar.find('Title').text
-                    if title == 'Language':
-                        if xmlProjectvar.find('Desc') is not None:
-                            self.novel.languageCode = xmlProjectvar.find('Desc').text
-
-                    elif title == 'Country':
-                        if xmlProjectvar.find('Desc') is not None:
-                            self.novel.countryCode = xmlProjectvar.find('Desc').text
-
-                    elif title.startswith('lang='):
-                        try:
-                            __, langCode = title.split('=')
-                            if self.novel.languages is None:
-                                self.novel.languages = []
-                            self.novel.languages.append(langCode)
-                        except:
-                            pass
+                self._read_projectvar(xmlProjectvar)
         except:
             pass
 
+    def _read_projectvar(self, xmlProjectvar):
+        """Read a relevant project variable from its xml subtree."""
+        subelements = self._get_subelements(xmlProjectvar)
+        if 'Title' in subelements:
+            title = subelements['Title'].text
+            if title == 'Language':
+                if 'Desc' in subelements:
+                    self.novel.languageCode = subelements['Desc'].text
+
+            elif title == 'Country':
+                if 'Desc' in subelements:
+                    self.novel.countryCode = subelements['Desc'].text
+
+            elif title.startswith('lang='):
+                try:
+                    __, langCode = title.split('=')
+                    if self.novel.languages is None:
+                        self.novel.languages = []
+                    self.novel.languages.append(langCode)
+                except:
+                    pass
+
+    @instrumented('Yw7File._read_scenes')
     def _read_scenes(self, root):
         """ Read attributes at scene level from the xml element tree."""
         for xmlScene in root.find('SCENES'):
-            scId = xmlScene.find('ID').text
-            self.novel.scenes[scId] = Scene()
+            self._read_scene(xmlScene)
 
-            if xmlScene.find('Title') is not None:
-                self.novel.scenes[scId].title = xmlScene.find('Title').text
+    def _read_scene(self, xmlScene):
+        """Read attributes of a scene from its xml subtree.
 
-            if xmlScene.find('Desc') is not None:
-                self.novel.scenes[scId].desc = xmlScene.find('Desc').text
+        In metadata-only mode, read only the attributes needed for
+        the relationships, and skip the scene text and details.
+        Note: The character, location, and item IDs are not checked here.
+        See _remove_unknown_ids().
+        """
+        subelements = self._get_subelements(xmlScene)
+        scId = subelements['ID'].text
+        self.novel.scenes[scId] = Scene()
+
+        if 'Title' in subelements:
+            self.novel.scenes[scId].title = subelements['Title'].text
+
+        #--- Read scene type.
+
+        # This is how yWriter 7.1.3.0 reads the scene type:
+        #
+        # Type   |<Unused>|Field_SceneType>|scType
+        #--------+--------+----------------+------
+        # Notes  | x      | 1              | 1
+        # Todo   | x      | 2              | 2
+        # Unused | -1     | N/A            | 3
+        # Unused | -1     | 0              | 3
+        # Normal | N/A    | N/A            | 0
+        # Normal | N/A    | 0              | 0
+
+        self.novel.scenes[scId].scType = 0
+
+        for xmlSceneFields in xmlScene.findall('Fields'):
+            fields = self._get_subelements(xmlSceneFields)
+            #--- Read scene custom fields.
+            for fieldName in self.SCN_KWVAR:
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.scenes[scId].kwVar[fieldName] = field.text
+
+            # Read scene type, if any.
+            if 'Field_SceneType' in fields:
+                if fields['Field_SceneType'].text == '1':
+                    self.novel.scenes[scId].scType = 1
+                elif fields['Field_SceneType'].text == '2':
+                    self.novel.scenes[scId].scType = 2
+        if 'Unused' in subelements:
+            if self.novel.scenes[scId].scType == 0:
+                self.novel.scenes[scId].scType = 3
+
+        # Export when RTF.
+        if not 'ExportCondSpecific' in subelements:
+            self.novel.scenes[scId].doNotExport = False
+        elif 'ExportWhenRTF' in subelements:
+            self.novel.scenes[scId].doNotExport = False
+        else:
+            self.novel.scenes[scId].doNotExport = True
 
-            if xmlScene.find('SceneContent') is not None:
-                sceneContent = xmlScene.find('SceneContent').text
-                if sceneContent is not None:
-                    self.novel.scenes[scId].sceneContent = sceneContent
+        if 'AppendToPrev' in subelements:
+            self.novel.scenes[scId].appendToPrev = True
+        else:
+            self.novel.scenes[scId].appendToPrev = False
 
-            #--- Read scene type.
+        if 'ReactionScene' in subelements:
+            self.novel.scenes[scId].isReactionScene = True
+        else:
+            self.novel.scenes[scId].isReactionScene = False
 
-            # This is how yWriter 7.1.3.0 reads the scene type:
-            #
-            # Type   |<Unused>|Field_SceneType>|scType
-            #--------+--------+----------------+------
-            # Notes  | x      | 1              | 1
-            # Todo   | x      | 2              | 2
-            # Unused | -1     | N/A            | 3
-            # Unused | -1     | 0              | 3
-            # Normal | N/A    | N/A            | 0
-            # Normal | N/A    | 0              | 0
+        if 'SubPlot' in subelements:
+            self.novel.scenes[scId].isSubPlot = True
+        else:
+            self.novel.scenes[scId].isSubPlot = False
+
+        if 'Characters' in subelements:
+            for characters in subelements['Characters'].iter('CharID'):
+                if self.novel.scenes[scId].characters is None:
+                    self.novel.scenes[scId].characters = []
+                self.novel.scenes[scId].characters.append(characters.text)
+
+        if 'Locations' in subelements:
+            for locations in subelements['Locations'].iter('LocID'):
+                if self.novel.scenes[scId].locations is None:
+                    self.novel.scenes[scId].locations = []
+                self.novel.scenes[scId].locations.append(locations.text)
+
+        if 'Items' in subelements:
+            for items in subelements['Items'].iter('ItemID'):
+                if self.novel.scenes[scId].items is None:
+                    self.novel.scenes[scId].items = []
+                self.novel.scenes[scId].items.append(items.text)
+
+        if not self.metadataOnly:
+            self._read_scene_details(scId, subelements)
+        elif 'SceneContent' in subelements:
+            self.novel.scenes[scId].languages = find_languages(subelements['SceneContent'].text)
+            # The scene content is discarded, but its language codes are needed for writing the project variables.
+
+    def _read_scene_details(self, scId, subelements):
+        """Read the scene text and the scene attributes not related to the relationships.
+
+        Positional arguments:
+            scId: str -- scene ID.
+            subelements: dict -- the scene's xml subelements by tag, as returned by _get_subelements().
+        """
+        if 'Desc' in subelements:
+            self.novel.scenes[scId].desc = subelements['Desc'].text
 
-            self.novel.scenes[scId].scType = 0
+        if 'SceneContent' in subelements:
+            sceneContent = subelements['SceneContent'].text
+            if sceneContent is not None:
+                self.novel.scenes[scId].sceneContent = sceneContent
 
-            #--- Initialize custom keyword variables.
-            for fieldName in self.SCN_KWVAR:
-                self.novel.scenes[scId].kwVar[fieldName] = None
-
-            for xmlSceneFields in xmlScene.findall('Fields'):
-                #--- Read scene custom fields.
-                for fieldName in self.SCN_KWVAR:
-                    field = xmlSceneFields.find(fieldName)
-                    if field is not None:
-                        self.novel.scenes[scId].kwVar[fieldName] = field.text
-
-                # Read scene type, if any.
-                if xmlSceneFields.find('Field_SceneType') is not None:
-                    if xmlSceneFields.find('Field_SceneType').text == '1':
-                        self.novel.scenes[scId].scType = 1
-                    elif xmlSceneFields.find('Field_SceneType').text == '2':
-                        self.novel.scenes[scId].scType = 2
-            if xmlScene.find('Unused') is not None:
-                if self.novel.scenes[scId].scType == 0:
-                    self.novel.scenes[scId].scType = 3
-
-            # Export when RTF.
-            if xmlScene.find('ExportCondSpecific') is None:
-                self.novel.scenes[scId].doNotExport = False
-            elif xmlScene.find('ExportWhenRTF') is not None:
-                self.novel.scenes[scId].doNotExport = False
-            else:
-                self.novel.scenes[scId].doNotExport = True
+        if 'Status' in subelements:
+            self.novel.scenes[scId].status = int(subelements['Status'].text)
 
-            if xmlScene.find('Status') is not None:
-                self.novel.scenes[scId].status = int(xmlScene.find('Status').text)
+        if 'Notes' in subelements:
+            self.novel.scenes[scId].notes = subelements['Notes'].text
 
-            if xmlScene.find('Notes') is not None:
-                self.novel.scenes[scId].notes = xmlScene.find('Notes').text
+        if 'Tags' in subelements:
+            if subelements['Tags'].text is not None:
+                tags = string_to_list(subelements['Tags'].text)
+                self.novel.scenes[scId].tags = self._strip_spaces(tags)
 
-            if xmlScene.find('Tags') is not None:
-                if xmlScene.find('Tags').text is not None:
-                    tags = string_to_list(xmlScene.find('Tags').text)
-                    self.novel.scenes[scId].tags = self._strip_spaces(tags)
+        if 'Field1' in subelements:
+            self.novel.scenes[scId].field1 = subelements['Field1'].text
 
-            if xmlScene.find('Field1') is not None:
-                self.novel.scenes[scId].field1 = xmlScene.find('Field1').text
+        if 'Field2' in subelements:
+            self.novel.scenes[scId].field2 = subelements['Field2'].text
 
-            if xmlScene.find('Field2') is not None:
-                self.novel.scenes[scId].field2 = xmlScene.find('Field2').text
+        if 'Field3' in subelements:
+            self.novel.scenes[scId].field3 = subelements['Field3'].text
 
-            if xmlScene.find('Field3') is not None:
-                self.novel.scenes[scId].field3 = xmlScene.find('Field3').text
+        if 'Field4' in subelements:
+            self.novel.scenes[scId].field4 = subelements['Field4'].text
 
-            if xmlScene.find('Field4') is not None:
-                self.novel.scenes[scId].field4 = xmlScene.find('Field4').text
+        #--- Scene start.
+        if 'SpecificDateTime' in subelements:
+            dateTimeStr = subelements['SpecificDateTime'].text
 
-            if xmlScene.find('AppendToPrev') is not None:
-                self.novel.scenes[scId].appendToPrev = True
+            # Check SpecificDateTime for ISO compliance.
+            try:
+                dateTime = datetime.fromisoformat(dateTimeStr)
+            except:
+                self.novel.scenes[scId].date = ''
+                self.novel.scenes[scId].time = ''
             else:
-                self.novel.scenes[scId].appendToPrev = False
-
-            #--- Scene start.
-            if xmlScene.find('SpecificDateTime') is not None:
-                dateTimeStr = xmlScene.find('SpecificDateTime').text
+                startDateTime = dateTime.isoformat().split('T')
+                self.novel.scenes[scId].date = startDateTime[0]
+                self.novel.scenes[scId].time = startDateTime[1]
+        else:
+            if 'Day' in subelements:
+                day = subelements['Day'].text
 
-                # Check SpecificDateTime for ISO compliance.
+                # Check if Day represents an integer.
                 try:
-                    dateTime = datetime.fromisoformat(dateTimeStr)
-                except:
-                    self.novel.scenes[scId].date = ''
-                    self.novel.scenes[scId].time = ''
-                else:
-                    startDateTime = dateTime.isoformat().split('T')
-                    self.novel.scenes[scId].date = startDateTime[0]
-                    self.novel.scenes[scId].time = startDateTime[1]
+                    int(day)
+                except ValueError:
+                    day = ''
+                self.novel.scenes[scId].day = day
+
+            hasUnspecificTime = False
+            if 'Hour' in subelements:
+                hour = subelements['Hour'].text.zfill(2)
+                hasUnspecificTime = True
             else:
-                if xmlScene.find('Day') is not None:
-                    day = xmlScene.find('Day').text
+                hour = '00'
+            if 'Minute' in subelements:
+                minute = subelements['Minute'].text.zfill(2)
+                hasUnspecificTime = True
+            else:
+                minute = '00'
+            if hasUnspecificTime:
+                self.novel.scenes[scId].time = f'{hour}:{minute}:00'
 
-                    # Check if Day represents an integer.
-                    try:
-                        int(day)
-                    except ValueError:
-                        day = ''
-                    self.novel.scenes[scId].day = day
+        #--- Scene duration.
+        if 'LastsDays' in subelements:
+            self.novel.scenes[scId].lastsDays = subelements['LastsDays'].text
 
-                hasUnspecificTime = False
-                if xmlScene.find('Hour') is not None:
-                    hour = xmlScene.find('Hour').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    hour = '00'
-                if xmlScene.find('Minute') is not None:
-                    minute = xmlScene.find('Minute').text.zfill(2)
-                    hasUnspecificTime = True
-                else:
-                    minute = '00'
-                if hasUnspecificTime:
-                    self.novel.scenes[scId].time = f'{hour}:{minute}:00'
+        if 'LastsHours' in subelements:
+            self.novel.scenes[scId].lastsHours = subelements['LastsHours'].text
 
-            #--- Scene duration.
-            if xmlScene.find('LastsDays') is not None:
-                self.novel.scenes[scId].lastsDays = xmlScene.find('LastsDays').text
+        if 'LastsMinutes' in subelements:
+            self.novel.scenes[scId].lastsMinutes = subelements['LastsMinutes'].text
 
-            if xmlScene.find('LastsHours') is not None:
-                self.novel.scenes[scId].lastsHours = xmlScene.find('LastsHours').text
+        if 'Goal' in subelements:
+            self.novel.scenes[scId].goal = subelements['Goal'].text
 
-            if xmlScene.find('LastsMinutes') is not None:
-                self.novel.scenes[scId].lastsMinutes = xmlScene.find('LastsMinutes').text
+        if 'Conflict' in subelements:
+            self.novel.scenes[scId].conflict = subelements['Conflict'].text
 
-            if xmlScene.find('ReactionScene') is not None:
-                self.novel.scenes[scId].isReactionScene = True
-            else:
-                self.novel.scenes[scId].isReactionScene = False
+        if 'Outcome' in subelements:
+            self.novel.scenes[scId].outcome = subelements['Outcome'].text
 
-            if xmlScene.find('SubPlot') is not None:
-                self.novel.scenes[scId].isSubPlot = True
-            else:
-                self.novel.scenes[scId].isSubPlot = False
-
-            if xmlScene.find('Goal') is not None:
-                self.novel.scenes[scId].goal = xmlScene.find('Goal').text
-
-            if xmlScene.find('Conflict') is not None:
-                self.novel.scenes[scId].conflict = xmlScene.find('Conflict').text
-
-            if xmlScene.find('Outcome') is not None:
-                self.novel.scenes[scId].outcome = xmlScene.find('Outcome').text
-
-            if xmlScene.find('ImageFile') is not None:
-                self.novel.scenes[scId].image = xmlScene.find('ImageFile').text
-
-            if xmlScene.find('Characters') is not None:
-                for characters in xmlScene.find('Characters').iter('CharID'):
-                    crId = characters.text
-                    if crId in self.novel.srtCharacters:
-                        if self.novel.scenes[scId].characters is None:
-                            self.novel.scenes[scId].characters = []
-                        self.novel.scenes[scId].characters.append(crId)
-
-            if xmlScene.find('Locations') is not None:
-                for locations in xmlScene.find('Locations').iter('LocID'):
-                    lcId = locations.text
-                    if lcId in self.novel.srtLocations:
-                        if self.novel.scenes[scId].locations is None:
-                            self.novel.scenes[scId].locations = []
-                        self.novel.scenes[scId].locations.append(lcId)
-
-            if xmlScene.find('Items') is not None:
-                for items in xmlScene.find('Items').iter('ItemID'):
-                    itId = items.text
-                    if itId in self.novel.srtItems:
-                        if self.novel.scenes[scId].items is None:
-                            self.novel.scenes[scId].items = []
-                        self.novel.scenes[scId].items.append(itId)
+        if 'ImageFile' in subelements:
+            self.novel.scenes[scId].image = subelements['ImageFile'].text
 
+    @instrumented('Yw7File._read_chapters')
     def _read_chapters(self, root):
         """Read attributes at chapter level from the xml element tree."""
         self.novel.srtChapters = []
         # This is necessary for re-reading.
         for xmlChapter in root.find('CHAPTERS'):
-            chId = xmlChapter.find('ID').text
-            self.novel.chapters[chId] = Chapter()
-            self.novel.srtChapters.append(chId)
+            self._read_chapter(xmlChapter)
 
-            if xmlChapter.find('Title') is not None:
-                self.novel.chapters[chId].title = xmlChapter.find('Title').text
+    def _read_chapter(self, xmlChapter):
+        """Read attributes of a chapter from its xml subtree.
 
-            if xmlChapter.find('Desc') is not None:
-                self.novel.chapters[chId].desc = xmlChapter.find('Desc').text
+        Note: The scene IDs are not checked here. See _remove_unknown_ids().
+        """
+        subelements = self._get_subelements(xmlChapter)
+        chId = subelements['ID'].text
+        self.novel.chapters[chId] = Chapter()
+        self.novel.srtChapters.append(chId)
 
-            if xmlChapter.find('SectionStart') is not None:
-                self.novel.chapters[chId].chLevel = 1
-            else:
-                self.novel.chapters[chId].chLevel = 0
+        if 'Title' in subelements:
+            self.novel.chapters[chId].title = subelements['Title'].text
 
-            # This is how yWriter 7.1.3.0 reads the chapter type:
-            #
-            # Type   |<Unused>|<Type>|<ChapterType>|chType
-            # -------+--------+------+--------------------
-            # Normal | N/A    | N/A  | N/A         | 0
-            # Normal | N/A    | 0    | N/A         | 0
-            # Notes  | x      | 1    | N/A         | 1
-            # Unused | -1     | 0    | N/A         | 3
-            # Normal | N/A    | x    | 0           | 0
-            # Notes  | x      | x    | 1           | 1
-            # Todo   | x      | x    | 2           | 2
-            # Unused | -1     | x    | x           | 3
-
-            self.novel.chapters[chId].chType = 0
-            if xmlChapter.find('Unused') is not None:
-                yUnused = True
-            else:
-                yUnused = False
-            if xmlChapter.find('ChapterType') is not None:
-                # The file may be created with yWriter version 7.0.7.2+
-                yChapterType = xmlChapter.find('ChapterType').text
-                if yChapterType == '2':
-                    self.novel.chapters[chId].chType = 2
-                elif yChapterType == '1':
+        if 'Desc' in subelements:
+            self.novel.chapters[chId].desc = subelements['Desc'].text
+
+        if 'SectionStart' in subelements:
+            self.novel.chapters[chId].chLevel = 1
+        else:
+            self.novel.chapters[chId].chLevel = 0
+
+        # This is how yWriter 7.1.3.0 reads the chapter type:
+        #
+        # Type   |<Unused>|<Type>|<ChapterType>|chType
+        # -------+--------+------+--------------------
+        # Normal | N/A    | N/A  | N/A         | 0
+        # Normal | N/A    | 0    | N/A         | 0
+        # Notes  | x      | 1    | N/A         | 1
+        # Unused | -1     | 0    | N/A         | 3
+        # Normal | N/A    | x    | 0           | 0
+        # Notes  | x      | x    | 1           | 1
+        # Todo   | x      | x    | 2           | 2
+        # Unused | -1     | x    | x           | 3
+
+        self.novel.chapters[chId].chType = 0
+        if 'Unused' in subelements:
+            yUnused = True
+        else:
+            yUnused = False
+        if 'ChapterType' in subelements:
+            # The file may be created with yWriter version 7.0.7.2+
+            yChapterType = subelements['ChapterType'].text
+            if yChapterType == '2':
+                self.novel.chapters[chId].chType = 2
+            elif yChapterType == '1':
+                self.novel.chapters[chId].chType = 1
+            elif yUnused:
+                self.novel.chapters[chId].chType = 3
+        else:
+            # The file may be created with a yWriter version prior to 7.0.7.2
+            if 'Type' in subelements:
+                yType = subelements['Type'].text
+                if yType == '1':
                     self.novel.chapters[chId].chType = 1
                 elif yUnused:
                     self.novel.chapters[chId].chType = 3
-            else:
-                # The file may be created with a yWriter version prior to 7.0.7.2
-                if xmlChapter.find('Type') is not None:
-                    yType = xmlChapter.find('Type').text
-                    if yType == '1':
-                        self.novel.chapters[chId].chType = 1
-                    elif yUnused:
-                        self.novel.chapters[chId].chType = 3
-
-            self.novel.chapters[chId].suppressChapterTitle = False
-            if self.novel.chapters[chId].title is not None:
-                if self.novel.chapters[chId].title.startswith('@'):
-                    self.novel.chapters[chId].suppressChapterTitle = True
 
-            #--- Initialize custom keyword variables.
+        self.novel.chapters[chId].suppressChapterTitle = False
+        if self.novel.chapters[chId].title is not None:
+            if self.novel.chapters[chId].title.startswith('@'):
+                self.novel.chapters[chId].suppressChapterTitle = True
+
+        #--- Read chapter fields.
+        for xmlChapterFields in xmlChapter.findall('Fields'):
+            fields = self._get_subelements(xmlChapterFields)
+            if 'Field_SuppressChapterTitle' in fields:
+                if fields['Field_SuppressChapterTitle'].text == '1':
+                    self.novel.chapters[chId].suppressChapterTitle = True
+            self.novel.chapters[chId].isTrash = False
+            if 'Field_IsTrash' in fields:
+                if fields['Field_IsTrash'].text == '1':
+                    self.novel.chapters[chId].isTrash = True
+            self.novel.chapters[chId].suppressChapterBreak = False
+            if 'Field_SuppressChapterBreak' in fields:
+                if fields['Field_SuppressChapterBreak'].text == '1':
+                    self.novel.chapters[chId].suppressChapterBreak = True
+
+            #--- Read chapter custom fields.
             for fieldName in self.CHP_KWVAR:
-                self.novel.chapters[chId].kwVar[fieldName] = None
+                field = fields.get(fieldName)
+                if field is not None:
+                    self.novel.chapters[chId].kwVar[fieldName] = field.text
 
-            #--- Read chapter fields.
-            for xmlChapterFields in xmlChapter.findall('Fields'):
-                if xmlChapterFields.find('Field_SuppressChapterTitle') is not None:
-                    if xmlChapterFields.find('Field_SuppressChapterTitle').text == '1':
-                        self.novel.chapters[chId].suppressChapterTitle = True
-                self.novel.chapters[chId].isTrash = False
-                if xmlChapterFields.find('Field_IsTrash') is not None:
-                    if xmlChapterFields.find('Field_IsTrash').text == '1':
-                        self.novel.chapters[chId].isTrash = True
-                self.novel.chapters[chId].suppressChapterBreak = False
-                if xmlChapterFields.find('Field_SuppressChapterBreak') is not None:
-                    if xmlChapterFields.find('Field_SuppressChapterBreak').text == '1':
-                        self.novel.chapters[chId].suppressChapterBreak = True
-
-                #--- Read chapter custom fields.
-                for fieldName in self.CHP_KWVAR:
-                    field = xmlChapterFields.find(fieldName)
-                    if field is not None:
-                        self.novel.chapters[chId].kwVar[fieldName] = field.text
-
-            #--- Read chapter's scene list.
-            self.novel.chapters[chId].srtScenes = []
-            if xmlChapter.find('Scenes') is not None:
-                for scn in xmlChapter.find('Scenes').findall('ScID'):
-                    scId = scn.text
-                    if scId in self.novel.scenes:
-                        self.novel.chapters[chId].srtScenes.append(scId)
+        #--- Read chapter's scene list.
+        self.novel.chapters[chId].srtScenes = []
+        if 'Scenes' in subelements:
+            for scn in subelements['Scenes'].findall('ScID'):
+                self.novel.chapters[chId].srtScenes.append(scn.text)
+
+    def _remove_unknown_ids(self):
+        """Remove references to elements that do not exist in the project.
+
+        This is done after reading all elements,
+        so it doesn't depend on the order of the xml sections.
+        Only the corrected references are assigned, so the other elements stay unmodified.
+        """
+        for scId in self.novel.scenes:
+            if self.novel.scenes[scId].characters is not None:
+                crIds = [crId for crId in self.novel.scenes[scId].characters if crId in self.novel.srtCharacters] or None
+                if crIds != self.novel.scenes[scId].characters:
+                    self.novel.scenes[scId].characters = crIds
+            if self.novel.scenes[scId].locations is not None:
+                lcIds = [lcId for lcId in self.novel.scenes[scId].locations if lcId in self.novel.srtLocations] or None
+                if lcIds != self.novel.scenes[scId].locations:
+                    self.novel.scenes[scId].locations = lcIds
+            if self.novel.scenes[scId].items is not None:
+                itIds = [itId for itId in self.novel.scenes[scId].items if itId in self.novel.srtItems] or None
+                if itIds != self.novel.scenes[scId].items:
+                    self.novel.scenes[scId].items = itIds
+        for chId in self.novel.chapters:
+            scIds = [scId for scId in self.novel.chapters[chId].srtScenes if scId in self.novel.scenes]
+            if scIds != self.novel.chapters[chId].srtScenes:
+                self.novel.chapters[chId].srtScenes = scIds
+
+    def _reset_modified_flags(self):
+        """Mark all elements of the novel as unmodified."""
+        for elements in (
+                self.novel.locations,
+                self.novel.items,
+                self.novel.characters,
+                self.novel.projectNotes,
+                self.novel.scenes,
+                self.novel.chapters,
+                ):
+            for elemId in elements:
+                elements[elemId].isModified = False
+
+    def _set_snapshot(self, snapshot):
+        """Set the novel's instance variables from plain data returned by _get_snapshot().
+        
+        Positional arguments:
+            snapshot: dict -- novel instance variables, with the elements as dictionaries.
+        """
+        for collection, elementClass in self._SNAPSHOT_COLLECTIONS:
+            elements = {}
+            for elemId, elemVars in snapshot[collection].items():
+                elements[elemId] = elementClass()
+                elements[elemId].set_vars(elemVars)
+            snapshot[collection] = elements
+        self.novel.set_vars(snapshot)
+
+    @instrumented('Yw7File._stream_xml_file')
+    def _stream_xml_file(self):
+        """Parse the yWriter xml file incrementally and get the instance variables.
+
+        Read the file chunk by chunk, stripping illegal characters.
+        Process each project, location, item, character, project note,
+        project variable, scene, and chapter element as soon as it is complete,
+        and discard its subtree afterwards. So the whole document is never
+        held in memory.
+        Raise the "Error" exception in case of error.
+        """
+        readers = {
+            'PROJECT': self._read_project,
+            'LOCATION': self._read_location,
+            'ITEM': self._read_item,
+            'CHARACTER': self._read_character,
+            'PROJECTNOTE': self._read_projectnote,
+            'PROJECTVAR': self._read_projectvar,
+            'SCENE': self._read_scene,
+            'CHAPTER': self._read_chapter,
+            }
+        sectionNames = {
+            'LOCATION': 'Yw7File._read_locations',
+            'ITEM': 'Yw7File._read_items',
+            'CHARACTER': 'Yw7File._read_characters',
+            'PROJECTNOTE': 'Yw7File._read_projectnotes',
+            'PROJECTVAR': 'Yw7File._read_projectvars',
+            'SCENE': 'Yw7File._read_scenes',
+            'CHAPTER': 'Yw7File._read_chapters',
+            }
+        # Operation names for the instrumentation, as recorded when reading the whole xml tree.
+        # The project reader is instrumented itself.
+
+        def parse(encoding):
+            # This is necessary for re-reading.
+            self.novel.srtLocations = []
+            self.novel.srtItems = []
+            self.novel.srtCharacters = []
+            self.novel.srtPrjNotes = []
+            self.novel.srtChapters = []
+
+            parser = ET.XMLPullParser(events=('end',))
+            startTime = time.time()
+            readingTimes = {}
+            # key: element tag; value: total seconds spent in the element's reader
+
+            def read_events():
+                for __, element in parser.read_events():
+                    tag = element.tag
+                    if tag in readers:
+                        if INSTRUMENTATION.enabled and tag in sectionNames:
+                            start = time.perf_counter()
+                            readers[tag](element)
+                            readingTimes[tag] = readingTimes.get(tag, 0.0) + time.perf_counter() - start
+                        else:
+                            readers[tag](element)
+                        element.clear()
+                        # releasing the subtree completely read
+                    elif tag in self._STREAM_SECTIONS:
+                        element.clear()
+                        # releasing the emptied elements of the section
+
+            fileSize = max(1, os.path.getsize(self.filePath))
+            charactersRead = 0
+            with open(self.filePath, 'r', encoding=encoding) as f:
+                while True:
+                    xmlText = f.read(self._STREAM_CHUNK_SIZE)
+                    if not xmlText:
+                        break
+
+                    parser.feed(ILLEGAL_CHARACTERS.sub('', xmlText))
+                    read_events()
+                    charactersRead += len(xmlText)
+                    self._show_progress(f'{_("Reading")}... {min(100, charactersRead * 100 // fileSize)}%')
+                    # The number of characters is an approximation of the number of bytes.
+            parser.close()
+            read_events()
+            for tag, seconds in readingTimes.items():
+                INSTRUMENTATION.record(sectionNames[tag], startTime, seconds)
+
+        try:
+            try:
+                parse('utf-8')
+            except UnicodeError:
+                # yw7 file may be UTF-16 encoded, with a wrong XML header (yWriter for iOS)
+                parse('utf-16')
+        except Exception as ex:
+            raise Error(f'{_("Can not process file")} - {str(ex)}')
+
+    def _show_progress(self, message):
+        """Report the reading progress, if a callback is set."""
+        if self.showProgress is not None:
+            self.showProgress(message)
 
     def _strip_spaces(self, lines):
         """Local helper method.
@@ -1681,23 +2036,87 @@ class Yw7File(File):
             stripped.append(line.strip())
         return stripped
 
+    @instrumented('Yw7File._write_element_tree')
     def _write_element_tree(self, ywProject):
         """Write back the xml element tree to a .yw7 xml file located at filePath.
         
+        Serialize the tree in a single pass into a temporary file, writing the xml header on top, 
+        the text of the elements listed in _CDATA_TAGS as CDATA sections, 
+        and all other text and the attribute values with the xml predefined entities applied. 
+        Then keep the original file as a backup, and replace it with the temporary file.
         Raise the "Error" exception in case of error. 
         """
-        backedUp = False
-        if os.path.isfile(ywProject.filePath):
+        cdataTags = set(self._CDATA_TAGS)
+
+        def escape(text):
+            # Apply the xml predefined entities needed in text.
+            return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+        def escape_attribute(value):
+            return escape(value).replace('"', '&quot;')
+
+        def serialize_element(write, element):
+            tag = element.tag
+            text = element.text
+            attributes = ''.join(f' {key}="{escape_attribute(value)}"' for key, value in element.items())
+            if tag in cdataTags and text and not len(element):
+                if text.startswith(' \n'):
+                    text = text[2:]
+                if text.endswith('\n'):
+                    text = text[:-1]
+                write(f'<{tag}{attributes}><![CDATA[{text}]]></{tag}>')
+            elif text or len(element):
+                write(f'<{tag}{attributes}>')
+                if text:
+                    write(escape(text))
+                for subelement in element:
+                    serialize_element(write, subelement)
+                write(f'</{tag}>')
+            elif tag == 'CHAPTERS' and not self.novel.chapters:
+                write('<CHAPTERS></CHAPTERS>')
+                # otherwise, yWriter fails to parse the file if there are no chapters.
+            else:
+                write(f'<{tag}{attributes} />')
+            if element.tail:
+                write(escape(element.tail))
+
+        def remove_temp_file():
             try:
-                os.replace(ywProject.filePath, f'{ywProject.filePath}.bak')
+                os.remove(tempPath)
             except:
-                raise Error(f'{_("Cannot overwrite file")}: "{norm_path(ywProject.filePath)}".')
-            else:
-                backedUp = True
+                pass
+
+        #--- Write a temporary file, and make sure it is on the disk.
+        tempPath = f'{ywProject.filePath}.tmp'
         try:
-            ywProject.tree.write(ywProject.filePath, xml_declaration=False, encoding='utf-8')
+            with open(tempPath, 'w', encoding='utf-8') as f:
+                f.write(f'{self._XML_HEADER}\n')
+                serialize_element(f.write, ywProject.tree.getroot())
+                f.flush()
+                os.fsync(f.fileno())
         except:
-            if backedUp:
-                os.replace(f'{ywProject.filePath}.bak', ywProject.filePath)
+            remove_temp_file()
             raise Error(f'{_("Cannot write file")}: "{norm_path(ywProject.filePath)}".')
 
+        #--- Keep the original file as a backup.
+        if os.path.isfile(ywProject.filePath):
+            backupPath = f'{ywProject.filePath}.bak'
+            try:
+                if os.path.isfile(backupPath):
+                    os.remove(backupPath)
+                os.link(ywProject.filePath, backupPath)
+            except:
+                # The file system does not support hard links.
+                try:
+                    from shutil import copy2
+                    copy2(ywProject.filePath, backupPath)
+                except:
+                    remove_temp_file()
+                    raise Error(f'{_("Cannot overwrite file")}: "{norm_path(ywProject.filePath)}".')
+
+        #--- Replace the project file in a single step, so it is never incomplete.
+        try:
+            os.replace(tempPath, ywProject.filePath)
+        except:
+            remove_temp_file()
+            raise Error(f'{_("Cannot overwrite file")}: "{norm_path(ywProject.filePath)}".')
@@ -42,6 +42,7 @@ except:
 APPNAME = 'yw_table'
 VERSION = ' @release'
 APP = f'{APPNAME}.py'
+CSV_APP = f'{APPNAME}_csv.py'
 INI_FILE = f'{APPNAME}.ini'
 INI_PATH = '/config/'
 SAMPLE_PATH = 'sample/'
@@ -121,6 +122,8 @@ def install(pywriterPath):
     # Install the new version.
     copyfile(APP, f'{installDir}/{APP}')
     output(f'Copying "{APP}"')
+    copyfile(CSV_APP, f'{installDir}/{CSV_APP}')
+    output(f'Copying "{CSV_APP}"')
 
     # Install the localization files.
     copytree('locale', f'{installDir}/locale')
@@ -130,12 +133,13 @@ def install(pywriterPath):
     copytree('icons', f'{installDir}/icons', dirs_exist_ok=True)
     output(f'Copying "icons"')
 
-    # Make the script executable under Linux.
-    try:
-        st = os.stat(f'{installDir}/{APP}')
-        os.chmod(f'{installDir}/{APP}', st.st_mode | stat.S_IEXEC)
-    except:
-        pass
+    # Make the scripts executable under Linux.
+    for script in (APP, CSV_APP):
+        try:
+            st = os.stat(f'{installDir}/{script}')
+            os.chmod(f'{installDir}/{script}', st.st_mode | stat.S_IEXEC)
+        except:
+            pass
 
     # Install configuration files, if needed.
     try:
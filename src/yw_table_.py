@@ -8,18 +8,21 @@ For further information see https://github.com/peter88213/yw-table
 License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
 """
 import sys
-from pathlib import Path
-import webbrowser
 from tkinter import messagebox
 from pywriter.config.configuration import Configuration
 from pywriter.ui.main_tk import MainTk
 from pywriter.ui.set_icon_tk import *
 from pywriter.converter.export_target_factory import ExportTargetFactory
 from pywriter.pywriter_globals import *
+from pywriter.yw.project_cache import ProjectCache
+from pywriter.diagnostics.instrumentation import INSTRUMENTATION
 from nvmatrixlib.relations_table import RelationsTable
 from nvmatrixlib.node import Node
 from nvmatrixlib.widgets.table_frame import TableFrame
 from nvretablexlib.csv_table import CsvTable
+from nvretablexlib.binary_table import BinaryTable
+from nvretablexlib.jsonl_table import JsonlTable
+from nvretablexlib.edge_table import EdgeTable
 
 APPLICATION = 'Relationship Table'
 APPNAME = 'yw_table'
@@ -46,34 +49,54 @@ SETTINGS = dict(
     csv_loc_false='',
     csv_itm_true='Ⓘ',
     csv_itm_false='',
+    yw_cache_size='50',
     )
 OPTIONS = dict(
     csv_row_numbers=True,
+    yw_stream_read=True,
+    yw_metadata_only=True,
+    yw_cache=True,
+    yw_cache_hash=False,
+    instrumentation=False,
+    instrumentation_profile=False,
     )
+INSTRUMENTATION_VARIABLE = 'YW_TABLE_INSTRUMENTATION'
+# Environment variable that enables the instrumentation if set to "1", or to "profile" for profiling.
 
 
 class TableManager(MainTk):
     _HELP_URL = 'https://peter88213.github.io/yw-table/usage'
+    _EXPORT_CLASSES = [CsvTable, EdgeTable, BinaryTable, JsonlTable]
+    _KEY_SAVE_PROJECT = ('<Control-s>', 'Ctrl-S')
 
     def __init__(self, **kwargs):
         super().__init__(f'{APPLICATION}  @release', **kwargs)
         set_icon(self.root, icon='tLogo32')
+        self._relationsTable = None
+
+        # File
+        self.fileMenu.insert_command(_('Close'), label=_('Save'), accelerator=self._KEY_SAVE_PROJECT[1], command=self._save_changes)
+        self.fileMenu.entryconfig(_('Save'), state='disabled')
+        self.root.bind(self._KEY_SAVE_PROJECT[0], self._save_changes)
 
         # Export
         self.exportMenu = tk.Menu(self.mainMenu, tearoff=0)
         self.mainMenu.add_cascade(label=_('Export'))
         self.mainMenu.entryconfig(_('Export'), menu=self.exportMenu, state='disabled')
-        self.exportMenu.add_command(label='csv', command=lambda: self._export_table('excel', 'utf-8'))
-        self.exportMenu.add_command(label='csv (Excel)', command=lambda:self._export_table('excel-tab', 'utf-16'))
+        self.exportMenu.add_command(label='csv', command=lambda: self._export_table(CsvTable.SUFFIX, csv_dialect='excel', csv_encoding='utf-8'))
+        self.exportMenu.add_command(label='csv (Excel)', command=lambda:self._export_table(CsvTable.SUFFIX, csv_dialect='excel-tab', csv_encoding='utf-16'))
+        self.exportMenu.add_command(label=_(EdgeTable.DESCRIPTION), command=lambda: self._export_table(EdgeTable.SUFFIX, csv_dialect='excel', csv_encoding='utf-8'))
+        self.exportMenu.add_command(label=_(BinaryTable.DESCRIPTION), command=lambda: self._export_table(BinaryTable.SUFFIX))
+        self.exportMenu.add_command(label=_(JsonlTable.DESCRIPTION), command=lambda: self._export_table(JsonlTable.SUFFIX))
 
         # Help
         self.helpMenu = tk.Menu(self.mainMenu, tearoff=0)
         self.mainMenu.add_cascade(label=_('Help'), menu=self.helpMenu)
-        self.helpMenu.add_command(label=_('Online help'), command=lambda: webbrowser.open(self._HELP_URL))
+        self.helpMenu.add_command(label=_('Online help'), command=self._open_help)
+        self.helpMenu.add_command(label=_('Diagnostics'), command=self._show_diagnostics)
 
-    def open_project(self, fileName):
-        if not super().open_project(fileName):
-            return
+    def on_project_read(self):
+        super().on_project_read()
 
         #--- The Relationship Table.
         Node.isModified = False
@@ -106,31 +129,98 @@ class TableManager(MainTk):
 
     def _apply_changes(self):
         """Apply node changes to the project."""
+        self.wait_for_worker()
+        # A failed writing sets the modification flag again.
         if Node.isModified:
             if messagebox.askyesno(APPLICATION, f"{_('Apply changes')}?"):
-                self._relationsTable.get_nodes()
-                try:
-                    self.prjFile.write()
-                except Error as ex:
-                    self.set_info_how(f'!{str(ex)}')
-            Node.isModified = False
-
-    def _export_table(self, csvDialect, csvEncoding):
-        """Export the table as a csv file."""
-        exportTargetFactory = ExportTargetFactory([CsvTable])
+                self._save_changes()
+            else:
+                Node.isModified = False
+
+    def _save_changes(self, event=None):
+        """Write the node changes to the project file in the background.
+        
+        Only an immutable snapshot of the changed relationships is taken here,
+        so the table can be further edited while the file is being written.
+        The modification flag is cleared when the file is written.
+        """
+        self.wait_for_worker()
+        # The snapshot is compared with the scenes, so they must not be modified meanwhile.
+        if not Node.isModified or self._relationsTable is None:
+            return
+
+        changes = self._relationsTable.get_changes()
+        relationsTable = self._relationsTable
+        self.write_project(lambda: relationsTable.apply_changes(changes))
+
+    def _finish_writing(self, isDone, message):
+        """Clear the modification flag, if the changes are saved.
+        
+        Nodes changed while writing keep the project modified.
+        On error, the changes are applied to the scenes, but not saved, 
+        so the project remains modified.
+        Extends the superclass method.
+        """
+        super()._finish_writing(isDone, message)
+        if not isDone:
+            Node.isModified = True
+        elif self._relationsTable is not None:
+            Node.isModified = bool(self._relationsTable.get_changes())
+
+    def _open_help(self):
+        """Show the online help in the web browser.
+        
+        The webbrowser module is imported on first use, to speed up the program start.
+        """
+        from webbrowser import open as open_in_browser
+        open_in_browser(self._HELP_URL)
+
+    def _show_diagnostics(self):
+        """Show the recorded durations of the time-critical operations in a window."""
+        if INSTRUMENTATION.enabled:
+            lines = [f'{_("Operation"):<40} {_("Count"):>6} {_("Total [s]"):>10} {_("Mean [s]"):>10} {_("Max [s]"):>10}']
+            for name, count, total, maximum in INSTRUMENTATION.get_summary():
+                lines.append(f'{name:<40} {count:>6} {total:>10.3f} {total / count:>10.3f} {maximum:>10.3f}')
+            lines.append('')
+            lines.append(f'{_("Log file")}: {norm_path(INSTRUMENTATION.logPath)}')
+            if INSTRUMENTATION.profile:
+                lines.append(f'{_("cProfile statistics")}: {norm_path(os.path.dirname(INSTRUMENTATION.logPath))}')
+        else:
+            lines = [f'{_("Instrumentation is disabled")}.',
+                     f'{_("To enable it, set the instrumentation option in the configuration file")},',
+                     f'{_("or the environment variable")} {INSTRUMENTATION_VARIABLE}=1 ({_("with profiling")}: {INSTRUMENTATION_VARIABLE}=profile).']
+        window = tk.Toplevel(self.root)
+        window.title(f'{APPLICATION} - {_("Diagnostics")}')
+        text = tk.Text(window, font='TkFixedFont', wrap='none', height=min(len(lines), 30) + 1, width=82)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, '\n'.join(lines))
+        text.config(state='disabled')
+        tk.Button(window, text=_('Close'), command=window.destroy).pack(pady=5)
+
+    def _export_table(self, suffix, **kwargs):
+        """Export the table in the format specified by the file name suffix.
+        
+        Positional arguments:
+            suffix: str -- File name suffix of the export target class.
+            
+        Optional arguments:
+            kwargs -- Export settings, e.g. for the csv dialect.
+        """
+        exportTargetFactory = ExportTargetFactory(self._EXPORT_CLASSES)
         try:
-            self.kwargs['suffix'] = CsvTable.SUFFIX
-            self.kwargs['csv_dialect'] = csvDialect
-            self.kwargs['csv_encoding'] = csvEncoding
+            self.kwargs['suffix'] = suffix
+            self.kwargs.update(kwargs)
             __, target = exportTargetFactory.make_file_objects(self.prjFile.filePath, **self.kwargs)
         except Exception as ex:
             self.set_info_how(f'!{str(ex)}')
             return
 
         self._apply_changes()
+        self.wait_for_worker()
         target.novel = self.novel
         try:
-            message = target.write()
+            with INSTRUMENTATION.timer(f'{type(target).__name__}.write', profile=True):
+                message = target.write()
         except Exception as ex:
             self.set_info_how(f'!{str(ex)}')
         else:
@@ -142,6 +232,7 @@ class TableManager(MainTk):
         Extends the superclass method.
         """
         self.mainMenu.entryconfig(_('Export'), state='disabled')
+        self.fileMenu.entryconfig(_('Save'), state='disabled')
         super().disable_menu()
 
     def enable_menu(self):
@@ -150,6 +241,7 @@ class TableManager(MainTk):
         Extends the superclass method.
         """
         self.mainMenu.entryconfig(_('Export'), state='normal')
+        self.fileMenu.entryconfig(_('Save'), state='normal')
         super().enable_menu()
 
 
@@ -162,10 +254,14 @@ def main():
 
     #--- Load configuration.
     try:
-        homeDir = str(Path.home()).replace('\\', '/')
+        homeDir = os.path.expanduser('~').replace('\\', '/')
         installDir = f'{homeDir}/.pywriter/{APPNAME}/config'
+        cacheDir = f'{homeDir}/.pywriter/{APPNAME}/cache'
+        diagnosticsDir = f'{homeDir}/.pywriter/{APPNAME}/diagnostics'
     except:
         installDir = '.'
+        cacheDir = './cache'
+        diagnosticsDir = './diagnostics'
     os.makedirs(installDir, exist_ok=True)
     iniFile = f'{installDir}/{APPNAME}.ini'
     configuration = Configuration(SETTINGS, OPTIONS)
@@ -178,8 +274,20 @@ def main():
     if not filePath or not os.path.isfile(filePath):
         filePath = kwargs['yw_last_open']
 
+    #--- Enable the instrumentation, if requested.
+    instrumentation = os.environ.get(INSTRUMENTATION_VARIABLE, '')
+    if kwargs['instrumentation'] or instrumentation not in ('', '0'):
+        profile = kwargs['instrumentation_profile'] or instrumentation == 'profile'
+        INSTRUMENTATION.enable(diagnosticsDir, profile)
+
     #--- Run the application.
     ui = TableManager(**kwargs)
+    if kwargs['yw_cache']:
+        try:
+            cacheSize = int(kwargs['yw_cache_size']) * 1048576
+        except ValueError:
+            cacheSize = 50 * 1048576
+        ui.projectCache = ProjectCache(cacheDir, cacheSize, kwargs['yw_cache_hash'])
     try:
         ui.open_project(filePath)
     except Error as ex:
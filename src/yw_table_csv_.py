@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+"""Export the relationship tables of yw7 files as csv files or other formats, without GUI
+
+Version @release
+Requires Python 3.6+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+
+usage: yw_table_csv.py [-h] [-r] [--format {csv,edges,binary,jsonl}] [--excel] [--arc-points] [--processes N] 
+                       Sourcepath [Sourcepath ...]
+
+positional arguments:
+  Sourcepath     yWriter 7 project file, or directory containing yWriter 7 project files
+
+optional arguments:
+  -h, --help     show this help message and exit
+  -r             search the directories recursively
+  --format {csv,edges,binary,jsonl}
+                 export format: csv table (default), csv edge list, binary columnar matrix, or JSON Lines
+  --excel        write tab-separated utf-16 files, as expected by Excel
+  --arc-points   write the arc point titles instead of the arc markers
+  --processes N  number of worker processes (default: number of CPUs)
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from pathlib import Path
+from pywriter.pywriter_globals import *
+from pywriter.config.configuration import Configuration
+from pywriter.converter.export_target_factory import ExportTargetFactory
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from nvretablexlib.csv_table import CsvTable
+from nvretablexlib.binary_table import BinaryTable
+from nvretablexlib.jsonl_table import JsonlTable
+from nvretablexlib.edge_table import EdgeTable
+
+APPNAME = 'yw_table'
+SETTINGS = dict(
+    csv_arc_true='Ⓐ',
+    csv_arc_false='',
+    csv_chr_true='Ⓒ',
+    csv_chr_false='',
+    csv_loc_true='Ⓛ',
+    csv_loc_false='',
+    csv_itm_true='Ⓘ',
+    csv_itm_false='',
+    )
+OPTIONS = dict(
+    csv_row_numbers=True,
+    )
+# The csv export settings and options of yw_table, read from the same configuration file.
+EXPORT_FORMATS = dict(
+    csv=CsvTable,
+    edges=EdgeTable,
+    binary=BinaryTable,
+    jsonl=JsonlTable,
+    )
+
+
+def export_table(sourcePath, kwargs):
+    """Export the relationship table of a yWriter project.
+
+    Positional arguments:
+        sourcePath: str -- path to the yWriter 7 project file.
+        kwargs: dict -- settings and options for reading the project and writing the table.
+
+    This is a module level function, so it can be used with a process pool.
+    Return a tuple: (sourcePath, message, seconds).
+    The message begins with "!" in case of error.
+    """
+    startTime = time.perf_counter()
+    try:
+        __, target = ExportTargetFactory(list(EXPORT_FORMATS.values())).make_file_objects(sourcePath, **kwargs)
+        source = Yw7File(sourcePath, **kwargs)
+        source.novel = Novel()
+        source.read()
+        target.novel = source.novel
+        message = target.write()
+    except Exception as ex:
+        message = f'!{str(ex)}'
+    return sourcePath, message, time.perf_counter() - startTime
+
+
+def find_projects(sourcePaths, recursive=False):
+    """Return a list with the paths of the yWriter 7 project files.
+
+    Positional arguments:
+        sourcePaths: list of yWriter 7 project files or directories.
+
+    Optional arguments:
+        recursive: bool -- if True, search the directories recursively.
+    """
+    projects = []
+    for sourcePath in sourcePaths:
+        if os.path.isdir(sourcePath):
+            for dirPath, dirNames, fileNames in os.walk(sourcePath):
+                dirNames.sort()
+                for fileName in sorted(fileNames):
+                    if fileName.lower().endswith(Yw7File.EXTENSION):
+                        projects.append(os.path.join(dirPath, fileName))
+                if not recursive:
+                    break
+        else:
+            projects.append(sourcePath)
+    return projects
+
+
+def main(sourcePaths, recursive=False, processes=None, exportFormat='csv', **kwargs):
+    """Export the relationship tables, and report the time needed per file.
+
+    Positional arguments:
+        sourcePaths: list of yWriter 7 project files or directories.
+
+    Optional arguments:
+        recursive: bool -- if True, search the directories recursively.
+        processes: int -- number of worker processes (default: number of CPUs).
+        exportFormat: str -- key of EXPORT_FORMATS.
+        kwargs -- settings and options for reading the projects and writing the tables.
+
+    Return the number of failed exports.
+    """
+    projects = find_projects(sourcePaths, recursive)
+    kwargs['suffix'] = EXPORT_FORMATS[exportFormat].SUFFIX
+    kwargs['yw_stream_read'] = True
+    kwargs['yw_metadata_only'] = True
+    # The export does not need the scene contents.
+    errors = 0
+    startTime = time.perf_counter()
+
+    def report(result):
+        # Note: errors is a caller's variable.
+        nonlocal errors
+        sourcePath, message, seconds = result
+        if message.startswith('!'):
+            errors += 1
+            message = f'{_("Error")}: "{norm_path(sourcePath)}": {message[1:]}'
+        print(f'{seconds:8.3f} s  {message}')
+
+    if processes == 1 or len(projects) < 2:
+        for sourcePath in projects:
+            report(export_table(sourcePath, kwargs))
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(export_table, sourcePath, kwargs) for sourcePath in projects]
+            for future in as_completed(futures):
+                report(future.result())
+    print(f'{time.perf_counter() - startTime:8.3f} s  {len(projects) - errors} of {len(projects)} {_("files exported")}.')
+    return errors
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Export the relationship tables of yWriter 7 projects.',
+        epilog='')
+    parser.add_argument('sourcePaths', metavar='Sourcepath', nargs='+',
+                        help='yWriter 7 project file, or directory containing yWriter 7 project files')
+    parser.add_argument('-r', action='store_true', dest='recursive',
+                        help='search the directories recursively')
+    parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='csv', dest='exportFormat',
+                        help='export format: csv table (default), csv edge list, binary columnar matrix, or JSON Lines')
+    parser.add_argument('--excel', action='store_true',
+                        help='write tab-separated utf-16 files, as expected by Excel')
+    parser.add_argument('--arc-points', action='store_true', dest='arcPoints',
+                        help='write the arc point titles instead of the arc markers')
+    parser.add_argument('--processes', type=int, default=None, metavar='N',
+                        help='number of worker processes (default: number of CPUs)')
+    args = parser.parse_args()
+
+    #--- Load configuration.
+    try:
+        homeDir = str(Path.home()).replace('\\', '/')
+        iniFile = f'{homeDir}/.pywriter/{APPNAME}/config/{APPNAME}.ini'
+    except:
+        iniFile = f'./{APPNAME}.ini'
+    configuration = Configuration(SETTINGS, OPTIONS)
+    configuration.read(iniFile)
+    kwargs = {}
+    kwargs.update(configuration.settings)
+    kwargs.update(configuration.options)
+    if args.excel:
+        kwargs['csv_dialect'] = 'excel-tab'
+        kwargs['csv_encoding'] = 'utf-16'
+    else:
+        kwargs['csv_dialect'] = 'excel'
+        kwargs['csv_encoding'] = 'utf-8'
+    kwargs['csv_arc_points'] = args.arcPoints
+
+    if main(args.sourcePaths, recursive=args.recursive, processes=args.processes, exportFormat=args.exportFormat, **kwargs):
+        sys.exit(1)
@@ -0,0 +1,55 @@
+"""Regression tests for the IdAllocator class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import sys
+import tracemalloc
+import unittest
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from pywriter.model.id_generator import IdAllocator
+from pywriter.model.id_generator import create_id
+
+
+class IdAllocatorOrder(unittest.TestCase):
+    """Return the same IDs as create_id(), without searching the collection again."""
+
+    def test_gaps_first(self):
+        elements = {'1': None, '3': None, '4': None, '7': None, 'x': None, '05': None}
+        allocator = IdAllocator(elements)
+        newIds = []
+        for __ in range(5):
+            elemId = create_id(elements)
+            self.assertEqual(allocator.create_id(), elemId)
+            elements[elemId] = None
+            newIds.append(elemId)
+        self.assertEqual(newIds, ['2', '5', '6', '8', '9'])
+
+    def test_unused_ids(self):
+        allocator = IdAllocator({'1', '2'})
+        self.assertEqual(allocator.create_ids(3), ['3', '4', '5'])
+
+    def test_release_id(self):
+        elements = {'1', '2', '3', '4'}
+        allocator = IdAllocator(elements)
+        self.assertEqual(allocator.create_id(), '5')
+        elements.discard('2')
+        allocator.release_id('2')
+        allocator.release_id('3')
+        self.assertEqual(allocator.create_ids(2), ['2', '6'])
+
+    def test_high_ids(self):
+        tracemalloc.start()
+        try:
+            allocator = IdAllocator({'99999999'})
+            self.assertEqual(allocator.create_id(), '1')
+            __, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 100000)
+
+
+if __name__ == '__main__':
+    unittest.main()
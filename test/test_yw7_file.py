@@ -0,0 +1,236 @@
+"""Regression tests for the Yw7File class.
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import xml.etree.ElementTree as ET
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from pywriter.yw.project_cache import ProjectCache
+
+SPECIAL = 'a & b < c > d " e'
+# Text with characters that must be escaped in xml.
+
+PROJECT = f'''<?xml version="1.0" encoding="utf-8"?>
+<YWRITER7>
+  <PROJECT>
+    <Ver>7</Ver>
+    <Title><![CDATA[{SPECIAL}]]></Title>
+    <AuthorName><![CDATA[{SPECIAL}]]></AuthorName>
+    <Bio><![CDATA[{SPECIAL}]]></Bio>
+    <Desc><![CDATA[{SPECIAL}]]></Desc>
+    <FieldTitle1><![CDATA[{SPECIAL}]]></FieldTitle1>
+  </PROJECT>
+  <LOCATIONS>
+    <LOCATION>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+      <AKA><![CDATA[{SPECIAL}]]></AKA>
+      <Tags><![CDATA[{SPECIAL}]]></Tags>
+      <Fields>
+        <Field_Link><![CDATA[http://x?a=1&b=2<3]]></Field_Link>
+      </Fields>
+    </LOCATION>
+  </LOCATIONS>
+  <ITEMS>
+    <ITEM>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+      <Fields>
+        <Field_Link><![CDATA[http://x?a=1&b=2<3]]></Field_Link>
+      </Fields>
+    </ITEM>
+  </ITEMS>
+  <CHARACTERS>
+    <CHARACTER>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+      <Notes><![CDATA[{SPECIAL}]]></Notes>
+      <Bio><![CDATA[{SPECIAL}]]></Bio>
+      <Goals><![CDATA[{SPECIAL}]]></Goals>
+      <FullName><![CDATA[{SPECIAL}]]></FullName>
+      <Fields>
+        <Field_Link><![CDATA[http://x?a=1&b=2<3]]></Field_Link>
+        <Field_BirthDate>1900-01-01</Field_BirthDate>
+      </Fields>
+    </CHARACTER>
+  </CHARACTERS>
+  <PROJECTNOTES>
+    <PROJECTNOTE>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+    </PROJECTNOTE>
+  </PROJECTNOTES>
+  <SCENES>
+    <SCENE>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+      <SceneContent><![CDATA[{SPECIAL}]]></SceneContent>
+      <Notes><![CDATA[{SPECIAL}]]></Notes>
+      <Tags><![CDATA[{SPECIAL}]]></Tags>
+      <Goal><![CDATA[{SPECIAL}]]></Goal>
+      <Conflict><![CDATA[{SPECIAL}]]></Conflict>
+      <Outcome><![CDATA[{SPECIAL}]]></Outcome>
+      <Fields>
+        <Field_SceneArcs><![CDATA[{SPECIAL}]]></Field_SceneArcs>
+      </Fields>
+    </SCENE>
+    <SCENE>
+      <ID>2</ID>
+      <Title><![CDATA[Scene 2]]></Title>
+    </SCENE>
+  </SCENES>
+  <CHAPTERS>
+    <CHAPTER>
+      <ID>1</ID>
+      <Title><![CDATA[{SPECIAL}]]></Title>
+      <Desc><![CDATA[{SPECIAL}]]></Desc>
+      <Type>0</Type>
+      <ChapterType>0</ChapterType>
+      <Scenes>
+        <ScID>1</ScID>
+        <ScID>2</ScID>
+      </Scenes>
+    </CHAPTER>
+  </CHAPTERS>
+</YWRITER7>
+'''
+READ_MODES = (
+    {},
+    {'yw_stream_read': True},
+    {'yw_stream_read': True, 'yw_metadata_only': True},
+    )
+
+
+def read_project(filePath, cache=None, **kwargs):
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.cache = cache
+    ywFile.read()
+    return ywFile
+
+
+class Yw7FileRoundTrip(unittest.TestCase):
+    """Read and write a project with special characters in every kind of field."""
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.filePath = f'{self.tempDir}/test.yw7'
+        with open(self.filePath, 'w', encoding='utf-8') as f:
+            f.write(PROJECT)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def check_file(self):
+        """Assert that the file is well-formed, and the special characters are kept."""
+        ET.parse(self.filePath)
+        novel = read_project(self.filePath).novel
+        self.assertEqual(novel.title, SPECIAL)
+        self.assertEqual(novel.locations['1'].kwVar['Field_Link'], 'http://x?a=1&b=2<3')
+        self.assertEqual(novel.items['1'].desc, SPECIAL)
+        self.assertEqual(novel.characters['1'].kwVar['Field_Link'], 'http://x?a=1&b=2<3')
+        self.assertEqual(novel.characters['1'].fullName, SPECIAL)
+        self.assertEqual(novel.projectNotes['1'].desc, SPECIAL)
+        self.assertEqual(novel.scenes['1'].sceneContent, SPECIAL)
+        self.assertEqual(novel.scenes['1'].conflict, SPECIAL)
+        self.assertEqual(novel.scenes['1'].scnArcs, SPECIAL)
+        self.assertEqual(novel.chapters['1'].desc, SPECIAL)
+
+    def test_write_unmodified(self):
+        for kwargs in READ_MODES:
+            with self.subTest(**kwargs):
+                read_project(self.filePath, **kwargs).write()
+                self.check_file()
+
+    def test_write_modified(self):
+        for kwargs in READ_MODES:
+            with self.subTest(**kwargs):
+                ywFile = read_project(self.filePath, **kwargs)
+                ywFile.novel.scenes['2'].title = f'{SPECIAL} 2'
+                ywFile.novel.characters['1'].desc = SPECIAL
+                ywFile.write()
+                self.check_file()
+                if ywFile.streaming:
+                    self.assertIsNone(ywFile.tree)
+
+                # Patch the tree kept from the previous writing, or parsed again.
+                ywFile.novel.scenes['2'].title = 'Scene 2'
+                ywFile.write()
+                self.check_file()
+
+
+class Yw7FileLanguages(unittest.TestCase):
+    """Write the language codes of the scene contents as project variables."""
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.filePath = f'{self.tempDir}/test.yw7'
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_write_languages(self):
+        for kwargs in READ_MODES:
+            with self.subTest(**kwargs):
+                with open(self.filePath, 'w', encoding='utf-8') as f:
+                    f.write(PROJECT.replace(f'<SceneContent><![CDATA[{SPECIAL}]]>',
+                                            '<SceneContent><![CDATA[Text [lang=de]Text[/lang=de].]]>'))
+                read_project(self.filePath, **kwargs).write()
+                root = ET.parse(self.filePath).getroot()
+                titles = [xmlProjectvar.find('Title').text for xmlProjectvar in root.iter('PROJECTVAR')]
+                self.assertIn('lang=de', titles)
+                self.assertIn('/lang=de', titles)
+                novel = read_project(self.filePath).novel
+                self.assertEqual(novel.scenes['1'].sceneContent, 'Text [lang=de]Text[/lang=de].')
+
+
+class Yw7FileCache(unittest.TestCase):
+    """Read a project from the cache in metadata-only mode."""
+
+    def setUp(self):
+        self.tempDir = tempfile.mkdtemp()
+        self.filePath = f'{self.tempDir}/test.yw7'
+        with open(self.filePath, 'w', encoding='utf-8') as f:
+            f.write(PROJECT)
+        self.cache = ProjectCache(f'{self.tempDir}/cache', 1048576)
+
+    def tearDown(self):
+        shutil.rmtree(self.tempDir)
+
+    def test_read_cached(self):
+        kwargs = {'yw_stream_read': True, 'yw_metadata_only': True}
+        parsed = read_project(self.filePath, cache=self.cache, **kwargs).novel
+        ywFile = read_project(self.filePath, cache=self.cache, **kwargs)
+        cached = ywFile.novel
+        self.assertIsNone(cached.scenes['1'].sceneContent)
+        self.assertEqual(cached.scenes['1'].arcs, parsed.scenes['1'].arcs)
+        self.assertEqual(cached.chapters['1'].srtScenes, ['1', '2'])
+        self.assertEqual(cached.characters['1'].fullName, SPECIAL)
+        self.assertIn('1', cached.srtCharacters)
+        self.assertFalse(cached.scenes['1'].isModified)
+
+        # Write a project read from the cache.
+        cached.scenes['2'].title = f'{SPECIAL} 2'
+        ywFile.write()
+        self.assertEqual(read_project(self.filePath).novel.scenes['1'].sceneContent, SPECIAL)
+
+    def test_read_full(self):
+        read_project(self.filePath, cache=self.cache, yw_stream_read=True)
+        self.assertFalse(os.path.isdir(f'{self.tempDir}/cache'))
+
+
+if __name__ == '__main__':
+    unittest.main()
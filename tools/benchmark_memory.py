@@ -0,0 +1,110 @@
+"""Measure the memory used by the yWriter project model.
+
+Report the size of empty model instances, and the memory held by a
+synthetic project after reading it with Yw7File in each read mode.
+The sizes are measured with tracemalloc, so they include the
+instance variables' values, but not the interpreter's own overhead.
+
+usage: benchmark_memory.py [options] [--output FILE]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from pywriter.pywriter_globals import *
+from pywriter.model.chapter import Chapter
+from pywriter.model.character import Character
+from pywriter.model.scene import Scene
+from pywriter.model.world_element import WorldElement
+from benchmark_suite import READ_MODES
+from benchmark_suite import read_project
+from yw7_generator import generate
+
+MODEL_CLASSES = (Scene, Chapter, Character, WorldElement)
+
+
+def allocated(func):
+    """Return a tuple: (return value of func, bytes still allocated, peak bytes allocated while running func)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+
+def run(count, parameters):
+    """Return a dictionary with the benchmark parameters and the memory sizes in bytes."""
+    results = {}
+
+    #--- Empty model instances.
+    for modelClass in MODEL_CLASSES:
+        __, current, __ = allocated(lambda: [modelClass() for __ in range(count)])
+        results[f'{modelClass.__name__}() per instance'] = current / count
+
+    #--- Projects read in the different modes.
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/benchmark.yw7'
+        generate(filePath, **parameters)
+        for mode, kwargs in READ_MODES:
+            __, current, peak = allocated(lambda: read_project(filePath, **kwargs).novel)
+            results[f'Yw7File.read ({mode}) novel per scene'] = current / parameters['scenes']
+            results[f'Yw7File.read ({mode}) peak'] = peak
+    return {
+        'parameters': parameters,
+        'instances': count,
+        'results': results,
+        }
+
+
+def print_results(report):
+    print(f'{report["parameters"]}, {report["instances"]} empty instances per class')
+    for name, size in report['results'].items():
+        if size >= 1048576:
+            print(f'  {name:<45} {size / 1048576:10.1f} MiB')
+        else:
+            print(f'  {name:<45} {size:10.0f} bytes')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Measure the memory used by the yWriter project model.',
+        epilog='')
+    parser.add_argument('--scenes', type=int, default=20000)
+    parser.add_argument('--characters', type=int, default=50)
+    parser.add_argument('--locations', type=int, default=20)
+    parser.add_argument('--items', type=int, default=20)
+    parser.add_argument('--arcs', type=int, default=3)
+    parser.add_argument('--words', type=int, default=100)
+    parser.add_argument('--relations', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--instances', type=int, default=10000,
+                        help='number of empty instances per model class')
+    parser.add_argument('--output', metavar='FILE', default=None,
+                        help='write the results to a JSON file')
+    args = parser.parse_args()
+    parameters = dict(scenes=args.scenes,
+                      characters=args.characters,
+                      locations=args.locations,
+                      items=args.items,
+                      arcs=args.arcs,
+                      words=args.words,
+                      relations=args.relations,
+                      seed=args.seed,
+                      )
+    report = run(args.instances, parameters)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print_results(report)
@@ -0,0 +1,90 @@
+"""Benchmark the yWriter 7 project reader on a synthetic project.
+
+Compare the subelement lookup by repeated find() calls with the
+tag index built by Yw7File._get_subelements(), and time Yw7File.read().
+
+usage: benchmark_read.py [--scenes N] [--repeat N]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from pywriter.model.novel import Novel
+from pywriter.yw.yw7_file import Yw7File
+from yw7_generator import generate
+
+SCENE_TAGS = ('ID', 'Title', 'Unused', 'ExportCondSpecific', 'ExportWhenRTF', 'AppendToPrev', 'ReactionScene',
+              'SubPlot', 'Characters', 'Locations', 'Items', 'Desc', 'SceneContent', 'Status', 'Notes', 'Tags',
+              'Field1', 'Field2', 'Field3', 'Field4', 'SpecificDateTime', 'Day', 'Hour', 'Minute',
+              'LastsDays', 'LastsHours', 'LastsMinutes', 'Goal', 'Conflict', 'Outcome', 'ImageFile')
+
+
+def best_of(repeat, func):
+    """Return the shortest of repeated execution times of func, in seconds."""
+    times = []
+    for __ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def lookup_by_find(xmlScenes):
+    """Look up the scene subelements the way the readers did before indexing."""
+    for xmlScene in xmlScenes:
+        for tag in SCENE_TAGS:
+            if xmlScene.find(tag) is not None:
+                xmlScene.find(tag).text
+
+
+def lookup_by_index(ywFile, xmlScenes):
+    """Look up the scene subelements via the tag index."""
+    for xmlScene in xmlScenes:
+        subelements = ywFile._get_subelements(xmlScene)
+        for tag in SCENE_TAGS:
+            if tag in subelements:
+                subelements[tag].text
+
+
+def read_project(filePath, **kwargs):
+    """Read the project into a new Novel instance."""
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+
+
+def run(scenes, repeat):
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/benchmark.yw7'
+        generate(filePath, scenes=scenes)
+        print(f'Project with {scenes} scenes, {os.path.getsize(filePath)} bytes.')
+        print(f'Best of {repeat} runs:')
+
+        ywFile = Yw7File(filePath)
+        xmlScenes = ywFile._parse_xml_file().find('SCENES')
+        findTime = best_of(repeat, lambda: lookup_by_find(xmlScenes))
+        indexTime = best_of(repeat, lambda: lookup_by_index(ywFile, xmlScenes))
+        print(f'Scene subelement lookup by find():   {findTime:.3f} s')
+        print(f'Scene subelement lookup by index:    {indexTime:.3f} s ({findTime / indexTime:.1f}x)')
+
+        for title, kwargs in (('Yw7File.read():', {}),
+                              ('Yw7File.read(), streaming:', {'yw_stream_read': True}),
+                              ('Yw7File.read(), metadata only:', {'yw_stream_read': True, 'yw_metadata_only': True}),
+                              ):
+            print(f'{title:<36} {best_of(repeat, lambda: read_project(filePath, **kwargs)):.3f} s')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the yWriter 7 project reader on a synthetic project.',
+        epilog='')
+    parser.add_argument('--scenes', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.scenes, args.repeat)
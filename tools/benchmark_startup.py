@@ -0,0 +1,97 @@
+"""Benchmark the start of the yw_table program.
+
+Measure the import time of the yw_table_ module with "python -X importtime",
+list the modules that take the most time to import, and time the cold start
+from launching the interpreter to the first displayed window.
+Each measurement runs in a new interpreter; the median is reported.
+
+usage: benchmark_startup.py [--repeat N] [--top N]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = f'{os.path.dirname(os.path.abspath(__file__))}/../src'
+MODULE = 'yw_table_'
+FIRST_WINDOW = f'''
+from {MODULE} import *
+kwargs = dict(SETTINGS)
+kwargs.update(OPTIONS)
+kwargs['yw_last_open'] = ''
+ui = TableManager(**kwargs)
+ui.root.update()
+print('ready', flush=True)
+ui.root.destroy()
+'''
+# Create the main window without opening a project, and report when it is displayed.
+
+
+def import_times():
+    """Import the module in a new interpreter.
+
+    Return a dictionary (key: module name; value: cumulative import time in seconds).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {MODULE}'],
+                            cwd=SRC_DIR, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        # Format: "import time: <self [us]> | <cumulative [us]> | <indented module name>"
+        fields = line.split('|')
+        if len(fields) != 3:
+            continue
+
+        try:
+            times[fields[2].strip()] = int(fields[1]) / 1000000
+        except ValueError:
+            # Header line.
+            pass
+    return times
+
+
+def elapsed_time(code):
+    """Return the seconds from launching a new interpreter until code prints a line, or None on error."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-c', code],
+                               cwd=SRC_DIR, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True)
+    line = process.stdout.readline()
+    seconds = time.perf_counter() - start
+    process.wait()
+    if not line:
+        return None
+
+    return seconds
+
+
+def run(repeat, top):
+    runs = [import_times() for __ in range(repeat)]
+    total = statistics.median(times[MODULE] for times in runs)
+    print(f'Import of {MODULE} (median of {repeat} runs): {total * 1000:.1f} ms')
+    print('Modules with the longest cumulative import time:')
+    modules = {name: statistics.median(times.get(name, 0) for times in runs) for name in runs[0] if name != MODULE}
+    for name in sorted(modules, key=modules.get, reverse=True)[:top]:
+        print(f'  {modules[name] * 1000:8.1f} ms  {name}')
+
+    interpreterTimes = [elapsed_time('print()') for __ in range(repeat)]
+    print(f'Interpreter start: {statistics.median(interpreterTimes) * 1000:.1f} ms')
+    windowTimes = [elapsed_time(FIRST_WINDOW) for __ in range(repeat)]
+    if None in windowTimes:
+        print('Cold start to first window: not measured (no display available).')
+    else:
+        print(f'Cold start to first window: {statistics.median(windowTimes) * 1000:.1f} ms')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Benchmark the start of the yw_table program.',
+        epilog='')
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+    run(args.repeat, args.top)
@@ -0,0 +1,272 @@
+"""Run the yw_table benchmarks on a synthetic project, and write the results as JSON.
+
+Time reading and writing the project with Yw7File, building and
+updating the relationship table, and writing the export formats.
+Each benchmark is repeated; the JSON output holds all run times, so
+the results of different commits can be compared with --compare.
+Benchmarks that need a display are skipped if none is available.
+
+usage: benchmark_suite.py [options] [--output FILE] [--compare FILE]
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, f'{os.path.dirname(os.path.abspath(__file__))}/../src')
+from pywriter.pywriter_globals import *
+from pywriter.model.novel import Novel
+from pywriter.model.id_generator import IdAllocator
+from pywriter.model.relations_matrix import RelationsMatrix
+from pywriter.yw.yw7_file import Yw7File
+from nvretablexlib.csv_table import CsvTable
+from nvretablexlib.edge_table import EdgeTable
+from nvretablexlib.binary_table import BinaryTable
+from nvretablexlib.jsonl_table import JsonlTable
+from yw7_generator import generate
+
+EXPORT_SETTINGS = dict(
+    csv_arc_true='Ⓐ',
+    csv_arc_false='',
+    csv_chr_true='Ⓒ',
+    csv_chr_false='',
+    csv_loc_true='Ⓛ',
+    csv_loc_false='',
+    csv_itm_true='Ⓘ',
+    csv_itm_false='',
+    csv_row_numbers=True,
+    csv_dialect='excel',
+    csv_encoding='utf-8',
+    )
+READ_MODES = (
+    ('tree', {}),
+    ('streaming', {'yw_stream_read': True}),
+    ('metadata_only', {'yw_stream_read': True, 'yw_metadata_only': True}),
+    )
+
+
+def measure(repeat, func, setup=None):
+    """Return a list with the execution times of func, in seconds.
+
+    Positional arguments:
+        repeat: int -- number of runs.
+        func -- function to be timed. If setup is given, func gets its return value.
+
+    Optional arguments:
+        setup -- function that prepares a run; not timed.
+    """
+    times = []
+    for __ in range(repeat):
+        if setup is None:
+            start = time.perf_counter()
+            func()
+        else:
+            state = setup()
+            start = time.perf_counter()
+            func(state)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def read_project(filePath, **kwargs):
+    """Return a Yw7File instance with the project read into a new Novel instance."""
+    ywFile = Yw7File(filePath, **kwargs)
+    ywFile.novel = Novel()
+    ywFile.read()
+    return ywFile
+
+
+def get_matrix(novel):
+    """Return a RelationsMatrix instance for the novel's "normal" scenes, like the relationship table."""
+    rows = []
+    arcs = {}
+    for chId in novel.srtChapters:
+        for scId in novel.chapters[chId].srtScenes:
+            if novel.scenes[scId].scType == 0:
+                rows.append(scId)
+                for arc in novel.scenes[scId].arcs:
+                    arcs[arc] = None
+    return RelationsMatrix(rows,
+                           arcs=arcs,
+                           characters=novel.srtCharacters,
+                           locations=novel.srtLocations,
+                           items=novel.srtItems)
+
+
+def change_relationships(matrix, step=10):
+    """Toggle the first character of every step-th scene."""
+    if matrix.columns[matrix.CHARACTERS]:
+        for row in range(0, len(matrix.rows), step):
+            matrix.toggle(matrix.CHARACTERS, row, 0)
+
+
+def run_table_benchmarks(filePath, repeat, results):
+    """Time the relationship table, if a display is available.
+
+    Return None on success, otherwise a string with the reason for skipping.
+    """
+    try:
+        import tkinter as tk
+        from yw_table_ import SETTINGS
+        from nvmatrixlib.relations_table import RelationsTable
+        from nvmatrixlib.widgets.table_frame import TableFrame
+        root = tk.Tk()
+    except Exception as ex:
+        return str(ex)
+
+    root.withdraw()
+    novel = read_project(filePath, yw_stream_read=True, yw_metadata_only=True).novel
+
+    def new_table():
+        tableFrame = TableFrame(root)
+        tableFrame.pack()
+        relationsTable = RelationsTable(tableFrame, novel, **SETTINGS)
+        root.update()
+        return tableFrame, relationsTable
+
+    def destroy_table(table):
+        table[0].destroy()
+
+    def set_nodes():
+        table = new_table()
+        table[1].set_nodes()
+        return table
+
+    def get_nodes():
+        table = set_nodes()
+        change_relationships(table[1]._matrix)
+        return table
+
+    results['RelationsTable()'] = measure(repeat, lambda: destroy_table(new_table()))
+    results['RelationsTable.set_nodes'] = measure(repeat, lambda table: (table[1].set_nodes(), destroy_table(table)), new_table)
+    results['RelationsTable.get_nodes'] = measure(repeat, lambda table: (table[1].get_nodes(), destroy_table(table)), get_nodes)
+    root.destroy()
+    return None
+
+
+def run(repeat, parameters):
+    """Return a dictionary with the benchmark environment, parameters, and run times."""
+    results = {}
+    skipped = {}
+    with tempfile.TemporaryDirectory() as tempDir:
+        filePath = f'{tempDir}/benchmark.yw7'
+        generate(filePath, **parameters)
+
+        #--- Yw7File.
+        for mode, kwargs in READ_MODES:
+            results[f'Yw7File.read ({mode})'] = measure(repeat, lambda: read_project(filePath, **kwargs))
+            results[f'Yw7File.write ({mode})'] = measure(repeat, lambda ywFile: ywFile.write(),
+                                                         lambda: read_project(filePath, **kwargs))
+
+        def read_changed():
+            ywFile = read_project(filePath)
+            for scId in list(ywFile.novel.scenes)[::10]:
+                ywFile.novel.scenes[scId].title = f'{ywFile.novel.scenes[scId].title}.'
+            return ywFile
+
+        results['Yw7File.write (10% scenes changed)'] = measure(repeat, lambda ywFile: ywFile.write(), read_changed)
+
+        #--- Relationship matrix, as used by the table.
+        novel = read_project(filePath, yw_stream_read=True, yw_metadata_only=True).novel
+        results['RelationsMatrix.read_scenes'] = measure(repeat, lambda: get_matrix(novel).read_scenes(novel))
+
+        def changed_matrix():
+            matrix = get_matrix(novel)
+            matrix.read_scenes(novel)
+            change_relationships(matrix)
+            return matrix
+
+        results['RelationsMatrix.get_changes'] = measure(repeat, lambda matrix: matrix.get_changes(novel), changed_matrix)
+
+        results['IdAllocator.create_ids (as many as scenes)'] = measure(
+            repeat, lambda: IdAllocator(novel.scenes).create_ids(len(novel.scenes)))
+
+        #--- Relationship table.
+        reason = run_table_benchmarks(filePath, repeat, results)
+        if reason is not None:
+            for name in ('RelationsTable()', 'RelationsTable.set_nodes', 'RelationsTable.get_nodes'):
+                skipped[name] = reason
+
+        #--- Exports.
+        for exportClass in (CsvTable, EdgeTable, BinaryTable, JsonlTable):
+            target = exportClass(f'{tempDir}/benchmark{exportClass.SUFFIX}{exportClass.EXTENSION}', **EXPORT_SETTINGS)
+            target.novel = novel
+            results[f'{exportClass.__name__}.write'] = measure(repeat, target.write)
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, universal_newlines=True).stdout.strip()
+    except:
+        commit = ''
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': parameters,
+        'repeat': repeat,
+        'results': results,
+        'skipped': skipped,
+        }
+
+
+def print_results(report, previous=None):
+    """Print the median run times, and the ratio to a previous report, if any."""
+    print(f'Commit {report["commit"]}, Python {report["python"]}, {report["parameters"]}')
+    if previous is not None:
+        print(f'Compared with commit {previous["commit"]} (ratio > 1: faster now)')
+    for name, times in report['results'].items():
+        median = statistics.median(times)
+        line = f'  {name:<40} {median * 1000:10.1f} ms'
+        if previous is not None and name in previous['results']:
+            line = f'{line}  {statistics.median(previous["results"][name]) / median:6.2f}x'
+        print(line)
+    for name, reason in report['skipped'].items():
+        print(f'  {name:<40} skipped: {reason}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Run the yw_table benchmarks on a synthetic project, and write the results as JSON.',
+        epilog='')
+    parser.add_argument('--scenes', type=int, default=2000)
+    parser.add_argument('--chapters', type=int, default=None)
+    parser.add_argument('--characters', type=int, default=50)
+    parser.add_argument('--locations', type=int, default=20)
+    parser.add_argument('--items', type=int, default=20)
+    parser.add_argument('--arcs', type=int, default=3)
+    parser.add_argument('--words', type=int, default=500)
+    parser.add_argument('--relations', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', metavar='FILE', default=None,
+                        help='write the results to a JSON file')
+    parser.add_argument('--compare', metavar='FILE', default=None,
+                        help='compare with the results of a previous run')
+    args = parser.parse_args()
+    parameters = dict(scenes=args.scenes,
+                      chapters=args.chapters,
+                      characters=args.characters,
+                      locations=args.locations,
+                      items=args.items,
+                      arcs=args.arcs,
+                      words=args.words,
+                      relations=args.relations,
+                      seed=args.seed,
+                      )
+    report = run(args.repeat, parameters)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            previous = json.load(f)
+    print_results(report, previous)
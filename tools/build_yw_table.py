@@ -16,6 +16,8 @@ SRC = '../src/'
 BUILD = '../test/'
 SOURCE_FILE = f'{SRC}yw_table_.py'
 TARGET_FILE = f'{BUILD}yw_table.py'
+CSV_SOURCE_FILE = f'{SRC}yw_table_csv_.py'
+CSV_TARGET_FILE = f'{BUILD}yw_table_csv.py'
 
 
 def main():
@@ -23,6 +25,8 @@ def main():
     inliner.run(SOURCE_FILE, TARGET_FILE, 'nvretablexlib', '../src/')
     inliner.run(TARGET_FILE, TARGET_FILE, 'nvmatrixlib', '../src/')
     inliner.run(TARGET_FILE, TARGET_FILE, 'pywriter', '../src/')
+    inliner.run(CSV_SOURCE_FILE, CSV_TARGET_FILE, 'nvretablexlib', '../src/')
+    inliner.run(CSV_TARGET_FILE, CSV_TARGET_FILE, 'pywriter', '../src/')
     # inliner.run(SOURCE_FILE, TARGET_FILE, 'nvretablexlib', '../src/', copyPyWriter=True)
     # inliner.run(TARGET_FILE, TARGET_FILE, 'nvmatrixlib', '../src/', copyPyWriter=True)
     # inliner.run(TARGET_FILE, TARGET_FILE, 'pywriter', '../../PyWriter/src/', copyPyWriter=True)
@@ -0,0 +1,150 @@
+"""Generate a synthetic yWriter 7 project for benchmarking.
+
+usage: yw7_generator.py [options] Targetfile
+
+Copyright (c) 2023 Peter Triesberger
+For further information see https://github.com/peter88213/yw-table
+License: GNU GPLv3 (https://www.gnu.org/licenses/gpl-3.0.en.html)
+"""
+import argparse
+import random
+
+WORDS = ('lorem', 'ipsum', 'dolor', 'sit', 'amet', 'consectetur', 'adipiscing', 'elit',
+         'sed', 'do', 'eiusmod', 'tempor', 'incididunt', 'ut', 'labore', 'et', 'dolore')
+
+
+def generate(filePath, scenes=1000, chapters=None, characters=50, locations=20, items=20, arcs=3,
+             words=500, relations=3, seed=0):
+    """Write a synthetic yWriter 7 project to filePath.
+
+    Positional arguments:
+        filePath: str -- path to the .yw7 file to write.
+
+    Optional arguments:
+        scenes: int -- number of scenes.
+        chapters: int -- number of chapters (default: one chapter per ten scenes).
+        characters: int -- number of characters.
+        locations: int -- number of locations.
+        items: int -- number of items.
+        arcs: int -- number of arcs assigned to the scenes.
+        words: int -- number of words per scene content.
+        relations: int -- maximum number of characters, locations, and items per scene.
+        seed: int -- random seed, so the same arguments always produce the same project.
+    """
+    rnd = random.Random(seed)
+    if chapters is None:
+        chapters = max(1, scenes // 10)
+    arcTitles = [f'Arc{i}' for i in range(1, arcs + 1)]
+    lines = ['<?xml version="1.0" encoding="utf-8"?>',
+             '<YWRITER7>',
+             '  <PROJECT>',
+             '    <Ver>7</Ver>',
+             f'    <Title><![CDATA[Synthetic project with {scenes} scenes]]></Title>',
+             '    <AuthorName><![CDATA[yw7_generator]]></AuthorName>',
+             '  </PROJECT>']
+
+    def world_elements(section, tag, count, title):
+        lines.append(f'  <{section}>')
+        for i in range(1, count + 1):
+            lines.extend([
+                f'    <{tag}>',
+                f'      <ID>{i}</ID>',
+                f'      <Title><![CDATA[{title} {i}]]></Title>',
+                f'      <Desc><![CDATA[Description of {title.lower()} {i}.]]></Desc>',
+                f'    </{tag}>'])
+        lines.append(f'  </{section}>')
+
+    world_elements('LOCATIONS', 'LOCATION', locations, 'Location')
+    world_elements('ITEMS', 'ITEM', items, 'Item')
+    world_elements('CHARACTERS', 'CHARACTER', characters, 'Character')
+
+    lines.append('  <SCENES>')
+    for i in range(1, scenes + 1):
+        content = ' '.join(rnd.choice(WORDS) for __ in range(words))
+        lines.extend([
+            '    <SCENE>',
+            f'      <ID>{i}</ID>',
+            f'      <Title><![CDATA[Scene {i}]]></Title>',
+            f'      <Desc><![CDATA[Description of scene {i}.]]></Desc>',
+            f'      <SceneContent><![CDATA[{content}]]></SceneContent>',
+            f'      <WordCount>{words}</WordCount>',
+            f'      <LetterCount>{len(content)}</LetterCount>',
+            '      <Status>1</Status>',
+            f'      <Notes><![CDATA[Notes on scene {i}.]]></Notes>',
+            '      <Tags><![CDATA[tag1;tag2]]></Tags>',
+            '      <Field1>1</Field1>',
+            '      <Field2>1</Field2>',
+            '      <Field3>1</Field3>',
+            '      <Field4>1</Field4>',
+            f'      <SpecificDateTime>1900-01-{1 + i % 28:02} 12:00:00</SpecificDateTime>',
+            '      <SpecificDateMode>-1</SpecificDateMode>',
+            '      <LastsHours>1</LastsHours>',
+            '      <Goal><![CDATA[Goal]]></Goal>',
+            '      <Conflict><![CDATA[Conflict]]></Conflict>',
+            '      <Outcome><![CDATA[Outcome]]></Outcome>'])
+        if arcTitles:
+            scnArcs = ';'.join(rnd.sample(arcTitles, rnd.randint(0, min(2, arcs))))
+            if scnArcs:
+                lines.extend([
+                    '      <Fields>',
+                    f'        <Field_SceneArcs><![CDATA[{scnArcs}]]></Field_SceneArcs>',
+                    '      </Fields>'])
+        for section, tag, count in (('Characters', 'CharID', characters),
+                                    ('Locations', 'LocID', locations),
+                                    ('Items', 'ItemID', items)):
+            ids = rnd.sample(range(1, count + 1), rnd.randint(0, min(relations, count)))
+            if ids:
+                lines.append(f'      <{section}>')
+                lines.extend(f'        <{tag}>{elemId}</{tag}>' for elemId in ids)
+                lines.append(f'      </{section}>')
+        lines.append('    </SCENE>')
+    lines.append('  </SCENES>')
+
+    lines.append('  <CHAPTERS>')
+    scenesPerChapter = -(-scenes // chapters)
+    for i in range(chapters):
+        lines.extend([
+            '    <CHAPTER>',
+            f'      <ID>{i + 1}</ID>',
+            f'      <Title><![CDATA[Chapter {i + 1}]]></Title>',
+            '      <Type>0</Type>',
+            '      <ChapterType>0</ChapterType>'])
+        scIds = range(i * scenesPerChapter + 1, min((i + 1) * scenesPerChapter, scenes) + 1)
+        if scIds:
+            lines.append('      <Scenes>')
+            lines.extend(f'        <ScID>{scId}</ScID>' for scId in scIds)
+            lines.append('      </Scenes>')
+        lines.append('    </CHAPTER>')
+    lines.append('  </CHAPTERS>')
+    lines.append('</YWRITER7>')
+    with open(filePath, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(
+        description='Generate a synthetic yWriter 7 project for benchmarking.',
+        epilog='')
+    parser.add_argument('targetFile', metavar='Targetfile',
+                        help='yWriter 7 project file to write')
+    parser.add_argument('--scenes', type=int, default=1000)
+    parser.add_argument('--chapters', type=int, default=None)
+    parser.add_argument('--characters', type=int, default=50)
+    parser.add_argument('--locations', type=int, default=20)
+    parser.add_argument('--items', type=int, default=20)
+    parser.add_argument('--arcs', type=int, default=3)
+    parser.add_argument('--words', type=int, default=500)
+    parser.add_argument('--relations', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    generate(args.targetFile,
+             scenes=args.scenes,
+             chapters=args.chapters,
+             characters=args.characters,
+             locations=args.locations,
+             items=args.items,
+             arcs=args.arcs,
+             words=args.words,
+             relations=args.relations,
+             seed=args.seed,
+             )